@@ -2,21 +2,30 @@
 주식 데이터 ETL DAG
 
 매일 새벽 2시에 실행되는 주식 데이터 수집 파이프라인
+
+전체 종목을 N개 샤드로 나눈 뒤 Dynamic Task Mapping으로
+샤드별 시세/재무제표 수집 작업을 병렬 실행하고, 마지막에 결과를 집계합니다.
+샤드 수는 Airflow Variable `stock_etl_num_shards`로 조정합니다 (기본 8).
 """
 from airflow import DAG
+from airflow.models import Variable
 from airflow.operators.python import PythonOperator
 from airflow.operators.bash import BashOperator
 from datetime import datetime, timedelta
 import sys
+import zlib
 from pathlib import Path
 
 # 프로젝트 경로 추가
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "backend"))
 
-from app.core.database import get_db
+from app.core.database import get_etl_db
+from app.etl.checkpoint import COMPLETED_STATUSES
 from app.etl.pipeline import ETLPipeline
 
+DEFAULT_NUM_SHARDS = 8
+
 default_args = {
     'owner': 'data-team',
     'depends_on_past': False,
@@ -38,73 +47,152 @@ dag = DAG(
 )
 
 
+def _summarize(result):
+    """XCom 크기를 줄이기 위해 종목별 상세 결과 제외"""
+    if not isinstance(result, dict):
+        return {}
+    return {key: value for key, value in result.items() if key != 'details'}
+
+
 def extract_stock_list():
     """종목 리스트 수집"""
+    pipeline = None
     try:
-        db = next(get_db())
+        db = next(get_etl_db())
         pipeline = ETLPipeline(db)
         result = pipeline.run_stock_list_etl("KRX")
-        pipeline.close()
         print(f"종목 리스트 수집 완료: {result}")
         return result
     except Exception as e:
         print(f"종목 리스트 수집 실패: {e}")
         raise
+    finally:
+        if pipeline:
+            pipeline.close()
+
+
+def plan_shards(**context):
+    """
+    전체 종목을 샤드로 분할
 
+    종목 코드의 CRC32 해시로 나누므로 같은 종목은 매번 같은 샤드에 배정됩니다.
 
-def extract_stock_prices(**context):
-    """시세 데이터 수집"""
+    Returns:
+        샤드별 op_kwargs 리스트 [{'shard_index': 0, 'tickers': [...]}, ...]
+    """
+    db = next(get_etl_db())
     try:
-        # 이전 작업에서 종목 리스트 가져오기
-        # 또는 DB에서 직접 조회
-        db = next(get_db())
         from app.models.stock import Stock
-        
-        # 최근 업데이트된 종목들만 선택 (예: 상위 100개)
-        stocks = db.query(Stock).limit(100).all()
-        tickers = [stock.ticker for stock in stocks]
-        
-        if not tickers:
-            print("수집할 종목이 없습니다")
-            return
-        
+        tickers = [ticker for (ticker,) in db.query(Stock.ticker).order_by(Stock.ticker).all()]
+    finally:
+        db.close()
+
+    if not tickers:
+        print("수집할 종목이 없습니다")
+        return []
+
+    num_shards = max(1, int(Variable.get('stock_etl_num_shards', default_var=DEFAULT_NUM_SHARDS)))
+    shards = [[] for _ in range(num_shards)]
+    for ticker in tickers:
+        shards[zlib.crc32(ticker.encode('utf-8')) % num_shards].append(ticker)
+
+    plan = [
+        {'shard_index': index, 'tickers': shard_tickers}
+        for index, shard_tickers in enumerate(shards) if shard_tickers
+    ]
+    print(f"샤드 분할 완료: {len(tickers)}개 종목, {len(plan)}개 샤드")
+    return plan
+
+
+def extract_stock_prices(shard_index, tickers, **context):
+    """
+    샤드별 시세 데이터 수집 (샤드마다 별도 DB 세션 사용)
+
+    기본은 종목별 마지막 저장일 이후만 수집합니다.
+    수정주가 반영 등 전체 재적재가 필요하면 dag_run conf로
+    {"full_refresh": true, "start_date": "YYYY-MM-DD"}를 넘깁니다.
+
+    dag_run의 run_id와 샤드 번호를 실행 키로 쓰므로, 재시도 시에는
+    이미 완료된 종목을 건너뛰고 실패/미처리 종목만 이어서 수집합니다.
+    """
+    pipeline = None
+    try:
+        db = next(get_etl_db())
         pipeline = ETLPipeline(db)
-        
-        # 최근 1년 데이터 수집
+
+        dag_run = context.get('dag_run')
+        conf = (dag_run.conf or {}) if dag_run else {}
+        full_refresh = bool(conf.get('full_refresh', False))
+        run_key = f"{dag_run.run_id}#shard{shard_index}" if dag_run else None
+
+        # 증분 수집 (저장된 시세가 없는 종목은 최근 1년)
         end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
-        
-        result = pipeline.run_stock_price_etl(tickers, start_date, end_date)
-        pipeline.close()
-        print(f"시세 데이터 수집 완료: {result}")
-        return result
+        start_date = conf.get('start_date') or (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+
+        result = pipeline.run_stock_price_etl(
+            tickers, start_date, end_date, full_refresh=full_refresh, run_key=run_key
+        )
+        if result.get('status') == 'failed':
+            raise RuntimeError(result.get('error'))
+        if result.get('run_status') == 'failed':
+            # 실패 종목이 남았으면 재시도로 이어서 수집
+            failed = [t for t, r in result.get('details', {}).items() if r.get('status') not in COMPLETED_STATUSES]
+            raise RuntimeError(f"미완료 종목 {len(failed)}개: {failed[:20]}")
+
+        summary = {'shard_index': shard_index, **_summarize(result)}
+        print(f"시세 데이터 수집 완료 (샤드 {shard_index}): {summary}")
+        return summary
     except Exception as e:
-        print(f"시세 데이터 수집 실패: {e}")
+        print(f"시세 데이터 수집 실패 (샤드 {shard_index}): {e}")
         raise
+    finally:
+        if pipeline:
+            pipeline.close()
 
 
-def extract_financials(**context):
-    """재무제표 데이터 수집"""
+def extract_financials(shard_index, tickers, **context):
+    """샤드별 재무제표 데이터 수집 (샤드마다 별도 DB 세션 사용)"""
+    pipeline = None
     try:
-        db = next(get_db())
-        from app.models.stock import Stock
-        
-        # 상위 50개 종목만 선택
-        stocks = db.query(Stock).limit(50).all()
-        tickers = [stock.ticker for stock in stocks]
-        
-        if not tickers:
-            print("수집할 종목이 없습니다")
-            return
-        
+        db = next(get_etl_db())
         pipeline = ETLPipeline(db)
         result = pipeline.run_financial_data_etl(tickers)
-        pipeline.close()
-        print(f"재무제표 데이터 수집 완료: {result}")
-        return result
+        if result.get('status') == 'failed':
+            raise RuntimeError(result.get('error'))
+
+        summary = {'shard_index': shard_index, **_summarize(result)}
+        print(f"재무제표 데이터 수집 완료 (샤드 {shard_index}): {summary}")
+        return summary
     except Exception as e:
-        print(f"재무제표 데이터 수집 실패: {e}")
+        print(f"재무제표 데이터 수집 실패 (샤드 {shard_index}): {e}")
         raise
+    finally:
+        if pipeline:
+            pipeline.close()
+
+
+def aggregate_results(**context):
+    """샤드별 결과 집계"""
+    ti = context['ti']
+    report = {}
+    for task_id in ('extract_stock_prices', 'extract_financials'):
+        shard_results = [r for r in (ti.xcom_pull(task_ids=task_id) or []) if r]
+        totals = {'shards': len(shard_results), 'total_tickers': 0, 'successful': 0}
+        loaded = {'created': 0, 'updated': 0, 'skipped': 0}
+        for r in shard_results:
+            totals['total_tickers'] += r.get('total_tickers', 0)
+            totals['successful'] += r.get('successful', 0)
+            for key in ('up_to_date', 'resumed', 'total_extracted'):
+                if key in r:
+                    totals[key] = totals.get(key, 0) + r[key]
+            for key in loaded:
+                loaded[key] += r.get('total_loaded', {}).get(key, 0)
+        if any(loaded.values()):
+            totals['total_loaded'] = loaded
+        report[task_id] = totals
+
+    print(f"ETL 결과 집계: {report}")
+    return report
 
 
 # 작업 정의
@@ -114,21 +202,33 @@ task_extract_stock_list = PythonOperator(
     dag=dag,
 )
 
-task_extract_stock_prices = PythonOperator(
+task_plan_shards = PythonOperator(
+    task_id='plan_shards',
+    python_callable=plan_shards,
+    dag=dag,
+)
+
+# 샤드 수만큼 동적으로 매핑되는 작업
+task_extract_stock_prices = PythonOperator.partial(
     task_id='extract_stock_prices',
     python_callable=extract_stock_prices,
     dag=dag,
-)
+).expand(op_kwargs=task_plan_shards.output)
 
-task_extract_financials = PythonOperator(
+task_extract_financials = PythonOperator.partial(
     task_id='extract_financials',
     python_callable=extract_financials,
     dag=dag,
+).expand(op_kwargs=task_plan_shards.output)
+
+task_aggregate_results = PythonOperator(
+    task_id='aggregate_results',
+    python_callable=aggregate_results,
+    trigger_rule='all_done',  # 일부 샤드가 실패해도 집계
+    dag=dag,
 )
 
 # 의존성 설정
-# task1 완료 후 task2, task3 병렬 실행
-task_extract_stock_list >> [task_extract_stock_prices, task_extract_financials]
-
-
-
+# 종목 리스트 수집 → 샤드 분할 → 샤드별 시세/재무제표 병렬 수집 → 결과 집계
+task_extract_stock_list >> task_plan_shards
+task_plan_shards >> [task_extract_stock_prices, task_extract_financials] >> task_aggregate_results
@@ -2,9 +2,10 @@
 인증 API 엔드포인트
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.services.auth_service import AuthService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.models import User
+from app.services.auth_service import AsyncAuthService
 from app.schemas.user import (
     UserCreate,
     UserResponse,
@@ -16,15 +17,15 @@ from app.schemas.user import (
 router = APIRouter()
 
 
-def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
-    """인증 서비스 의존성"""
-    return AuthService(db)
+def get_auth_service(db: AsyncSession = Depends(get_async_db)) -> AsyncAuthService:
+    """인증 서비스 의존성 (비동기 세션)"""
+    return AsyncAuthService(db)
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ):
     """
     회원가입
@@ -48,7 +49,7 @@ async def register(
                 detail="이용약관 및 개인정보처리방침에 동의해야 합니다"
             )
         
-        user = auth_service.register(user_data)
+        user = await auth_service.register(user_data)
         return user
         
     except HTTPException:
@@ -63,7 +64,7 @@ async def register(
 @router.post("/login", response_model=UserLoginResponse)
 async def login(
     login_data: UserLoginRequest,
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ):
     """
     로그인
@@ -72,7 +73,7 @@ async def login(
     - **password**: 비밀번호
     """
     try:
-        result = auth_service.login(login_data)
+        result = await auth_service.login(login_data)
         
         return UserLoginResponse(
             access_token=result["access_token"],
@@ -92,14 +93,14 @@ async def login(
 @router.get("/me", response_model=UserDetailResponse)
 async def get_current_user(
     token: str,
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ):
     """
     현재 로그인한 사용자 정보 조회
     
     - **token**: JWT 액세스 토큰
     """
-    user = auth_service.get_current_user(token)
+    user = await auth_service.get_current_user(token)
     
     if not user:
         raise HTTPException(
@@ -127,67 +128,61 @@ async def logout():
 @router.post("/check-username")
 async def check_username(
     username: str = Query(..., description="확인할 사용자명"),
-    db: Session = Depends(get_db)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ):
     """
     사용자명 중복 확인
     """
-    from app.models import User
-    
-    existing = db.query(User).filter(User.username == username).first()
+    available = await auth_service.is_available(User.username, username)
     
     return {
-        "available": existing is None,
-        "message": "사용 가능한 사용자명입니다" if not existing else "이미 존재하는 사용자명입니다"
+        "available": available,
+        "message": "사용 가능한 사용자명입니다" if available else "이미 존재하는 사용자명입니다"
     }
 
 
 @router.post("/check-email")
 async def check_email(
     email: str = Query(..., description="확인할 이메일"),
-    db: Session = Depends(get_db)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ):
     """
     이메일 중복 확인
     """
-    from app.models import User
-    
-    existing = db.query(User).filter(User.email == email).first()
+    available = await auth_service.is_available(User.email, email)
     
     return {
-        "available": existing is None,
-        "message": "사용 가능한 이메일입니다" if not existing else "이미 존재하는 이메일입니다"
+        "available": available,
+        "message": "사용 가능한 이메일입니다" if available else "이미 존재하는 이메일입니다"
     }
 
 
 @router.post("/check-nickname")
 async def check_nickname(
     nickname: str = Query(..., description="확인할 닉네임"),
-    db: Session = Depends(get_db)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ):
     """
     닉네임 중복 확인
     """
-    from app.models import User
-    
-    existing = db.query(User).filter(User.nickname == nickname).first()
+    available = await auth_service.is_available(User.nickname, nickname)
     
     return {
-        "available": existing is None,
-        "message": "사용 가능한 닉네임입니다" if not existing else "이미 존재하는 닉네임입니다"
+        "available": available,
+        "message": "사용 가능한 닉네임입니다" if available else "이미 존재하는 닉네임입니다"
     }
 
 
 @router.post("/send-verification-email")
 async def send_verification_email(
     email: str = Query(..., description="인증할 이메일"),
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ):
     """
     이메일 인증 코드 발송
     """
     try:
-        result = auth_service.send_verification_email(email)
+        result = await auth_service.send_verification_email(email)
         return result
     except HTTPException:
         raise
@@ -202,13 +197,13 @@ async def send_verification_email(
 async def verify_email_code(
     email: str = Query(..., description="인증할 이메일"),
     code: str = Query(..., description="인증 코드"),
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AsyncAuthService = Depends(get_auth_service)
 ):
     """
     이메일 인증 코드 검증
     """
     try:
-        result = auth_service.verify_email_code(email, code)
+        result = await auth_service.verify_email_code(email, code)
         return result
     except HTTPException:
         raise
@@ -1,14 +1,34 @@
 from fastapi import APIRouter
 from datetime import datetime
 
+from app.core.database import get_pool_stats
+from app.core.upstream import upstream_executor
+
 router = APIRouter()
 
 @router.get("/health")
-def health_check():
-    """서버 상태 확인"""
+async def health_check():
+    """서버 상태 확인 (스레드 풀을 쓰지 않아 외부 API 지연과 무관하게 응답)"""
     return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
         "version": "1.0.0"
     }
 
+
+@router.get("/health/db-pool")
+def db_pool_status():
+    """DB 연결 풀 상태 및 연결 재사용 통계"""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "pool": get_pool_stats()
+    }
+
+
+@router.get("/health/upstream")
+def upstream_status():
+    """외부 시세 API 실행기 및 데이터 소스별 서킷 브레이커 상태"""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "upstream": upstream_executor.stats()
+    }
@@ -1,25 +1,25 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import List, Dict, Optional
-from sqlalchemy.orm import Session
-from app.services.lotto_service import LottoService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.lotto_service import AsyncLottoService, LottoService
 from app.models.lotto import LottoNumber
-from app.core.database import get_db
+from app.core.database import get_async_db
 
 router = APIRouter()
 
-def get_lotto_service(db: Session = Depends(get_db)) -> LottoService:
-    """로또 서비스 의존성"""
-    return LottoService(db)
+def get_lotto_service(db: AsyncSession = Depends(get_async_db)) -> AsyncLottoService:
+    """로또 서비스 의존성 (비동기 세션)"""
+    return AsyncLottoService(db)
 
 @router.get("/generate")
 async def generate_lotto_numbers(
     user_id: Optional[int] = None,
-    lotto_service: LottoService = Depends(get_lotto_service)
+    lotto_service: AsyncLottoService = Depends(get_lotto_service)
 ):
     """로또 번호 1세트 생성 (하루 한번 제한)"""
     try:
         # 오늘 이미 생성된 번호가 있는지 확인
-        today_lotto = lotto_service.get_today_lotto(user_id)
+        today_lotto = await lotto_service.get_today_lotto(user_id)
         if today_lotto:
             numbers = [int(x) for x in today_lotto.numbers.split(",")]
             return {
@@ -35,7 +35,7 @@ async def generate_lotto_numbers(
         analysis = lotto_service.analyze_numbers(numbers)
         
         # DB에 저장
-        lotto_record = lotto_service.save_lotto_numbers(numbers, user_id)
+        lotto_record = await lotto_service.save_lotto_numbers(numbers, user_id)
         
         return {
             "success": True,
@@ -55,7 +55,7 @@ async def generate_multiple_sets(count: int = 5):
         raise HTTPException(status_code=400, detail="세트 수는 1-20 사이여야 합니다")
     
     try:
-        results = lotto_service.generate_multiple_sets(count)
+        results = LottoService().generate_multiple_sets(count)
         return {
             "success": True,
             "sets": results,
@@ -67,7 +67,7 @@ async def generate_multiple_sets(count: int = 5):
 @router.post("/analyze")
 async def analyze_numbers(
     numbers: List[int],
-    lotto_service: LottoService = Depends(get_lotto_service)
+    lotto_service: AsyncLottoService = Depends(get_lotto_service)
 ):
     """로또 번호 분석"""
     if len(numbers) != 6:
@@ -91,11 +91,11 @@ async def analyze_numbers(
 @router.get("/today")
 async def get_today_lotto(
     user_id: Optional[int] = None,
-    lotto_service: LottoService = Depends(get_lotto_service)
+    lotto_service: AsyncLottoService = Depends(get_lotto_service)
 ):
     """오늘 생성된 로또 번호 조회"""
     try:
-        today_lotto = lotto_service.get_today_lotto(user_id)
+        today_lotto = await lotto_service.get_today_lotto(user_id)
         if not today_lotto:
             return {
                 "success": False,
@@ -117,11 +117,11 @@ async def get_today_lotto(
 async def mark_lotto_as_viewed(
     lotto_id: int,
     user_id: Optional[int] = None,
-    lotto_service: LottoService = Depends(get_lotto_service)
+    lotto_service: AsyncLottoService = Depends(get_lotto_service)
 ):
     """로또 번호를 확인했음으로 표시"""
     try:
-        success = lotto_service.mark_as_viewed(lotto_id, user_id)
+        success = await lotto_service.mark_as_viewed(lotto_id, user_id)
         if success:
             return {"success": True, "message": "확인 상태가 업데이트되었습니다"}
         else:
@@ -133,11 +133,11 @@ async def mark_lotto_as_viewed(
 async def get_lotto_history(
     user_id: int,
     limit: int = 10,
-    lotto_service: LottoService = Depends(get_lotto_service)
+    lotto_service: AsyncLottoService = Depends(get_lotto_service)
 ):
     """사용자의 로또 번호 히스토리 조회"""
     try:
-        history = lotto_service.get_user_lotto_history(user_id, limit)
+        history = await lotto_service.get_user_lotto_history(user_id, limit)
         return {
             "success": True,
             "history": [
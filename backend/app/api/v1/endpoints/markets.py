@@ -1,13 +1,21 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
+from datetime import date, timedelta
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
 try:
     import FinanceDataReader as fdr
 except Exception:
     fdr = None
-import yfinance as yf
 import pandas as pd
 
+from app.core.database import get_db
+from app.core.serialization import columns_response, RESPONSE_FORMATS
+from app.services.stock_listing_service import stock_listing_cache
+from app.core.upstream import UpstreamUnavailable
+from app.services.price_service import StockPriceService
+
 router = APIRouter()
 
 class OhlcRow(BaseModel):
@@ -24,50 +32,37 @@ class TickerItem(BaseModel):
     market: Optional[str] = None
 
 @router.get("/ohlc", response_model=List[OhlcRow])
-def get_ohlc(
+async def get_ohlc(
     ticker: str = Query(..., description="종목 코드 (예: 005930)"),
     start: Optional[str] = Query(None, description="시작일 (YYYY-MM-DD)"),
     end: Optional[str] = Query(None, description="종료일 (YYYY-MM-DD)"),
     prev_only: bool = Query(True, description="전일자만 반환 여부"),
+    db: Session = Depends(get_db),
 ):
     """종목 OHLC 데이터 조회"""
-    # 1) Try FinanceDataReader (KRX 지원)
-    if fdr is not None:
-        try:
-            df = fdr.DataReader(ticker, start, end)
-        except Exception:
-            df = None
-    else:
-        df = None
+    # 전일자만 필요하면 최근 구간만 조회
+    if prev_only and not start:
+        end_date = pd.to_datetime(end).date() if end else date.today()
+        start = (end_date - timedelta(days=14)).strftime('%Y-%m-%d')
 
-    # 2) Fallback to yfinance (KRX는 .KS/.KQ 접미사 필요할 수 있음)
-    if df is None or len(df) == 0:
-        yf_tickers = [ticker, f"{ticker}.KS", f"{ticker}.KQ"]
+    # 시세 저장소 우선 조회 (부족한 구간만 FinanceDataReader → yfinance 순으로 원격 조회 후 저장)
+    try:
+        df = await run_in_threadpool(StockPriceService(db).get_daily_prices, ticker, start, end)
+    except UpstreamUnavailable:
+        raise
+    except Exception:
         df = None
-        for yt in yf_tickers:
-            try:
-                df_try = yf.download(yt, start=start, end=end, progress=False)
-                if df_try is not None and len(df_try) > 0:
-                    df = df_try
-                    break
-            except Exception:
-                continue
-        if df is None or len(df) == 0:
-            raise HTTPException(status_code=404, detail="No data found for ticker")
 
     if df is None or len(df) == 0:
-        return []
+        raise HTTPException(status_code=404, detail="No data found for ticker")
 
-    # 보편 컬럼 이름 대응: FinanceDataReader는 Date index, [Open, High, Low, Close, Volume] 제공
-    df = df.reset_index()
-    # 컬럼명 표준화
+    # 컬럼명 표준화 (시세 서비스는 [Date, Open, High, Low, Close, Volume] 제공)
     rename_map = {
-        'Date': 'date', 'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Adj Close': 'close', 'Volume': 'volume'
+        'Date': 'date', 'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'
     }
     df = df.rename(columns=rename_map)
     # 날짜 문자열로 변환
-    if isinstance(df.loc[0, 'date'], pd.Timestamp):
-        df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+    df['date'] = df['date'].dt.strftime('%Y-%m-%d')
 
     # prev_only: 전일자 1건만 반환
     if prev_only:
@@ -82,39 +77,32 @@ def get_ohlc(
     return rows
 
 @router.get("/tickers", response_model=List[TickerItem])
-def get_tickers(market: Optional[str] = Query(None, description="시장 구분 (KOSPI, KOSDAQ 등)")):
+def get_tickers(
+    market: Optional[str] = Query(None, description="시장 구분 (KOSPI, KOSDAQ 등)"),
+    response_format: str = Query("rows", alias="format", description="응답 형식 (rows: 행 목록, columnar: 컬럼별 배열)"),
+):
     """KRX 상장 종목 목록 조회"""
+    if response_format not in RESPONSE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format은 {RESPONSE_FORMATS} 중 하나여야 합니다")
     if fdr is None:
         raise HTTPException(status_code=500, detail="FinanceDataReader not available")
     try:
-        # KRX 전체 상장 목록
-        df = fdr.StockListing("KRX")
+        # KRX 전체 상장 목록 (캐시된 스냅샷)
+        snapshot = stock_listing_cache.get_snapshot()
+    except UpstreamUnavailable:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load tickers: {e}")
 
-    # 표준 컬럼 대응 (코드/이름/시장)
-    candidates = [
-        ("Code", "Name", "Market"),
-        ("Symbol", "Name", "Market"),
-        ("code", "name", "market"),
-    ]
-    code_col = name_col = market_col = None
-    for c, n, m in candidates:
-        if c in df.columns and n in df.columns:
-            code_col, name_col = c, n
-            market_col = m if m in df.columns else None
-            break
+    code_col, name_col, market_col = snapshot.code_col, snapshot.name_col, snapshot.market_col
     if code_col is None:
         raise HTTPException(status_code=500, detail="Unexpected listing schema")
 
-    if market and market_col and market_col in df.columns:
-        df = df[df[market_col] == market]
+    df = snapshot.select(market=market)
 
-    out = []
-    for _, row in df.iterrows():
-        out.append(TickerItem(
-            code=str(row[code_col]),
-            name=str(row[name_col]),
-            market=str(row[market_col]) if (market_col and market_col in df.columns) else None,
-        ))
-    return out
+    columns = {
+        'code': df[code_col].astype(str).to_numpy(dtype=object),
+        'name': df[name_col].astype(str).to_numpy(dtype=object),
+        'market': df[market_col].astype(str).to_numpy(dtype=object) if market_col else None,
+    }
+    return columns_response(columns, response_format)
@@ -2,18 +2,18 @@
 주식 랭킹 API 엔드포인트
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.core.database import get_db
-from app.services.stock_service import StockService
+from app.core.database import get_async_db
+from app.services.stock_service import AsyncStockService
 from app.schemas.stock import StockRankingRequest, StockRankingResponse, FinancialDataResponse
 
 router = APIRouter()
 
 
-def get_stock_service(db: Session = Depends(get_db)) -> StockService:
-    """주식 서비스 의존성"""
-    return StockService(db)
+def get_stock_service(db: AsyncSession = Depends(get_async_db)) -> AsyncStockService:
+    """주식 서비스 의존성 (비동기 세션)"""
+    return AsyncStockService(db)
 
 
 @router.get("/rankings", response_model=StockRankingResponse)
@@ -22,7 +22,7 @@ async def get_stock_rankings(
     order: str = Query("desc", description="정렬 순서 (asc/desc)"),
     limit: int = Query(50, description="결과 개수"),
     industry: Optional[str] = Query(None, description="업종 필터"),
-    stock_service: StockService = Depends(get_stock_service)
+    stock_service: AsyncStockService = Depends(get_stock_service)
 ):
     """
     주식 랭킹 조회
@@ -40,7 +40,7 @@ async def get_stock_rankings(
             industry=industry
         )
         
-        stocks = stock_service.get_stock_rankings(request)
+        stocks = await stock_service.get_stock_rankings(request)
         
         return StockRankingResponse(
             stocks=stocks,
@@ -58,13 +58,13 @@ async def get_stock_rankings(
 
 @router.get("/industries", response_model=List[str])
 async def get_industries(
-    stock_service: StockService = Depends(get_stock_service)
+    stock_service: AsyncStockService = Depends(get_stock_service)
 ):
     """
     업종 목록 조회
     """
     try:
-        industries = stock_service.get_industries()
+        industries = await stock_service.get_industries()
         return industries
     except Exception as e:
         raise HTTPException(
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, HTTPException, Query, Path
+from fastapi import APIRouter, HTTPException, Query, Path, Depends
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 from datetime import datetime, timedelta
@@ -12,11 +14,34 @@ except Exception:
     fdr = None
 import yfinance as yf
 
+from app.core.database import get_db
+from app.core.serialization import columns_response, RESPONSE_FORMATS
+from app.core.indicators import (
+    INDICATOR_GROUPS,
+    compute_indicators,
+    parse_indicator_groups,
+    required_lookback,
+    warmup_start,
+)
+
 # 재무제표 서비스 import
 from app.services.financial_statement_service import FinancialStatementService
+from app.services.fs_scoring import SCORING_BACKENDS
+from app.services.stock_listing_service import stock_listing_cache
+from app.core.upstream import PROVIDER_FDR, call_upstream_async
+from app.services.price_service import StockPriceService, fetch_remote_daily_prices, resolve_date_range
+from app.services.indicator_service import IndicatorService
 
 router = APIRouter()
 
+
+def _str_column(df: pd.DataFrame, col: str) -> np.ndarray:
+    """문자열 컬럼 추출 (컬럼이 없으면 빈 문자열)"""
+    if col not in df.columns:
+        return np.full(len(df), '', dtype=object)
+    return df[col].astype(str).to_numpy(dtype=object)
+
+
 class StockItem(BaseModel):
     symbol: str
     name: str
@@ -74,59 +99,59 @@ class FinancialStatementItem(BaseModel):
 def get_stocks(
     market: Optional[str] = Query(None, description="시장 구분 (KOSPI, KOSDAQ, NASDAQ 등)"),
     sector: Optional[str] = Query(None, description="섹터 필터"),
-    limit: int = Query(100, ge=1, le=1000, description="결과 제한 수")
+    limit: int = Query(100, ge=1, le=1000, description="결과 제한 수"),
+    response_format: str = Query("rows", alias="format", description="응답 형식 (rows: 행 목록, columnar: 컬럼별 배열)"),
 ):
     """주식 종목 리스트 조회"""
+    if response_format not in RESPONSE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format은 {RESPONSE_FORMATS} 중 하나여야 합니다")
     try:
         if fdr is None:
             raise HTTPException(status_code=500, detail="FinanceDataReader not available")
         
-        # KRX 상장 목록 조회
-        df = fdr.StockListing("KRX")
-        
-        # 시장 필터
-        if market and 'Market' in df.columns:
-            df = df[df['Market'] == market]
-        
-        # 섹터 필터
-        if sector and 'Sector' in df.columns:
-            df = df[df['Sector'] == sector]
-        
-        # 결과 제한
-        df = df.head(limit)
-        
-        stocks = []
-        for _, row in df.iterrows():
-            stocks.append(StockItem(
-                symbol=str(row.get('Code', row.get('Symbol', ''))),
-                name=str(row.get('Name', '')),
-                market=str(row.get('Market', '')),
-                sector=str(row.get('Sector', '')) if 'Sector' in df.columns else None,
-                market_cap=float(row.get('Marcap', 0)) if 'Marcap' in df.columns else None
-            ))
-        
-        return stocks
+        # KRX 상장 목록 조회 (캐시된 스냅샷의 시장/섹터 인덱스 사용)
+        df = stock_listing_cache.get_snapshot().select(market=market, sector=sector, limit=limit)
+        
+        # 컬럼 단위 변환 (StockItem 필드 순서 유지)
+        symbol_col = 'Code' if 'Code' in df.columns else 'Symbol'
+        columns = {
+            'symbol': _str_column(df, symbol_col),
+            'name': _str_column(df, 'Name'),
+            'market': _str_column(df, 'Market'),
+            'sector': _str_column(df, 'Sector') if 'Sector' in df.columns else None,
+            'market_cap': pd.to_numeric(df['Marcap'], errors='coerce').to_numpy(dtype=float) if 'Marcap' in df.columns else None,
+            'price': None,
+            'change': None,
+            'change_percent': None,
+        }
+        return columns_response(columns, response_format)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load stocks: {str(e)}")
 
 @router.get("/financial-statements", response_model=List[FinancialStatementItem])
 def get_financial_statements(
     fs_code: str = Query(..., description="재무제표 코드 (예: 당기순이익)"),
-    quarter: str = Query(..., description="분기 (예: Q1, Q2, Q3, Q4)"),
+    quarter: str = Query(..., pattern=r"^[Qq][1-4]$", description="분기 (예: Q1, Q2, Q3, Q4)"),
     year: int = Query(..., description="연도"),
-    comparison_type: int = Query(0, ge=0, le=1, description="비교 기준 (0: 전기대비, 1: 전년동기대비)")
+    comparison_type: int = Query(0, ge=0, le=1, description="비교 기준 (0: 전기대비, 1: 전년동기대비)"),
+    scoring: Optional[str] = Query(None, description="점수화 방식 (exact-1d, quantile, sklearn-ensemble, 생략 시 서버 기본값)")
 ):
     """국내주식 재무제표 정보 조회"""
     import logging
     logger = logging.getLogger(__name__)
     
+    if scoring is not None and scoring not in SCORING_BACKENDS:
+        raise HTTPException(status_code=400, detail=f"scoring은 {list(SCORING_BACKENDS)} 중 하나여야 합니다")
+    
     fs_service = FinancialStatementService()
     try:
         logger.info(f"재무제표 조회 시작: fs_code={fs_code}, quarter={quarter}, year={year}, comparison_type={comparison_type}")
         
         # 재무제표 서비스에서 함수 호출
-        result_df = fs_service.get_fs_score(fs_code, comparison_type, quarter, year)
+        result_df = fs_service.get_fs_score(fs_code, comparison_type, quarter, year, backend=scoring)
         
         logger.info(f"조회된 데이터 행 수: {len(result_df)}")
         
@@ -173,22 +198,23 @@ def get_financial_statements(
             pass
 
 @router.get("/{symbol}", response_model=StockDetail)
-def get_stock_detail(symbol: str = Path(..., description="종목 코드")):
+async def get_stock_detail(symbol: str = Path(..., description="종목 코드")):
     """특정 종목 상세 정보 조회"""
     try:
         # 기본 정보 조회
         if fdr is None:
             raise HTTPException(status_code=500, detail="FinanceDataReader not available")
         
-        df = fdr.StockListing("KRX")
-        stock_info = df[df['Code'] == symbol].iloc[0] if len(df[df['Code'] == symbol]) > 0 else None
+        stock_info = stock_listing_cache.get_snapshot().get(symbol)
         
         if stock_info is None:
             raise HTTPException(status_code=404, detail="Stock not found")
         
-        # 최신 가격 정보 조회
+        # 최신 가격 정보 조회 (외부 API가 느리거나 차단 중이면 가격 없이 응답)
         try:
-            price_data = fdr.DataReader(symbol, end=datetime.now().strftime('%Y-%m-%d'))
+            price_data = await call_upstream_async(
+                PROVIDER_FDR, fdr.DataReader, symbol, end=datetime.now().strftime('%Y-%m-%d')
+            )
             latest_price = price_data.iloc[-1] if len(price_data) > 0 else None
         except:
             latest_price = None
@@ -211,45 +237,47 @@ def get_stock_detail(symbol: str = Path(..., description="종목 코드")):
         raise HTTPException(status_code=500, detail=f"Failed to load stock detail: {str(e)}")
 
 @router.get("/{symbol}/candles", response_model=List[CandleData])
-def get_stock_candles(
+async def get_stock_candles(
     symbol: str = Path(..., description="종목 코드"),
     start: Optional[str] = Query(None, description="시작일 (YYYY-MM-DD)"),
     end: Optional[str] = Query(None, description="종료일 (YYYY-MM-DD)"),
-    interval: str = Query("1d", description="간격 (1d, 1h, 5m 등)")
+    interval: str = Query("1d", description="간격 (1d, 1h, 5m 등)"),
+    response_format: str = Query("rows", alias="format", description="응답 형식 (rows: 행 목록, columnar: 컬럼별 배열)"),
+    db: Session = Depends(get_db)
 ):
     """종목 캔들차트 데이터 조회"""
+    if response_format not in RESPONSE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format은 {RESPONSE_FORMATS} 중 하나여야 합니다")
     try:
-        if fdr is None:
-            raise HTTPException(status_code=500, detail="FinanceDataReader not available")
-        
         # 기본 날짜 설정
         if not end:
             end = datetime.now().strftime('%Y-%m-%d')
         if not start:
             start = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
         
-        # 데이터 조회
-        df = fdr.DataReader(symbol, start, end)
+        # 데이터 조회 (일봉은 시세 저장소 우선, 부족한 구간만 원격 조회)
+        if interval == "1d":
+            df = await run_in_threadpool(StockPriceService(db).get_daily_prices, symbol, start, end)
+        else:
+            if fdr is None:
+                raise HTTPException(status_code=500, detail="FinanceDataReader not available")
+            df = await call_upstream_async(PROVIDER_FDR, fdr.DataReader, symbol, start, end)
         
         if df is None or len(df) == 0:
             raise HTTPException(status_code=404, detail="No data found for symbol")
         
-        # 데이터 변환
-        df = df.reset_index()
-        df['date'] = df['Date'].dt.strftime('%Y-%m-%d') if 'Date' in df.columns else df.index.strftime('%Y-%m-%d')
-        
-        candles = []
-        for _, row in df.iterrows():
-            candles.append(CandleData(
-                date=row['date'],
-                open=float(row['Open']),
-                high=float(row['High']),
-                low=float(row['Low']),
-                close=float(row['Close']),
-                volume=float(row['Volume']) if 'Volume' in row else None
-            ))
-        
-        return candles
+        # 데이터 변환 (NumPy 배열 -> JSON 바이트)
+        if 'Date' not in df.columns:
+            df = df.reset_index()
+        columns = {
+            'date': df['Date'].dt.strftime('%Y-%m-%d').to_numpy(dtype=object),
+            'open': df['Open'].to_numpy(dtype=float),
+            'high': df['High'].to_numpy(dtype=float),
+            'low': df['Low'].to_numpy(dtype=float),
+            'close': df['Close'].to_numpy(dtype=float),
+            'volume': df['Volume'].to_numpy(dtype=float) if 'Volume' in df.columns else None,
+        }
+        return columns_response(columns, response_format)
         
     except HTTPException:
         raise
@@ -261,73 +289,47 @@ def get_stock_indicators(
     symbol: str = Path(..., description="종목 코드"),
     start: Optional[str] = Query(None, description="시작일 (YYYY-MM-DD)"),
     end: Optional[str] = Query(None, description="종료일 (YYYY-MM-DD)"),
-    indicators: str = Query("ma,rsi,macd,bollinger", description="지표 종류 (ma,rsi,macd,bollinger)")
+    indicators: str = Query("ma,rsi,macd,bollinger", description="지표 종류 (ma,rsi,macd,bollinger)"),
+    response_format: str = Query("rows", alias="format", description="응답 형식 (rows: 행 목록, columnar: 컬럼별 배열)"),
+    db: Session = Depends(get_db)
 ):
-    """종목 기술지표 데이터 조회"""
+    """종목 기술지표 데이터 조회 (저장된 지표 구간 조회)"""
+    if response_format not in RESPONSE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format은 {RESPONSE_FORMATS} 중 하나여야 합니다")
     try:
-        if fdr is None:
-            raise HTTPException(status_code=500, detail="FinanceDataReader not available")
-        
-        # 기본 날짜 설정
-        if not end:
-            end = datetime.now().strftime('%Y-%m-%d')
-        if not start:
-            start = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-        
-        # 데이터 조회
-        df = fdr.DataReader(symbol, start, end)
-        
-        if df is None or len(df) == 0:
+        groups = parse_indicator_groups(indicators)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        start_date, end_date = resolve_date_range(start, end)
+        
+        # 요청 구간 첫 봉부터 지표가 정확하도록 필요한 warm-up 구간까지만 앞당겨 조회
+        fetch_start = warmup_start(start_date, required_lookback(groups))
+        
+        # 저장소에 없는 시세 구간 보충 (적재 시 지표도 함께 갱신됨)
+        stock_id = StockPriceService(db).ensure_range(symbol, fetch_start, end_date)
+        if stock_id is not None:
+            df = IndicatorService(db).get_range(stock_id, start_date, end_date)
+            values = {name: df[name].to_numpy(dtype=float) for name in df.columns if name != 'date'}
+            dates = pd.to_datetime(df['date'])
+        else:
+            # 종목 마스터에 없는 종목은 원격 시세로 즉석 계산 후 요청 구간만 남김
+            df = fetch_remote_daily_prices(symbol, fetch_start, end_date).sort_values('Date').reset_index(drop=True)
+            offset = int(np.searchsorted(df['Date'].to_numpy(), np.datetime64(start_date, 'ns')))
+            values = compute_indicators(df['Close'].to_numpy(dtype=float), groups, offset=offset)
+            df = df.iloc[offset:]
+            dates = df['Date']
+        
+        if len(df) == 0:
             raise HTTPException(status_code=404, detail="No data found for symbol")
         
-        # 기술지표 계산
-        df = df.reset_index()
-        df['date'] = df['Date'].dt.strftime('%Y-%m-%d') if 'Date' in df.columns else df.index.strftime('%Y-%m-%d')
-        
-        # 이동평균
-        if 'ma' in indicators:
-            df['ma5'] = df['Close'].rolling(window=5).mean()
-            df['ma20'] = df['Close'].rolling(window=20).mean()
-            df['ma60'] = df['Close'].rolling(window=60).mean()
-        
-        # RSI
-        if 'rsi' in indicators:
-            delta = df['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df['rsi'] = 100 - (100 / (1 + rs))
-        
-        # MACD
-        if 'macd' in indicators:
-            exp1 = df['Close'].ewm(span=12).mean()
-            exp2 = df['Close'].ewm(span=26).mean()
-            df['macd'] = exp1 - exp2
-            df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        
-        # 볼린저 밴드
-        if 'bollinger' in indicators:
-            df['ma20'] = df['Close'].rolling(window=20).mean()
-            std = df['Close'].rolling(window=20).std()
-            df['bollinger_upper'] = df['ma20'] + (std * 2)
-            df['bollinger_lower'] = df['ma20'] - (std * 2)
-        
-        # 결과 변환
-        indicators_list = []
-        for _, row in df.iterrows():
-            indicators_list.append(TechnicalIndicator(
-                date=row['date'],
-                ma5=float(row['ma5']) if 'ma5' in row and pd.notna(row['ma5']) else None,
-                ma20=float(row['ma20']) if 'ma20' in row and pd.notna(row['ma20']) else None,
-                ma60=float(row['ma60']) if 'ma60' in row and pd.notna(row['ma60']) else None,
-                rsi=float(row['rsi']) if 'rsi' in row and pd.notna(row['rsi']) else None,
-                macd=float(row['macd']) if 'macd' in row and pd.notna(row['macd']) else None,
-                macd_signal=float(row['macd_signal']) if 'macd_signal' in row and pd.notna(row['macd_signal']) else None,
-                bollinger_upper=float(row['bollinger_upper']) if 'bollinger_upper' in row and pd.notna(row['bollinger_upper']) else None,
-                bollinger_lower=float(row['bollinger_lower']) if 'bollinger_lower' in row and pd.notna(row['bollinger_lower']) else None
-            ))
-        
-        return indicators_list
+        # 결과 변환 (요청하지 않은 지표는 null)
+        requested = {output for name in groups for output in INDICATOR_GROUPS[name].outputs}
+        columns = {'date': dates.dt.strftime('%Y-%m-%d').to_numpy(dtype=object)}
+        for name in TechnicalIndicator.model_fields:
+            if name != 'date':
+                columns[name] = values.get(name) if name in requested else None
+        return columns_response(columns, response_format)
         
     except HTTPException:
         raise
@@ -2,14 +2,17 @@
 핵심 모듈들
 """
 from .config import settings
-from .database import get_db, create_tables, drop_tables, Base, engine, SessionLocal
+from .database import get_db, get_etl_db, create_tables, drop_tables, Base, engine, etl_engine, SessionLocal, ETLSessionLocal
 
 __all__ = [
     "settings",
     "get_db", 
+    "get_etl_db", 
     "create_tables", 
     "drop_tables", 
     "Base", 
     "engine", 
-    "SessionLocal"
+    "etl_engine", 
+    "SessionLocal", 
+    "ETLSessionLocal"
 ]
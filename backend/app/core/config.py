@@ -22,6 +22,16 @@ class Settings(BaseSettings):
     database_name: Optional[str] = None  # 데이터베이스 이름
     database_user: Optional[str] = None  # 사용자명
     database_password: Optional[str] = None  # 비밀번호
+    db_pool_size: int = 5  # 연결 풀에 유지할 연결 수
+    db_max_overflow: int = 10  # 풀이 찼을 때 추가로 허용할 연결 수
+    db_pool_timeout_seconds: int = 30  # 풀에서 연결을 기다리는 최대 시간
+    db_pool_pre_ping: bool = True  # 연결 대여 시 끊긴 연결인지 확인 후 재연결
+    db_pool_recycle_seconds: int = 1800  # 이 시간보다 오래된 연결은 새로 연결 (-1이면 재연결 안 함)
+    db_statement_timeout_ms: int = 30000  # API 쿼리 최대 실행 시간 (0이면 제한 없음)
+    etl_db_pool_size: int = 2  # ETL 배치용 연결 풀 크기
+    etl_db_max_overflow: int = 2  # ETL 배치용 추가 허용 연결 수
+    etl_db_pool_timeout_seconds: int = 120  # ETL 배치용 풀 대기 최대 시간
+    etl_db_statement_timeout_ms: int = 0  # ETL 쿼리 최대 실행 시간 (0이면 제한 없음)
     
     # Google Cloud SQL 설정
     gcp_project_id: Optional[str] = None
@@ -31,6 +41,35 @@ class Settings(BaseSettings):
     # Redis 설정 (캐싱용)
     redis_url: Optional[str] = None
     
+    # 종목 목록 캐시 설정
+    stock_listing_ttl_seconds: int = 3600  # 종목 목록 갱신 주기
+    stock_listing_retry_seconds: int = 60  # 갱신 실패 시 재시도 간격
+    
+    # 재무제표 점수 캐시 설정
+    fs_score_cache_size: int = 256  # 프로세스 내 최대 보관 조합 수
+    fs_score_cache_ttl_seconds: int = 86400  # Redis 보관 기간
+    fs_score_version_check_seconds: int = 60  # 원본 테이블 변경 확인 간격 (백그라운드에서 테이블 전체를 읽음)
+    fs_score_backend: str = "exact-1d"  # 점수화 방식 (exact-1d, quantile, sklearn-ensemble)
+    
+    # 시세 저장소 설정
+    price_tail_refresh_seconds: int = 300  # 최신 구간 원격 재확인 최소 간격 (종목별)
+    price_check_memo_size: int = 4096  # 원격 조회 기록 최대 보관 종목 수 (초과 시 오래 안 쓴 종목부터 삭제)
+    
+    # ETL 추출 동시성 설정
+    etl_fetch_workers: int = 8  # 시세 추출 동시 실행 수
+    fdr_requests_per_second: float = 5.0  # FinanceDataReader 초당 요청 수 (0이면 제한 없음)
+    yfinance_requests_per_second: float = 2.0  # Yahoo Finance 초당 요청 수 (0이면 제한 없음)
+    yfinance_batch_size: int = 50  # 미국 시세 일괄 추출 시 한 번에 요청할 종목 수 (1 이하면 종목별 추출)
+    etl_stage_queue_size: int = 16  # 스트리밍 ETL 단계 사이 큐 크기 (메모리 상한)
+    etl_load_batch_size: int = 20  # 스트리밍 ETL 적재 배치 종목 수
+    
+    # 외부 시세 API 호출 설정 (요청 처리 중 호출)
+    upstream_max_workers: int = 8  # 외부 API 동시 호출 수
+    upstream_max_pending: int = 16  # 동시 호출 수를 넘었을 때 대기 허용 수 (초과 시 503, 동시 호출 수와 합이 기본 스레드 풀 40 미만)
+    upstream_timeout_seconds: float = 10.0  # 호출당 최대 대기 시간 (초과 시 503)
+    upstream_breaker_failures: int = 5  # 연속 실패 시 호출 차단
+    upstream_breaker_reset_seconds: float = 30.0  # 차단 유지 시간 (이후 시험 호출)
+    
     # 이메일 설정
     email_sender: Optional[str] = None
     email_password: Optional[str] = None
@@ -1,7 +1,14 @@
 """
 데이터베이스 연결 및 세션 관리
 """
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
@@ -15,14 +22,210 @@ def get_database_url():
         # SQLite 연결 (로컬 개발)
         return settings.database_url
 
-# 데이터베이스 엔진 생성
-engine = create_engine(
-    get_database_url(),
-    connect_args={"check_same_thread": False} if "sqlite" in get_database_url() else {}
-)
+# 비동기 엔진에서 사용할 드라이버
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url() -> str:
+    """동기 DB URL의 드라이버를 비동기 드라이버로 바꾼 URL"""
+    url = make_url(get_database_url())
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+# 엔진 용도 (API 요청과 ETL 배치는 서로 다른 풀을 사용해 ETL이 API 연결을 고갈시키지 않게 함)
+WORKLOAD_API = "api"
+WORKLOAD_ETL = "etl"
+
+
+def get_pool_settings(workload: str) -> dict:
+    """용도별 풀 설정"""
+    if workload == WORKLOAD_ETL:
+        return {
+            "pool_size": settings.etl_db_pool_size,
+            "max_overflow": settings.etl_db_max_overflow,
+            "pool_timeout": settings.etl_db_pool_timeout_seconds,
+            "statement_timeout_ms": settings.etl_db_statement_timeout_ms,
+        }
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "statement_timeout_ms": settings.db_statement_timeout_ms,
+    }
+
+
+def get_engine_options(url: str, workload: str = WORKLOAD_API, is_async: bool = False) -> dict:
+    """DB 종류/용도별 엔진 옵션 (PostgreSQL은 풀 크기, 연결 확인, 재연결 주기, 문장 시간 제한을 settings에서 설정)"""
+    if "sqlite" in url:
+        return {} if is_async else {"connect_args": {"check_same_thread": False}}
+
+    pool_settings = get_pool_settings(workload)
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": pool_settings["pool_size"],
+        "max_overflow": pool_settings["max_overflow"],
+        "pool_timeout": pool_settings["pool_timeout"],
+        # 유휴 중 끊긴 연결(Cloud SQL 유휴 연결 정리 등)을 대여 시점에 확인하고 다시 연결
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+    }
+    # 연결마다 statement_timeout 적용 (0이면 제한 없음)
+    timeout_ms = pool_settings["statement_timeout_ms"]
+    if timeout_ms > 0:
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout_ms)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
+
+
+class PoolMetrics:
+    """
+    연결 풀 재사용/대기 통계
+
+    connects는 실제로 새로 맺은 DB 연결 수, checkouts는 풀에서 연결을 빌려간 횟수입니다.
+    재사용률이 낮으면 풀 크기가 부족하거나 연결이 자주 끊기고 있다는 뜻이고,
+    대여 대기 시간과 포화도(사용 중 연결 / 최대 연결)가 높으면 풀이 부족하다는 뜻입니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidated = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+
+    def attach(self, target_engine):
+        """엔진 풀 이벤트에 통계 수집 등록"""
+        event.listen(target_engine, "connect", self._on_connect)
+        event.listen(target_engine, "checkout", self._on_checkout)
+        event.listen(target_engine, "checkin", self._on_checkin)
+        event.listen(target_engine, "invalidate", self._on_invalidate)
+        if isinstance(target_engine.pool, _CheckoutTimingMixin):
+            target_engine.pool.metrics = self
+
+    def observe_wait(self, seconds: float, timed_out: bool, checked_out: int):
+        """풀에서 연결을 얻기까지 걸린 시간 기록"""
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidated += 1
+
+    def snapshot(self, target_engine) -> dict:
+        """현재 풀 상태와 누적 통계"""
+        pool = target_engine.pool
+        stats = {
+            'pool': type(pool).__name__,
+            'connects': self.connects,
+            'checkouts': self.checkouts,
+            'checkins': self.checkins,
+            'invalidated': self.invalidated,
+            'reuse_ratio': round(1 - self.connects / self.checkouts, 4) if self.checkouts else None,
+        }
+        # QueuePool에서만 제공되는 현재 상태
+        for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+            getter = getattr(pool, name, None)
+            if callable(getter):
+                stats[name] = getter()
+        if isinstance(pool, _CheckoutTimingMixin):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            stats.update({
+                'waits': self.waits,
+                'avg_wait_ms': round(self.wait_seconds / self.waits * 1000, 3) if self.waits else 0.0,
+                'max_wait_ms': round(self.max_wait_seconds * 1000, 3),
+                'timeouts': self.timeouts,
+                'peak_checked_out': self.peak_checked_out,
+                'saturation': round(pool.checkedout() / capacity, 4) if capacity else None,
+                'peak_saturation': round(self.peak_checked_out / capacity, 4) if capacity else None,
+            })
+        return stats
+
+
+class _CheckoutTimingMixin:
+    """연결 대여 대기 시간과 포화도를 PoolMetrics에 기록 (QueuePool 계열과 함께 사용)"""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.monotonic()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.monotonic() - started, timed_out, self.checkedout())
+
+    def recreate(self):
+        # engine.dispose() 등으로 풀을 다시 만들 때 통계 연결 유지
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """대여 대기 시간을 기록하는 QueuePool (동기 엔진용)"""
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """대여 대기 시간을 기록하는 AsyncAdaptedQueuePool (비동기 엔진용)"""
+
+
+def _create_engine(workload: str):
+    """용도별 엔진 생성 및 풀 통계 등록"""
+    url = get_database_url()
+    target_engine = create_engine(url, **get_engine_options(url, workload))
+    metrics = PoolMetrics()
+    metrics.attach(target_engine)
+    return target_engine, metrics
+
+
+# 데이터베이스 엔진 생성 (API 요청용)
+engine, pool_metrics = _create_engine(WORKLOAD_API)
+
+# ETL 배치용 엔진 (별도 풀)
+etl_engine, etl_pool_metrics = _create_engine(WORKLOAD_ETL)
 
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ETLSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=etl_engine)
+
+# 비동기 엔진 (API 요청용, 첫 사용 시 생성)
+# asyncpg는 API 서버에서만 필요하므로 ETL/Airflow처럼 비동기 세션을 쓰지 않는 곳에서는 만들지 않음
+_async_engine = None
+_async_session_factory = None
+_async_engine_lock = threading.Lock()
+async_pool_metrics = PoolMetrics()
 
 # 기본 모델 클래스
 Base = declarative_base()
@@ -37,6 +240,67 @@ def get_db():
         db.close()
 
 
+def get_etl_db():
+    """ETL 배치용 데이터베이스 세션 (API와 분리된 풀 사용)"""
+    db = ETLSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_async_engine():
+    """비동기 엔진 반환 (없으면 생성)"""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        with _async_engine_lock:
+            if _async_engine is None:
+                from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+                url = get_async_database_url()
+                async_engine = create_async_engine(url, **get_engine_options(url, WORKLOAD_API, is_async=True))
+                async_pool_metrics.attach(async_engine.sync_engine)
+                # 커밋 후에도 응답 직렬화에서 속성을 쓸 수 있도록 만료시키지 않음 (비동기 세션은 지연 로딩 불가)
+                _async_session_factory = async_sessionmaker(
+                    async_engine, autoflush=False, expire_on_commit=False
+                )
+                _async_engine = async_engine
+    return _async_engine
+
+
+async def get_async_db():
+    """비동기 데이터베이스 세션 의존성 (이벤트 루프를 막지 않음)"""
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """비동기 엔진 연결 정리 (서버 종료 시)"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+def get_raw_connection():
+    """
+    풀에서 DBAPI 연결 대여 (psycopg2 커서/pandas.read_sql_query를 직접 쓰는 코드용)
+
+    close()를 호출하면 실제로 끊지 않고 풀에 반환합니다.
+    """
+    return engine.raw_connection()
+
+
+def get_pool_stats() -> dict:
+    """용도별 연결 풀 재사용/대기 통계"""
+    stats = {
+        WORKLOAD_API: pool_metrics.snapshot(engine),
+        WORKLOAD_ETL: etl_pool_metrics.snapshot(etl_engine),
+    }
+    if _async_engine is not None:
+        stats[f"{WORKLOAD_API}_async"] = async_pool_metrics.snapshot(_async_engine.sync_engine)
+    return stats
+
+
 def create_tables():
     """데이터베이스 테이블 생성"""
     Base.metadata.create_all(bind=engine)
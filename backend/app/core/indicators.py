@@ -0,0 +1,349 @@
+"""
+기술적 지표 계산 엔진
+
+ETL(DataPreprocessor)과 API(/stocks/{symbol}/indicators)가 함께 사용하는
+NumPy 벡터화 지표 계산 모듈입니다.
+
+- 종가 배열은 1차원(일자) 또는 2차원(종목 × 일자)을 받으며, 항상 마지막 축이 시간축입니다.
+- 요청된 지표 그룹만 계산하고, MA20처럼 여러 지표가 공유하는 중간값은 한 번만 계산합니다.
+- EMA는 pandas ewm(adjust=False)와 같은 재귀식(결측 처리 포함)을 사용하며, 1차원은 시간축 병렬 누적으로 계산합니다.
+- 증분 계산: 앞쪽 warm-up 구간(offset)과 직전 EMA 상태(state)를 넘기면
+  새 구간만 이어서 계산합니다 (지표 저장소 갱신용).
+"""
+import math
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# 지표 파라미터
+MA_WINDOWS = (5, 20, 60)
+RSI_PERIOD = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+BOLLINGER_WINDOW = 20
+BOLLINGER_K = 2.0
+
+# 이동 구간 지표(MA/RSI/볼린저)를 이어서 계산할 때 필요한 직전 종가 수
+ROLLING_LOOKBACK = max(max(MA_WINDOWS), BOLLINGER_WINDOW, RSI_PERIOD + 1)
+
+# EMA는 이론상 전체 이력에 의존하므로 가장 긴 기간의 몇 배를 warm-up으로 사용
+# (4배면 초기값의 가중치가 (1 - 2/27)^104 ≈ 0.03% 이하)
+EMA_WARMUP_FACTOR = 4
+
+# 증분 계산 시 이어받는 EMA 상태 (MACD 신호선은 macd_signal 값 자체가 상태)
+EMA_STATE_KEYS = ("ema_fast", "ema_slow", "macd_signal")
+
+
+# ---------------------------------------------------------------------------
+# 기본 연산 (마지막 축 기준)
+# ---------------------------------------------------------------------------
+
+def _as_float_array(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _window_sums(x: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """누적합으로 구간 합과 유효값 개수를 계산 (출력 길이 n - window + 1)"""
+    valid = np.isfinite(x)
+    pad = np.zeros(x.shape[:-1] + (1,))
+    csum = np.concatenate([pad, np.cumsum(np.where(valid, x, 0.0), axis=-1)], axis=-1)
+    ccount = np.concatenate([pad, np.cumsum(valid, axis=-1, dtype=np.float64)], axis=-1)
+    return csum[..., window:] - csum[..., :-window], ccount[..., window:] - ccount[..., :-window]
+
+
+def rolling_mean(x, window: int) -> np.ndarray:
+    """단순 이동평균 (구간 내 결측이 있으면 NaN, pandas rolling().mean()과 동일)"""
+    x = _as_float_array(x)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < window:
+        return out
+    sums, counts = _window_sums(x, window)
+    out[..., window - 1:] = np.where(counts == window, sums / window, np.nan)
+    return out
+
+
+def rolling_std(x, window: int, ddof: int = 1) -> np.ndarray:
+    """이동 표준편차 (pandas rolling().std()와 동일한 ddof=1 기본값)"""
+    x = _as_float_array(x)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < window:
+        return out
+
+    # 누적 제곱합의 자릿수 손실을 줄이기 위해 종목별 평균으로 중심화
+    valid = np.isfinite(x)
+    total = np.where(valid, x, 0.0).sum(axis=-1, keepdims=True)
+    count = valid.sum(axis=-1, keepdims=True)
+    centered = x - total / np.maximum(count, 1)
+
+    sums, counts = _window_sums(centered, window)
+    sq_sums, _ = _window_sums(centered * centered, window)
+    var = (sq_sums - sums * sums / window) / (window - ddof)
+    out[..., window - 1:] = np.where(counts == window, np.sqrt(np.maximum(var, 0.0)), np.nan)
+    return out
+
+
+def _linear_scan(a: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """
+    y_t = a_t * y_(t-1) + c_t (y_(-1) = 0)를 마지막 축으로 병렬 누적 계산
+
+    (a, c) 쌍의 결합 법칙을 이용한 Hillis-Steele scan으로, 시간축 루프 대신
+    log2(n)번의 배열 연산으로 끝납니다 (곱셈/덧셈만 사용하므로 값이 발산하지 않음).
+    """
+    a = a.copy()
+    c = c.copy()
+    shift = 1
+    while shift < a.shape[-1]:
+        # 우변은 갱신 전 값으로 먼저 계산됨
+        c[..., shift:] = a[..., shift:] * c[..., :-shift] + c[..., shift:]
+        a[..., shift:] = a[..., shift:] * a[..., :-shift]
+        shift *= 2
+    return c
+
+
+def _ema_coefficients(valid: np.ndarray, no_state: np.ndarray, alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    EMA 점화식 y_t = decay_t * y_(t-1) + gain_t * x_t 의 계수 (pandas ignore_na=False 가중치)
+
+    결측 위치는 직전 값을 유지(decay=1, gain=0)하고, 결측 k개 뒤의 값은 이전 가중치
+    (1 - alpha)^(k+1)과 alpha로 정규화합니다. 이전 값이 없으면 새 값으로 시작(decay=0, gain=1)합니다.
+    """
+    n = valid.shape[-1]
+    if valid.all():
+        # 결측 없음: 계수가 상수 (이전 값이 없는 종목만 첫 위치에서 새 값으로 시작)
+        decay = np.full(valid.shape, 1.0 - alpha)
+        gain = np.full(valid.shape, alpha)
+        decay[..., 0] = np.where(no_state, 0.0, 1.0 - alpha)
+        gain[..., 0] = np.where(no_state, 1.0, alpha)
+        return decay, gain
+
+    # 직전 유효값 위치 (state가 있으면 -1 위치에 유효값이 있는 것으로 봄, 없으면 -(n + 1))
+    positions = np.broadcast_to(np.arange(n), valid.shape)
+    start = np.where(no_state, -(n + 1), -1)[..., None]
+    last_valid = np.maximum.accumulate(np.where(valid, positions, start), axis=-1)
+    prev_valid = np.concatenate([start, last_valid[..., :-1]], axis=-1)
+    has_prev = prev_valid >= -1
+
+    # 결측 간격(gap)만큼 줄어든 이전 가중치와 새 값 가중치(alpha)로 정규화
+    gap = np.where(has_prev, positions - prev_valid - 1, 0)
+    old_weight = (1.0 - alpha) ** (gap + 1)
+    decay = np.where(valid, np.where(has_prev, old_weight / (old_weight + alpha), 0.0), 1.0)
+    gain = np.where(valid, np.where(has_prev, alpha / (old_weight + alpha), 1.0), 0.0)
+    return decay, gain
+
+
+def ema(x, span: int, state=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    지수이동평균 (pandas 2.x ewm(span=span, adjust=False).mean()과 같은 결과)
+
+    결측 처리도 pandas 기본값(ignore_na=False)과 같습니다.
+    - 결측 위치는 직전 EMA 값을 그대로 내보내고, 첫 유효값 전에는 NaN
+    - 결측 k개 뒤의 값은 이전 EMA 가중치를 (1 - alpha)^(k+1)로 줄인 뒤 alpha와 정규화해 반영
+
+    결측 간격에 따라 계수가 바뀌는 1차 선형 점화식이므로 1차원은 _linear_scan으로 벡터 계산하고,
+    2차원은 시간축으로 순회하면서 종목축을 벡터 연산합니다.
+
+    Args:
+        x: 1차원 또는 2차원 배열
+        span: EMA 기간
+        state: 직전 EMA 값 (이어서 계산할 때 사용, None이면 첫 유효값에서 시작)
+
+    Returns:
+        (EMA 배열, 마지막 EMA 상태)
+    """
+    x = _as_float_array(x)
+    alpha = 2.0 / (span + 1.0)
+    init = np.full(x.shape[:-1], np.nan) if state is None else np.array(state, dtype=np.float64)
+    n = x.shape[-1]
+    if n == 0:
+        return x.copy(), (np.float64(init) if x.ndim == 1 else init)
+
+    valid = ~np.isnan(x)
+    decay, gain = _ema_coefficients(valid, np.isnan(init), alpha)
+    c = gain * np.where(valid, x, 0.0)
+    c[..., 0] += decay[..., 0] * np.nan_to_num(init)
+    if x.ndim == 1:
+        out = _linear_scan(decay, c)
+    else:
+        # 2차원: 종목축이 이미 벡터 연산이므로 시간축 순회가 scan보다 연산량이 적음
+        out = np.empty_like(c)
+        cur = np.zeros(x.shape[:-1])
+        for t in range(n):
+            cur = decay[..., t] * cur + c[..., t]
+            out[..., t] = cur
+    # 첫 유효값 전은 NaN
+    started = np.logical_or.accumulate(valid, axis=-1) | ~np.isnan(init)[..., None]
+    out[~started] = np.nan
+    last = out[..., -1]
+    return out, (np.float64(last) if x.ndim == 1 else last)
+
+
+# ---------------------------------------------------------------------------
+# 지표 그룹
+# ---------------------------------------------------------------------------
+
+class _IndicatorContext:
+    """지표 계산 중 공유되는 중간값 캐시"""
+
+    def __init__(self, close: np.ndarray, offset: int = 0, state: Optional[Dict] = None):
+        self.close = close
+        self.offset = offset
+        self.state = state
+        self._sma: Dict[int, np.ndarray] = {}
+
+    def ema(self, x: np.ndarray, span: int, key: str) -> np.ndarray:
+        """EMA 계산 (직전 상태가 있으면 offset 이후 구간만 이어서 계산)"""
+        if self.state is None:
+            values, _ = ema(x, span)
+            return values
+        out = np.full(x.shape, np.nan)
+        out[..., self.offset:], _ = ema(x[..., self.offset:], span, state=self.state.get(key))
+        return out
+
+    def sma(self, window: int) -> np.ndarray:
+        if window not in self._sma:
+            self._sma[window] = rolling_mean(self.close, window)
+        return self._sma[window]
+
+
+def _compute_ma(ctx: _IndicatorContext) -> Dict[str, np.ndarray]:
+    return {f"ma{w}": ctx.sma(w) for w in MA_WINDOWS}
+
+
+def _compute_rsi(ctx: _IndicatorContext) -> Dict[str, np.ndarray]:
+    close = ctx.close
+    delta = np.zeros_like(close)
+    delta[..., 1:] = np.diff(close, axis=-1)
+    # pandas delta.where(delta > 0, 0)과 동일하게 결측 변화량은 0으로 취급
+    delta = np.where(np.isnan(delta), 0.0, delta)
+    gain = rolling_mean(np.maximum(delta, 0.0), RSI_PERIOD)
+    loss = rolling_mean(np.maximum(-delta, 0.0), RSI_PERIOD)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = gain / loss
+        rsi = 100.0 - 100.0 / (1.0 + rs)
+    return {"rsi": rsi}
+
+
+def _compute_macd(ctx: _IndicatorContext) -> Dict[str, np.ndarray]:
+    fast = ctx.ema(ctx.close, MACD_FAST, "ema_fast")
+    slow = ctx.ema(ctx.close, MACD_SLOW, "ema_slow")
+    macd = fast - slow
+    signal = ctx.ema(macd, MACD_SIGNAL, "macd_signal")
+    return {
+        "macd": macd,
+        "macd_signal": signal,
+        "macd_hist": macd - signal,
+        "ema_fast": fast,
+        "ema_slow": slow,
+    }
+
+
+def _compute_bollinger(ctx: _IndicatorContext) -> Dict[str, np.ndarray]:
+    middle = ctx.sma(BOLLINGER_WINDOW)
+    std = rolling_std(ctx.close, BOLLINGER_WINDOW)
+    return {
+        "bollinger_upper": middle + BOLLINGER_K * std,
+        "bollinger_middle": middle,
+        "bollinger_lower": middle - BOLLINGER_K * std,
+    }
+
+
+@dataclass(frozen=True)
+class IndicatorGroup:
+    """지표 그룹 정의"""
+    name: str
+    outputs: Tuple[str, ...]
+    compute: Callable[[_IndicatorContext], Dict[str, np.ndarray]]
+    lookback: int  # 첫 값이 정확해지기 위해 필요한 직전 봉 수
+
+
+# 새 지표는 여기에 그룹을 추가하면 ETL과 API에서 함께 사용됩니다
+INDICATOR_GROUPS: Dict[str, IndicatorGroup] = {
+    group.name: group for group in (
+        IndicatorGroup("ma", tuple(f"ma{w}" for w in MA_WINDOWS), _compute_ma, max(MA_WINDOWS) - 1),
+        IndicatorGroup("rsi", ("rsi",), _compute_rsi, RSI_PERIOD),
+        IndicatorGroup(
+            "macd",
+            ("macd", "macd_signal", "macd_hist", "ema_fast", "ema_slow"),
+            _compute_macd,
+            EMA_WARMUP_FACTOR * MACD_SLOW + MACD_SIGNAL
+        ),
+        IndicatorGroup(
+            "bollinger",
+            ("bollinger_upper", "bollinger_middle", "bollinger_lower"),
+            _compute_bollinger,
+            BOLLINGER_WINDOW - 1
+        ),
+    )
+}
+
+DEFAULT_INDICATORS = tuple(INDICATOR_GROUPS.keys())
+
+
+def parse_indicator_groups(spec: Optional[str]) -> List[str]:
+    """
+    "ma,rsi,macd" 형태의 지표 문자열을 그룹 목록으로 변환
+
+    Raises:
+        ValueError: 알 수 없는 지표가 포함된 경우
+    """
+    if not spec:
+        return list(DEFAULT_INDICATORS)
+    groups = []
+    for name in (part.strip().lower() for part in spec.split(",")):
+        if not name:
+            continue
+        if name not in INDICATOR_GROUPS:
+            raise ValueError(f"지원하지 않는 지표: {name} (지원: {', '.join(INDICATOR_GROUPS)})")
+        if name not in groups:
+            groups.append(name)
+    return groups
+
+
+def required_lookback(indicators: Iterable[str]) -> int:
+    """요청된 지표 그룹 계산에 필요한 warm-up 봉 수"""
+    return max((INDICATOR_GROUPS[name].lookback for name in indicators), default=0)
+
+
+def warmup_start(start_date: date, lookback: int) -> date:
+    """
+    warm-up 봉을 포함한 조회 시작일
+
+    영업일 기준으로 lookback만큼 앞당기고, 공휴일 휴장분으로 10%(최소 5일)를 더합니다.
+    """
+    if lookback <= 0:
+        return start_date
+    bars = lookback + max(5, math.ceil(lookback * 0.1))
+    shifted = np.busday_offset(np.datetime64(start_date, 'D'), -bars, roll='backward')
+    return shifted.astype(object)
+
+
+def compute_indicators(
+    close,
+    indicators: Iterable[str] = DEFAULT_INDICATORS,
+    offset: int = 0,
+    state: Optional[Dict] = None
+) -> Dict[str, np.ndarray]:
+    """
+    요청된 지표 그룹 계산
+
+    Args:
+        close: 종가 배열 (일자) 또는 행렬 (종목 × 일자)
+        indicators: 지표 그룹명 목록 (ma, rsi, macd, bollinger)
+        offset: 앞쪽 warm-up 구간 길이 (이동 구간 계산에만 쓰고 결과에서는 제외)
+        state: offset 직전 시점의 EMA 상태 (EMA_STATE_KEYS, None이면 처음부터 계산)
+
+    Returns:
+        출력 컬럼명 -> 배열 (마지막 축 길이는 입력 길이 - offset)
+    """
+    ctx = _IndicatorContext(_as_float_array(close), offset=offset, state=state)
+    results: Dict[str, np.ndarray] = {}
+    for name in indicators:
+        if name not in INDICATOR_GROUPS:
+            raise ValueError(f"지원하지 않는 지표: {name}")
+        results.update(INDICATOR_GROUPS[name].compute(ctx))
+    if offset:
+        results = {key: values[..., offset:] for key, values in results.items()}
+    return results
@@ -0,0 +1,103 @@
+"""
+컬럼 기반 JSON 직렬화
+
+DataFrame.iterrows()와 행 단위 Pydantic 모델 생성을 거치지 않고
+NumPy 배열에서 바로 JSON 바이트를 만들어 Response로 반환합니다.
+NaN/Inf는 배열 단위로 null 처리합니다.
+"""
+import json
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 응답 형식
+ORIENT_RECORDS = "rows"  # [{"date": ..., "open": ...}, ...] (기존 응답과 동일한 구조)
+ORIENT_COLUMNS = "columnar"  # {"date": [...], "open": [...]}
+RESPONSE_FORMATS = (ORIENT_RECORDS, ORIENT_COLUMNS)
+
+
+def _column_length(columns: Mapping[str, Any]) -> int:
+    for values in columns.values():
+        if values is not None and not np.isscalar(values):
+            return len(values)
+    return 0
+
+
+def _encode_array(values: Any, length: int) -> list:
+    """1차원 배열을 JSON 배열 원소 문자열 리스트로 변환 (벡터 연산)"""
+    if values is None:
+        return ["null"] * length
+
+    arr = np.asarray(values)
+    if arr.dtype.kind == "f":
+        text = arr.astype(str)
+        text[~np.isfinite(arr)] = "null"
+        return text.tolist()
+    if arr.dtype.kind in "iu":
+        return arr.astype(str).tolist()
+    if arr.dtype.kind == "b":
+        return np.where(arr, "true", "false").tolist()
+    return [json.dumps(v, ensure_ascii=False) if v is not None else "null" for v in arr.tolist()]
+
+
+def _to_plain_list(values: Any, length: int) -> list:
+    """orjson 경로용: 배열을 파이썬 리스트로 변환 (float NaN은 orjson이 null로 직렬화)"""
+    if values is None:
+        return [None] * length
+    if isinstance(values, list):
+        return values
+    return np.asarray(values).tolist()
+
+
+def dumps_columns(columns: Mapping[str, Any], orient: str = ORIENT_RECORDS) -> bytes:
+    """
+    컬럼 딕셔너리를 JSON 바이트로 직렬화
+
+    Args:
+        columns: 컬럼명 -> 1차원 배열 (None이면 모든 행이 null)
+        orient: "rows" (객체 배열) 또는 "columnar" (컬럼별 배열)
+
+    Returns:
+        UTF-8 JSON 바이트
+    """
+    if orient not in RESPONSE_FORMATS:
+        raise ValueError(f"지원하지 않는 응답 형식: {orient}")
+
+    length = _column_length(columns)
+    names = list(columns.keys())
+
+    if orjson is not None:
+        if orient == ORIENT_COLUMNS:
+            payload: Any = {name: _to_plain_list(columns[name], length) for name in names}
+        else:
+            lists = [_to_plain_list(columns[name], length) for name in names]
+            payload = [dict(zip(names, row)) for row in zip(*lists)] if lists else []
+        return orjson.dumps(payload)
+
+    encoded = [_encode_array(columns[name], length) for name in names]
+    keys = [json.dumps(name, ensure_ascii=False) for name in names]
+    if orient == ORIENT_COLUMNS:
+        body = ",".join(f"{key}:[{','.join(values)}]" for key, values in zip(keys, encoded))
+        return ("{" + body + "}").encode("utf-8")
+
+    prefixes = [f"{key}:" for key in keys]
+    rows = (
+        "{" + ",".join(prefix + value for prefix, value in zip(prefixes, row)) + "}"
+        for row in zip(*encoded)
+    )
+    return ("[" + ",".join(rows) + "]").encode("utf-8")
+
+
+def columns_response(
+    columns: Mapping[str, Any],
+    orient: str = ORIENT_RECORDS,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """컬럼 딕셔너리를 JSON Response로 반환"""
+    return Response(content=dumps_columns(columns, orient), media_type="application/json", headers=headers)
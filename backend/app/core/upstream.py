@@ -0,0 +1,318 @@
+"""
+외부 시세 API 호출 실행기
+
+요청 처리 중 FinanceDataReader / yfinance 호출을 전용 스레드 풀에서 실행합니다.
+
+- 동시 실행 + 대기 수를 제한해, 외부 API가 느려져도 Starlette 기본 스레드 풀이
+  외부 호출에 묶여 /health 같은 다른 엔드포인트까지 멈추지 않게 합니다.
+- 호출마다 시간 제한을 두고, 초과하면 기다리지 않고 503으로 응답합니다.
+- 데이터 소스별 서킷 브레이커가 연속 실패 시 일정 시간 호출을 차단하고 바로 503을 반환합니다.
+  실패로 세는 것은 시간 초과와 네트워크 오류뿐이며, 잘못된 종목코드 같은 입력 오류는 세지 않습니다.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from anyio import to_thread
+from fastapi import HTTPException, status
+
+try:
+    from requests.exceptions import RequestException
+except ImportError:
+    RequestException = OSError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 데이터 소스 구분 (app.etl.concurrency의 SOURCE_* 와 같은 값)
+PROVIDER_FDR = "fdr"
+PROVIDER_YFINANCE = "yfinance"
+
+# 서킷 브레이커 상태
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# 서킷 브레이커 실패로 세는 예외 (외부 API 장애, ConnectionError/TimeoutError는 OSError 하위)
+TRANSPORT_ERRORS = (RequestException, OSError)
+
+
+class UpstreamUnavailable(HTTPException):
+    """
+    외부 API를 지금 호출할 수 없음 (503)
+
+    reason: circuit_open (차단 중), saturated (실행기 포화), timeout (시간 초과),
+            loading (종목 목록 최초 적재 중)
+    """
+
+    def __init__(self, provider: str, reason: str, retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"외부 시세 API를 일시적으로 사용할 수 없습니다: {provider} ({reason})",
+            headers={"Retry-After": str(max(1, retry_after))}
+        )
+        self.provider = provider
+        self.reason = reason
+
+
+class CircuitBreaker:
+    """
+    연속 실패 기반 서킷 브레이커 (스레드 안전)
+
+    failure_threshold번 연속 실패하면 reset_seconds 동안 호출을 차단하고,
+    이후 한 건만 시험 호출(half_open)해 성공하면 다시 열어줍니다.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = float("-inf")
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """호출 허용 여부 (half_open에서는 시험 호출 한 건만 허용)"""
+        with self._lock:
+            if self.state == STATE_OPEN:
+                if time.monotonic() - self.opened_at < self.reset_seconds:
+                    self.rejected += 1
+                    return False
+                self.state = STATE_HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == STATE_HALF_OPEN:
+                if self._trial_in_flight:
+                    self.rejected += 1
+                    return False
+                self._trial_in_flight = True
+            return True
+
+    def retry_after(self) -> int:
+        """차단 해제까지 남은 시간 (초)"""
+        remaining = self.reset_seconds - (time.monotonic() - self.opened_at)
+        return int(max(1, remaining))
+
+    def release_trial(self):
+        """시험 호출을 실행하지 못한 경우 다음 요청이 시험 호출하도록 되돌림"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != STATE_CLOSED:
+                logger.info(f"외부 API 서킷 닫힘: {self.name}")
+            self.state = STATE_CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.state == STATE_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != STATE_OPEN:
+                    logger.warning(
+                        f"외부 API 서킷 열림: {self.name}, 연속 실패 {self.consecutive_failures}회, "
+                        f"{self.reset_seconds}초 동안 차단"
+                    )
+                self.state = STATE_OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'rejected': self.rejected,
+        }
+
+
+class UpstreamExecutor:
+    """
+    외부 API 전용 제한 실행기
+
+    Args:
+        max_workers: 동시 실행 수 (None이면 settings.upstream_max_workers)
+        max_pending: 실행 대기 허용 수 (None이면 settings.upstream_max_pending)
+        timeout_seconds: 기본 호출 시간 제한 (None이면 settings.upstream_timeout_seconds)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout_seconds: Optional[float] = None
+    ):
+        self.max_workers = max(1, max_workers or settings.upstream_max_workers)
+        max_pending = max_pending if max_pending is not None else settings.upstream_max_pending
+        self.capacity = self.max_workers + max(0, max_pending)
+        self.timeout_seconds = timeout_seconds or settings.upstream_timeout_seconds
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="upstream")
+        # 실행 중 + 대기 중 호출 수 제한 (시간 초과로 포기한 호출도 끝날 때까지 자리를 차지)
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.saturated = 0
+        self.timeouts = 0
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        """데이터 소스별 서킷 브레이커"""
+        with self._lock:
+            breaker = self._breakers.get(provider)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    provider,
+                    settings.upstream_breaker_failures,
+                    settings.upstream_breaker_reset_seconds
+                )
+                self._breakers[provider] = breaker
+            return breaker
+
+    def call(self, provider: str, func: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        외부 API 호출 (결과를 기다려 반환)
+
+        func의 예외는 그대로 다시 발생합니다. 네트워크 오류(TRANSPORT_ERRORS)만 서킷 브레이커
+        실패로 집계하고, 그 외 예외(알 수 없는 종목코드, 응답 파싱 오류 등)는 외부 API가 응답한
+        것이므로 성공으로 집계합니다.
+
+        Raises:
+            UpstreamUnavailable: 서킷 차단 중, 실행기 포화, 시간 초과
+        """
+        breaker, future = self._submit(provider, func, args, kwargs)
+        try:
+            result = future.result(timeout=timeout or self.timeout_seconds)
+        except FutureTimeoutError:
+            raise self._timed_out(provider, func, breaker, future)
+        except TRANSPORT_ERRORS:
+            breaker.record_failure()
+            raise
+        except Exception:
+            breaker.record_success()
+            raise
+        breaker.record_success()
+        return result
+
+    async def call_async(self, provider: str, func: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """
+        외부 API 호출 (async 핸들러용, 기다리는 동안 스레드를 점유하지 않음)
+
+        예외와 서킷 브레이커 집계는 call과 같습니다.
+        """
+        breaker, future = self._submit(provider, func, args, kwargs)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout_seconds)
+        except asyncio.TimeoutError:
+            raise self._timed_out(provider, func, breaker, future)
+        except asyncio.CancelledError:
+            # 클라이언트 연결 종료 등으로 요청이 취소되면 결과를 집계하지 않음
+            breaker.release_trial()
+            raise
+        except TRANSPORT_ERRORS:
+            breaker.record_failure()
+            raise
+        except Exception:
+            breaker.record_success()
+            raise
+        breaker.record_success()
+        return result
+
+    def _submit(self, provider: str, func: Callable, args, kwargs) -> Tuple[CircuitBreaker, Future]:
+        """서킷/실행 자리를 확인하고 실행기에 제출"""
+        breaker = self.breaker(provider)
+        if not breaker.allow():
+            raise UpstreamUnavailable(provider, "circuit_open", breaker.retry_after())
+
+        if not self._slots.acquire(blocking=False):
+            # 호출하지 못했으므로 시험 호출 자리만 돌려줌 (실패로 세지 않음)
+            breaker.release_trial()
+            with self._lock:
+                self.saturated += 1
+            raise UpstreamUnavailable(provider, "saturated")
+
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except BaseException:
+            self._release()
+            breaker.release_trial()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return breaker, future
+
+    def _timed_out(
+        self, provider: str, func: Callable, breaker: CircuitBreaker, future: Future
+    ) -> UpstreamUnavailable:
+        """시간 초과 집계 (호출은 끝날 때까지 실행 자리를 차지)"""
+        future.cancel()
+        breaker.record_failure()
+        with self._lock:
+            self.timeouts += 1
+        logger.warning(f"외부 API 호출 시간 초과: {provider}, {getattr(func, '__name__', func)}")
+        return UpstreamUnavailable(provider, "timeout")
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """실행기/서킷 브레이커 상태"""
+        with self._lock:
+            breakers = dict(self._breakers)
+            stats = {
+                'max_workers': self.max_workers,
+                'capacity': self.capacity,
+                'in_flight': self.in_flight,
+                'saturated': self.saturated,
+                'timeouts': self.timeouts,
+            }
+        stats['providers'] = {name: breaker.stats() for name, breaker in breakers.items()}
+        return stats
+
+    def shutdown(self):
+        """대기 중인 호출 취소 (실행 중인 호출은 기다리지 않음)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 전역 외부 API 실행기
+upstream_executor = UpstreamExecutor()
+
+
+def call_upstream(provider: str, func: Callable, *args, **kwargs):
+    """전역 실행기로 외부 API 호출 (UpstreamExecutor.call 참고)"""
+    return upstream_executor.call(provider, func, *args, **kwargs)
+
+
+async def call_upstream_async(provider: str, func: Callable, *args, **kwargs):
+    """전역 실행기로 외부 API 호출 (UpstreamExecutor.call_async 참고)"""
+    return await upstream_executor.call_async(provider, func, *args, **kwargs)
+
+
+def check_threadpool_capacity():
+    """
+    외부 API 실행기 용량이 기본 스레드 풀(anyio)보다 작은지 확인 (이벤트 루프에서 호출)
+
+    동기 핸들러와 서비스(시세 저장소 보충 등)는 기본 스레드 풀 스레드에서 call 결과를 기다리므로,
+    실행기 용량(동시 실행 + 대기)이 스레드 풀 크기 이상이면 외부 API가 느려질 때
+    다른 엔드포인트가 쓸 스레드가 남지 않습니다.
+
+    Raises:
+        RuntimeError: upstream_max_workers + upstream_max_pending이 스레드 풀 크기 이상인 경우
+    """
+    limit = to_thread.current_default_thread_limiter().total_tokens
+    if upstream_executor.capacity >= limit:
+        raise RuntimeError(
+            f"외부 API 실행기 용량({upstream_executor.capacity})이 기본 스레드 풀 크기({limit}) 이상입니다. "
+            f"UPSTREAM_MAX_WORKERS + UPSTREAM_MAX_PENDING을 줄이세요"
+        )
+    logger.info(f"외부 API 실행기 용량 {upstream_executor.capacity} / 기본 스레드 풀 {limit}")
@@ -0,0 +1,188 @@
+"""
+대량 적재 (Bulk Upsert) 유틸리티
+
+행 단위 ORM 조회/추가 대신 청크별 다중 행
+INSERT ... ON CONFLICT DO UPDATE 한 문장으로 적재합니다.
+"""
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Table, func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def frame_to_records(df: pd.DataFrame) -> List[Dict]:
+    """
+    DataFrame을 DB 파라미터용 레코드 리스트로 변환
+
+    NaN/NaT는 일괄적으로 None(NULL)으로, NumPy 스칼라는 파이썬 기본형으로 바꿉니다.
+    """
+    if df.empty:
+        return []
+    obj = df.astype(object).where(df.notna(), None)
+    return obj.to_dict(orient="records")
+
+
+def clean_text_column(values: pd.Series) -> pd.Series:
+    """문자열 컬럼 정리 (앞뒤 공백 제거, 빈 문자열/결측은 None)"""
+    text = values.astype("string").str.strip()
+    text = text.mask(text == "")
+    return text.astype(object).where(text.notna(), None)
+
+
+def fetch_rows_by_keys(
+    db: Session,
+    table: Table,
+    key_column: str,
+    keys: Iterable,
+    columns: Sequence[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> pd.DataFrame:
+    """
+    키 목록에 해당하는 기존 행을 IN 쿼리로 일괄 조회
+
+    Returns:
+        DataFrame with columns: [key_column] + columns
+    """
+    keys = list(dict.fromkeys(keys))
+    select_columns = [key_column] + [c for c in columns if c != key_column]
+    rows = []
+    for start in range(0, len(keys), chunk_size):
+        chunk = keys[start:start + chunk_size]
+        stmt = table.select().with_only_columns(*[table.c[c] for c in select_columns]).where(
+            table.c[key_column].in_(chunk)
+        )
+        rows.extend(db.execute(stmt).all())
+    return pd.DataFrame(rows, columns=select_columns)
+
+
+def _canonical_frame(df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """비교용 정규화 (숫자 컬럼은 float, 그 외는 문자열)"""
+    out = {}
+    for col in columns:
+        values = df[col]
+        numeric = pd.to_numeric(values, errors="coerce")
+        if values.notna().any() and numeric.notna().sum() == values.notna().sum():
+            out[col] = numeric.astype(float).round(6)
+        else:
+            out[col] = values.astype("string")
+    return pd.DataFrame(out, index=df.index)
+
+
+def filter_changed_rows(
+    incoming: pd.DataFrame,
+    existing: pd.DataFrame,
+    key_column: str,
+    columns: Sequence[str],
+    preserve_on_null: bool = False
+) -> pd.DataFrame:
+    """
+    기존 행과 내용이 같은 행 제외 (행 해시 비교)
+
+    Args:
+        incoming: 적재할 행 (key_column 기준 중복 없음)
+        existing: 기존 행 (fetch_rows_by_keys 결과)
+        key_column: 키 컬럼
+        columns: 비교할 컬럼
+        preserve_on_null: True면 새 값이 비어 있는 컬럼은 기존 값으로 보고 비교
+            (bulk_upsert의 preserve_on_null과 같은 기준)
+
+    Returns:
+        신규이거나 내용이 바뀐 행
+    """
+    if incoming.empty or existing.empty:
+        return incoming
+
+    new_values = incoming.set_index(key_column)[list(columns)]
+    old_values = existing.set_index(key_column)[list(columns)].reindex(new_values.index)
+    if preserve_on_null:
+        new_values = new_values.astype(object).where(new_values.notna(), old_values.astype(object))
+
+    # 양쪽을 같은 타입 기준으로 정규화한 뒤 행 해시 비교
+    combined = _canonical_frame(pd.concat([new_values, old_values], ignore_index=True), columns)
+    hashes = pd.util.hash_pandas_object(combined, index=False).to_numpy()
+    new_hash, old_hash = hashes[:len(new_values)], hashes[len(new_values):]
+    is_new = ~new_values.index.isin(existing[key_column])
+
+    return incoming[(new_hash != old_hash) | is_new]
+
+
+def bulk_upsert(
+    db: Session,
+    table: Table,
+    records: Sequence[Dict],
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Iterable[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    touch_updated_at: bool = True,
+    preserve_on_null: bool = False,
+    count_by: Optional[str] = None
+) -> Dict:
+    """
+    다중 행 INSERT ... ON CONFLICT DO UPDATE
+
+    생성/갱신 건수는 RETURNING (xmax = 0)으로 구분합니다
+    (PostgreSQL에서 새로 삽입된 행은 xmax가 0).
+
+    Args:
+        db: DB 세션 (커밋은 호출자가 담당)
+        table: 대상 테이블 (Model.__table__)
+        records: 컬럼명 -> 값 딕셔너리 리스트 (충돌 컬럼 기준으로 중복 제거된 상태여야 함)
+        conflict_columns: 충돌 판단 컬럼 (기본키/유니크 제약)
+        update_columns: 충돌 시 갱신할 컬럼 (None이면 충돌 컬럼을 제외한 레코드의 모든 컬럼)
+        chunk_size: 한 문장에 담을 행 수
+        touch_updated_at: 충돌 시 updated_at을 now()로 갱신할지 여부
+        preserve_on_null: 새 값이 NULL이면 기존 값을 유지할지 여부 (COALESCE(excluded, 기존값))
+        count_by: 지정하면 이 컬럼 값별 건수도 집계 (여러 종목을 한 번에 적재할 때 종목별 통계)
+
+    Returns:
+        Dict with 'created', 'updated' counts
+        (count_by가 있으면 'by_key': 컬럼 값 -> {'created', 'updated'} 추가)
+    """
+    stats = {'created': 0, 'updated': 0}
+    by_key: Dict = {}
+    if count_by is not None:
+        stats['by_key'] = by_key
+    if not records:
+        return stats
+
+    if update_columns is None:
+        update_columns = [c for c in records[0].keys() if c not in conflict_columns]
+    update_columns = list(update_columns)
+
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start:start + chunk_size]
+        stmt = pg_insert(table).values(chunk)
+        if preserve_on_null:
+            set_ = {col: func.coalesce(stmt.excluded[col], table.c[col]) for col in update_columns}
+        else:
+            set_ = {col: stmt.excluded[col] for col in update_columns}
+        if touch_updated_at and 'updated_at' in table.c:
+            set_['updated_at'] = func.now()
+
+        if set_:
+            stmt = stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=set_)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+        if count_by is None:
+            stmt = stmt.returning(literal_column("(xmax = 0)").label("inserted"))
+            inserted = np.fromiter((row[0] for row in db.execute(stmt)), dtype=bool)
+        else:
+            stmt = stmt.returning(literal_column("(xmax = 0)").label("inserted"), table.c[count_by])
+            rows = db.execute(stmt).all()
+            inserted = np.fromiter((row[0] for row in rows), dtype=bool, count=len(rows))
+            for is_new, key in rows:
+                counts = by_key.setdefault(key, {'created': 0, 'updated': 0})
+                counts['created' if is_new else 'updated'] += 1
+        created = int(inserted.sum())
+        stats['created'] += created
+        stats['updated'] += len(inserted) - created
+
+    return stats
@@ -0,0 +1,198 @@
+"""
+ETL 실행 체크포인트
+
+실행(run)별 종목 진행 상태를 finance.etl_ticker_status에 기록합니다.
+같은 run_key로 다시 실행하거나(Airflow 재시도) resume으로 재개하면
+이미 끝난 종목은 건너뛰고 실패/대기 종목만 이어서 처리합니다.
+"""
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.etl import ETLRun, ETLTickerStatus
+
+logger = logging.getLogger(__name__)
+
+# 작업 구분
+JOB_KR_STOCK_PRICE = "kr_stock_price"
+JOB_US_STOCK_PRICE = "us_stock_price"
+
+# 재시도해도 결과가 같아 건너뛴 것으로 끝내는 종목 상태
+# - no_data: 외부 API가 정상 응답했지만 수집 기간에 시세 없음 (추출 오류는 시세 추출기가 예외로 올려 failed)
+# - preprocessing_failed: 받은 시세가 정제 후 모두 제외됨 (예: 거래정지 종목의 시가/고가/저가 0)
+SKIPPED_STATUSES = frozenset({'no_data', 'preprocessing_failed'})
+
+# 재개 시 다시 처리하지 않는 종목 상태 (failed는 재시도로 복구될 수 있는 오류에만 사용)
+COMPLETED_STATUSES = frozenset({'success', 'up_to_date'}) | SKIPPED_STATUSES
+
+
+class RunCheckpoint:
+    """
+    실행별 종목 진행 상태 기록기
+
+    종목 결과 기록(mark)이 실패해도 경고만 남기고 ETL은 계속 진행합니다.
+
+    Args:
+        db: DB 세션
+        job: 작업 구분 (예: JOB_KR_STOCK_PRICE)
+        run_key: 실행 키 (Airflow run_id 등, None이면 새 실행 키 생성)
+    """
+
+    def __init__(self, db: Session, job: str, run_key: Optional[str] = None):
+        self.db = db
+        self.job = job
+        self.run_key = run_key
+        self.run_id: Optional[int] = None
+        self.total_tickers = 0
+        self.completed: Set[str] = set()
+
+    def start(self, tickers: Optional[List[str]] = None, resume: bool = False) -> List[str]:
+        """
+        실행 시작 또는 재개
+
+        Args:
+            tickers: 대상 종목 (None이면 재개한 실행에 기록된 종목 전체)
+            resume: run_key가 없을 때 이 작업의 마지막 미완료 실행을 이어받을지 여부
+
+        Returns:
+            이번에 처리할 종목 리스트 (이미 완료된 종목 제외)
+        """
+        run = None
+        if self.run_key:
+            run = self.db.query(ETLRun).filter(
+                ETLRun.job == self.job, ETLRun.run_key == self.run_key
+            ).first()
+        elif resume:
+            run = self.db.query(ETLRun).filter(
+                ETLRun.job == self.job, ETLRun.status != 'completed'
+            ).order_by(ETLRun.id.desc()).first()
+            if run is None:
+                logger.warning(f"재개할 실행이 없어 새로 시작합니다: {self.job}")
+
+        if run is None:
+            if tickers is None:
+                raise ValueError("재개할 실행이 없으면 대상 종목이 필요합니다")
+            run = ETLRun(
+                job=self.job,
+                run_key=self.run_key or f"manual__{datetime.utcnow().isoformat()}",
+                status='running',
+                total_tickers=len(tickers)
+            )
+            self.db.add(run)
+            self.db.commit()
+        else:
+            rows = self.db.query(ETLTickerStatus.ticker, ETLTickerStatus.status).filter(
+                ETLTickerStatus.run_id == run.id
+            ).all()
+            self.completed = {ticker for ticker, status in rows if status in COMPLETED_STATUSES}
+            if tickers is None:
+                tickers = [ticker for ticker, _ in rows]
+            run.status = 'running'
+            run.finished_at = None
+            run.total_tickers = max(run.total_tickers or 0, len(tickers))
+            self.db.commit()
+            logger.info(
+                f"ETL 실행 재개: {self.job}/{run.run_key}, 완료 {len(self.completed)}개 건너뜀"
+            )
+
+        self.run_id = run.id
+        self.run_key = run.run_key
+        self.total_tickers = len(tickers)
+
+        remaining = [ticker for ticker in tickers if ticker not in self.completed]
+        self._register(remaining)
+        return remaining
+
+    def _register(self, tickers: List[str]):
+        """처리할 종목을 대기 상태로 등록 (이미 있으면 유지)"""
+        if not tickers:
+            return
+        table = ETLTickerStatus.__table__
+        stmt = pg_insert(table).values([
+            {'run_id': self.run_id, 'ticker': ticker, 'status': 'pending', 'attempts': 0}
+            for ticker in dict.fromkeys(tickers)
+        ]).on_conflict_do_nothing(index_elements=['run_id', 'ticker'])
+        self.db.execute(stmt)
+        self.db.commit()
+
+    def mark(
+        self,
+        ticker: str,
+        status: str,
+        rows_loaded: Optional[int] = None,
+        error: Optional[str] = None
+    ):
+        """종목 처리 결과 기록"""
+        self.mark_many([ticker], status, rows_loaded, error)
+
+    def mark_many(
+        self,
+        tickers: Iterable[str],
+        status: str,
+        rows_loaded: Optional[int] = None,
+        error: Optional[str] = None
+    ):
+        """여러 종목의 처리 결과를 한 문장으로 기록"""
+        tickers = list(dict.fromkeys(tickers))
+        if self.run_id is None or not tickers:
+            return
+        table = ETLTickerStatus.__table__
+        stmt = pg_insert(table).values([
+            {
+                'run_id': self.run_id,
+                'ticker': ticker,
+                'status': status,
+                'attempts': 1,
+                'rows_loaded': rows_loaded,
+                'error': error,
+            }
+            for ticker in tickers
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['run_id', 'ticker'],
+            set_={
+                'status': stmt.excluded.status,
+                'attempts': table.c.attempts + 1,
+                'rows_loaded': stmt.excluded.rows_loaded,
+                'error': stmt.excluded.error,
+                'updated_at': func.now(),
+            }
+        )
+        try:
+            self.db.execute(stmt)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"체크포인트 기록 실패: {self.job}/{self.run_key}, {e}")
+
+    def finish(self) -> str:
+        """
+        실행 종료 기록
+
+        미완료 종목(COMPLETED_STATUSES가 아닌 종목)이 남아 있으면 failed로 남겨 다음 재개 대상이 되게 합니다.
+
+        Returns:
+            실행 상태 (completed, failed)
+        """
+        if self.run_id is None:
+            return 'failed'
+        try:
+            unfinished = self.db.query(func.count()).select_from(ETLTickerStatus).filter(
+                ETLTickerStatus.run_id == self.run_id,
+                ETLTickerStatus.status.notin_(COMPLETED_STATUSES)
+            ).scalar()
+            status = 'failed' if unfinished else 'completed'
+            self.db.query(ETLRun).filter(ETLRun.id == self.run_id).update(
+                {'status': status, 'finished_at': func.now()}, synchronize_session=False
+            )
+            self.db.commit()
+            logger.info(f"ETL 실행 종료: {self.job}/{self.run_key}, {status}, 미완료 {unfinished}개")
+            return status
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"ETL 실행 종료 기록 실패: {self.job}/{self.run_key}, {e}")
+            return 'failed'
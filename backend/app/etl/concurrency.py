@@ -0,0 +1,137 @@
+"""
+동시 추출 실행기
+
+외부 시세 API 호출을 제한된 스레드 풀에서 병렬로 실행하고,
+데이터 소스별 토큰 버킷으로 초당 요청 수를 제한합니다.
+결과는 완료되는 순서대로 내보내므로 호출자는 추출과 적재를 겹쳐 실행할 수 있습니다.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 데이터 소스 구분
+SOURCE_FDR = "fdr"
+SOURCE_YFINANCE = "yfinance"
+
+
+class TokenBucket:
+    """
+    토큰 버킷 방식의 요청 속도 제한기 (스레드 안전)
+
+    rate가 0 이하이면 제한하지 않습니다.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        """토큰을 얻을 때까지 대기"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(source: str) -> TokenBucket:
+    """데이터 소스별 공유 속도 제한기 (프로세스 단위)"""
+    with _limiters_lock:
+        limiter = _limiters.get(source)
+        if limiter is None:
+            rates = {
+                SOURCE_FDR: settings.fdr_requests_per_second,
+                SOURCE_YFINANCE: settings.yfinance_requests_per_second,
+            }
+            limiter = TokenBucket(rates.get(source, 0))
+            _limiters[source] = limiter
+        return limiter
+
+
+@dataclass
+class FetchResult:
+    """종목별 추출 결과"""
+    key: str
+    data: Any = None
+    error: Optional[Exception] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _timed_call(func: Callable[[str], Any], key: str) -> FetchResult:
+    started = time.monotonic()
+    try:
+        return FetchResult(key=key, data=func(key), elapsed=time.monotonic() - started)
+    except Exception as e:
+        # 한 종목의 실패가 전체 실행을 멈추지 않도록 결과로 전달
+        return FetchResult(key=key, error=e, elapsed=time.monotonic() - started)
+
+
+def iter_concurrent(
+    keys: Iterable[str],
+    func: Callable[[str], Any],
+    max_workers: Optional[int] = None,
+    max_pending: Optional[int] = None
+) -> Iterator[FetchResult]:
+    """
+    키별 작업을 스레드 풀에서 실행하고 완료 순서대로 결과 반환
+
+    Args:
+        keys: 작업 키 (종목 코드 등)
+        func: 키를 받아 결과를 반환하는 함수 (예외는 FetchResult.error로 전달)
+        max_workers: 동시 실행 수 (None이면 settings.etl_fetch_workers)
+        max_pending: 미완료 작업 상한 (None이면 max_workers의 2배, 메모리 사용량 제한)
+
+    Yields:
+        FetchResult
+    """
+    max_workers = max(1, max_workers or settings.etl_fetch_workers)
+    max_pending = max(max_workers, max_pending or max_workers * 2)
+    key_iter = iter(keys)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="etl-fetch") as executor:
+        pending = {}
+
+        def submit_next() -> bool:
+            for key in key_iter:
+                pending[executor.submit(_timed_call, func, key)] = key
+                return True
+            return False
+
+        try:
+            while len(pending) < max_pending and submit_next():
+                pass
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.pop(future)
+                    yield future.result()
+                    submit_next()
+        finally:
+            # 소비자가 중간에 중단하면 시작하지 않은 작업은 취소
+            for future in pending:
+                future.cancel()
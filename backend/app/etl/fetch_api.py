@@ -4,13 +4,21 @@
 외부 API에서 주식 데이터를 추출합니다.
 """
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 from datetime import datetime, timedelta
 import pandas as pd
 import FinanceDataReader as fdr
 import yfinance as yf
+from yfinance.exceptions import YFPricesMissingError
 import requests
 from app.core.config import settings
+from app.etl.concurrency import (
+    FetchResult,
+    SOURCE_FDR,
+    SOURCE_YFINANCE,
+    get_rate_limiter,
+    iter_concurrent,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +91,10 @@ class StockDataFetcher:
         
         Returns:
             DataFrame with columns: ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+            (기간 내 시세가 없으면 빈 DataFrame)
+        
+        Raises:
+            Exception: 네트워크/외부 API 오류 (호출자가 실패로 기록해 재시도하도록 그대로 전달)
         """
         try:
             logger.info(f"주식 시세 데이터 추출 시작: {ticker}")
@@ -98,12 +110,16 @@ class StockDataFetcher:
                     start = end - timedelta(days=365)
                     df = fdr.DataReader(ticker, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
             else:
-                # 해외 주식은 yfinance 사용
+                # 해외 주식은 yfinance 사용 (오류를 빈 결과로 바꾸지 않도록 raise_errors)
                 stock = yf.Ticker(ticker)
-                if start_date and end_date:
-                    df = stock.history(start=start_date, end=end_date)
-                else:
-                    df = stock.history(period=period)
+                try:
+                    if start_date and end_date:
+                        df = stock.history(start=start_date, end=end_date, raise_errors=True)
+                    else:
+                        df = stock.history(period=period, raise_errors=True)
+                except YFPricesMissingError:
+                    logger.warning(f"티커 {ticker} 데이터 없음")
+                    return pd.DataFrame()
             
             # 컬럼명 정규화
             df = df.reset_index()
@@ -124,13 +140,48 @@ class StockDataFetcher:
             
         except Exception as e:
             logger.error(f"주식 시세 데이터 추출 실패: {ticker}, {e}")
-            return pd.DataFrame()
+            raise
+    
+    @staticmethod
+    def _price_source(ticker: str) -> str:
+        """시세 데이터 소스 구분 (한국 6자리 종목은 FDR, 그 외는 yfinance)"""
+        return SOURCE_FDR if ticker.isdigit() and len(ticker) == 6 else SOURCE_YFINANCE
+    
+    def iter_stock_prices(
+        self,
+        tickers: List[str],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        start_dates: Optional[Dict[str, str]] = None
+    ) -> Iterator[FetchResult]:
+        """
+        여러 종목의 시세 데이터 병렬 추출 (완료 순서대로 반환)
+        
+        Args:
+            tickers: 종목 코드 리스트
+            start_date: 시작일
+            end_date: 종료일
+            max_workers: 동시 실행 수 (None이면 settings.etl_fetch_workers)
+            start_dates: 종목별 시작일 (증분 추출 시 사용, 없는 종목은 start_date)
+        
+        Yields:
+            FetchResult (key: 종목 코드, data: 시세 DataFrame)
+        """
+        start_dates = start_dates or {}
+        
+        def fetch(ticker: str) -> pd.DataFrame:
+            get_rate_limiter(self._price_source(ticker)).acquire()
+            return self.fetch_stock_price(ticker, start_dates.get(ticker, start_date), end_date)
+        
+        return iter_concurrent(tickers, fetch, max_workers=max_workers)
     
     def fetch_multiple_stocks(
         self,
         tickers: List[str],
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        max_workers: Optional[int] = None
     ) -> Dict[str, pd.DataFrame]:
         """
         여러 종목의 시세 데이터 일괄 추출
@@ -139,19 +190,18 @@ class StockDataFetcher:
             tickers: 종목 코드 리스트
             start_date: 시작일
             end_date: 종료일
+            max_workers: 동시 실행 수 (None이면 settings.etl_fetch_workers)
         
         Returns:
             Dict[ticker, DataFrame]
         """
         results = {}
-        for ticker in tickers:
-            try:
-                df = self.fetch_stock_price(ticker, start_date, end_date)
-                if not df.empty:
-                    results[ticker] = df
-            except Exception as e:
-                logger.warning(f"종목 {ticker} 추출 실패: {e}")
+        for result in self.iter_stock_prices(tickers, start_date, end_date, max_workers):
+            if not result.ok:
+                logger.warning(f"종목 {result.key} 추출 실패: {result.error}")
                 continue
+            if not result.data.empty:
+                results[result.key] = result.data
         
         return results
 
@@ -0,0 +1,87 @@
+"""
+종목 식별자 맵 (Identity Map)
+
+적재기 단위로 종목 코드 -> ID를 캐시합니다.
+배치 시작 시 한 번의 IN 쿼리로 채우고, 종목 적재로 새로 생긴 ID는 put으로 추가합니다.
+"""
+import logging
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# IN 절 하나에 담을 최대 종목 수
+DEFAULT_IN_CHUNK = 1000
+
+
+class TickerIdentityMap:
+    """
+    종목 코드 -> ID 캐시
+
+    Args:
+        db: DB 세션
+        model: 종목 모델 (ticker, id 컬럼 보유, 예: Stock, USStock)
+        normalize: 종목 코드 정규화 함수 (예: 미국 종목은 대문자)
+    """
+
+    def __init__(self, db: Session, model, normalize: Optional[Callable[[str], str]] = None):
+        self.db = db
+        self.model = model
+        self.normalize = normalize or (lambda ticker: ticker)
+        self._ids: Dict[str, int] = {}
+        self._missing: Set[str] = set()
+
+    def preload(self, tickers: Iterable[str], chunk_size: int = DEFAULT_IN_CHUNK) -> Dict[str, int]:
+        """
+        캐시에 없는 종목 ID를 IN 쿼리로 일괄 조회
+
+        Returns:
+            요청한 종목 중 존재하는 종목의 코드 -> ID
+        """
+        keys = {self.normalize(str(t).strip()) for t in tickers if t is not None}
+        pending = [k for k in keys if k not in self._ids and k not in self._missing]
+
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            rows = self.db.query(self.model.ticker, self.model.id).filter(self.model.ticker.in_(chunk)).all()
+            found = {ticker: stock_id for ticker, stock_id in rows}
+            self._ids.update(found)
+            self._missing.update(k for k in chunk if k not in found)
+
+        if pending:
+            logger.info(f"종목 ID 조회: {self.model.__name__}, 요청 {len(pending)}개, 미등록 {len(self._missing)}개")
+        return {k: self._ids[k] for k in keys if k in self._ids}
+
+    def get(self, ticker: str) -> Optional[int]:
+        """종목 ID 조회 (캐시에 없으면 한 번 조회 후 기억)"""
+        key = self.normalize(str(ticker).strip())
+        if key not in self._ids and key not in self._missing:
+            self.preload([key])
+        return self._ids.get(key)
+
+    def put(self, ticker: str, stock_id: int):
+        """새로 적재된 종목 ID 등록"""
+        key = self.normalize(str(ticker).strip())
+        self._ids[key] = int(stock_id)
+        self._missing.discard(key)
+
+    def update(self, mapping: Dict[str, int]):
+        """여러 종목 ID 등록"""
+        for ticker, stock_id in mapping.items():
+            self.put(ticker, stock_id)
+
+    def invalidate(self, tickers: Iterable[str]):
+        """종목 ID 캐시 무효화 (다음 조회 시 다시 읽음)"""
+        for ticker in tickers:
+            key = self.normalize(str(ticker).strip())
+            self._ids.pop(key, None)
+            self._missing.discard(key)
+
+    def clear(self):
+        """캐시 초기화"""
+        self._ids.clear()
+        self._missing.clear()
+
+    def __len__(self) -> int:
+        return len(self._ids)
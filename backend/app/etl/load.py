@@ -5,16 +5,28 @@
 """
 import logging
 from typing import List, Dict, Optional
-from datetime import datetime
+from datetime import date, datetime
 import pandas as pd
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.core.database import get_db
-from app.models.stock import Stock, FinancialAccount, FinancialStatementRaw
+from app.models.stock import Stock, FinancialAccount, FinancialStatementRaw, StockPriceDaily
+from app.etl.bulk import (
+    bulk_upsert,
+    clean_text_column,
+    fetch_rows_by_keys,
+    filter_changed_rows,
+    frame_to_records,
+)
+from app.etl.identity import TickerIdentityMap
 
 logger = logging.getLogger(__name__)
 
+# 종목 마스터 적재 컬럼 (ticker 제외)
+STOCK_MASTER_COLUMNS = ['company_name', 'isin_code', 'industry']
+
 
 class DataLoader:
     """데이터베이스 로드 클래스"""
@@ -22,62 +34,50 @@ class DataLoader:
     def __init__(self, db: Session):
         self.db = db
         self.logger = logger
+        # 종목 코드 -> ID (적재기 단위로 공유)
+        self.stock_ids = TickerIdentityMap(db, Stock)
     
-    def load_stocks(self, df: pd.DataFrame) -> Dict[str, int]:
+    def load_stocks(self, df: pd.DataFrame, detect_changes: bool = True) -> Dict[str, int]:
         """
         주식 종목 데이터 로드
         
+        컬럼 단위로 정리한 뒤 INSERT ... ON CONFLICT (ticker) DO UPDATE 로 일괄 적재합니다.
+        비어 있는 값은 기존 값을 유지합니다.
+        
         Args:
             df: Stock DataFrame with columns: ['ticker', 'company_name', 'isin_code', 'industry']
+            detect_changes: True면 기존 행과 내용이 같은 종목은 적재하지 않음 (행 해시 비교)
         
         Returns:
-            Dict with 'created', 'updated', 'skipped' counts
+            Dict with 'created', 'updated', 'skipped', 'unchanged' counts
         """
         try:
             logger.info(f"주식 종목 데이터 로드 시작: {len(df)}개")
             
-            stats = {'created': 0, 'updated': 0, 'skipped': 0}
+            stock_frame = self._normalize_stock_frame(df)
+            stats = {'created': 0, 'updated': 0, 'skipped': len(df) - len(stock_frame), 'unchanged': 0}
             
-            for _, row in df.iterrows():
-                try:
-                    ticker = str(row['ticker']).strip()
-                    company_name = str(row.get('company_name', '')).strip()
-                    isin_code = str(row.get('isin_code', '')).strip() if pd.notna(row.get('isin_code')) else None
-                    industry = str(row.get('industry', '')).strip() if pd.notna(row.get('industry')) else None
-                    
-                    if not ticker or not company_name:
-                        stats['skipped'] += 1
-                        continue
-                    
-                    # 기존 종목 확인
-                    existing_stock = self.db.query(Stock).filter(Stock.ticker == ticker).first()
-                    
-                    if existing_stock:
-                        # 업데이트
-                        existing_stock.company_name = company_name
-                        if isin_code:
-                            existing_stock.isin_code = isin_code
-                        if industry:
-                            existing_stock.industry = industry
-                        existing_stock.updated_at = datetime.utcnow()
-                        stats['updated'] += 1
-                    else:
-                        # 생성
-                        new_stock = Stock(
-                            ticker=ticker,
-                            company_name=company_name,
-                            isin_code=isin_code,
-                            industry=industry
-                        )
-                        self.db.add(new_stock)
-                        stats['created'] += 1
-                    
-                except Exception as e:
-                    logger.warning(f"종목 로드 실패: {row.get('ticker', 'unknown')}, {e}")
-                    stats['skipped'] += 1
-                    continue
+            if detect_changes and not stock_frame.empty:
+                existing = fetch_rows_by_keys(
+                    self.db, Stock.__table__, 'ticker', stock_frame['ticker'], STOCK_MASTER_COLUMNS
+                )
+                changed = filter_changed_rows(
+                    stock_frame, existing, 'ticker', STOCK_MASTER_COLUMNS, preserve_on_null=True
+                )
+                stats['unchanged'] = len(stock_frame) - len(changed)
+                stock_frame = changed
+            
+            stats.update(bulk_upsert(
+                self.db,
+                Stock.__table__,
+                frame_to_records(stock_frame),
+                conflict_columns=['ticker'],
+                preserve_on_null=True
+            ))
             
             self.db.commit()
+            # 새로 생긴 종목 ID는 다음 조회 시 일괄로 다시 읽음
+            self.stock_ids.invalidate(stock_frame['ticker'])
             logger.info(f"주식 종목 데이터 로드 완료: {stats}")
             return stats
             
@@ -86,6 +86,18 @@ class DataLoader:
             logger.error(f"주식 종목 데이터 로드 실패: {e}")
             raise
     
+    @staticmethod
+    def _normalize_stock_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """종목 DataFrame을 stock 컬럼 구조로 정리 (벡터 연산)"""
+        frame = pd.DataFrame({'ticker': clean_text_column(df['ticker'])})
+        for col in STOCK_MASTER_COLUMNS:
+            frame[col] = clean_text_column(df[col]) if col in df.columns else None
+        
+        # 종목 코드/종목명이 없는 행 제거, 동일 종목은 마지막 값 유지
+        frame = frame.dropna(subset=['ticker', 'company_name'])
+        frame = frame.drop_duplicates(subset=['ticker'], keep='last')
+        return frame.reset_index(drop=True)
+    
     def load_financial_accounts(self, account_names: List[Dict[str, str]]) -> Dict[str, int]:
         """
         재무 계정 데이터 로드
@@ -154,8 +166,8 @@ class DataLoader:
             logger.info(f"재무제표 데이터 로드 시작: {ticker}")
             
             # 종목 조회
-            stock = self.db.query(Stock).filter(Stock.ticker == ticker).first()
-            if not stock:
+            stock_id = self.stock_ids.get(ticker)
+            if stock_id is None:
                 logger.warning(f"종목을 찾을 수 없음: {ticker}")
                 return {'created': 0, 'updated': 0, 'skipped': 0}
             
@@ -172,6 +184,25 @@ class DataLoader:
             logger.error(f"재무제표 데이터 로드 실패: {ticker}, {e}")
             raise
     
+    def get_price_watermarks(self, tickers: List[str]) -> Dict[str, date]:
+        """
+        종목별 마지막 저장일 조회 (단일 GROUP BY 쿼리)
+        
+        Returns:
+            Dict[ticker, 마지막 시세 일자] (저장된 시세가 없는 종목은 제외)
+        """
+        if not tickers:
+            return {}
+        rows = self.db.query(
+            Stock.ticker,
+            func.max(StockPriceDaily.date)
+        ).join(
+            StockPriceDaily, StockPriceDaily.stock_id == Stock.id
+        ).filter(
+            Stock.ticker.in_(tickers)
+        ).group_by(Stock.ticker).all()
+        return {ticker: max_date for ticker, max_date in rows}
+    
     def load_stock_prices(
         self,
         ticker: str,
@@ -180,25 +211,127 @@ class DataLoader:
         """
         주식 시세 데이터 로드
         
-        주의: 현재 모델에 시세 테이블이 없으므로, 필요시 모델 추가 필요
+        DataFrame을 컬럼 단위로 정규화한 뒤 청크별
+        INSERT ... ON CONFLICT (stock_id, date) DO UPDATE 로 일괄 적재합니다.
         
         Args:
             ticker: 종목 코드
-            price_df: 시세 DataFrame
+            price_df: 시세 DataFrame with columns: ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
         
         Returns:
-            Dict with stats
+            Dict with 'created', 'updated', 'skipped' counts
         """
         try:
-            logger.info(f"주식 시세 데이터 로드 시작: {ticker}")
+            logger.info(f"주식 시세 데이터 로드 시작: {ticker}, {len(price_df)}개 행")
             
-            # TODO: 시세 데이터 모델이 없으므로, 필요시 추가 필요
-            # 예: StockPrice 모델 생성 후 구현
+            # 종목 조회
+            stock_id = self.stock_ids.get(ticker)
+            if stock_id is None:
+                logger.warning(f"종목을 찾을 수 없음: {ticker}")
+                return {'created': 0, 'updated': 0, 'skipped': len(price_df)}
+            
+            price_frame = self._normalize_price_frame(stock_id, price_df)
+            stats = bulk_upsert(
+                self.db,
+                StockPriceDaily.__table__,
+                frame_to_records(price_frame),
+                conflict_columns=['stock_id', 'date']
+            )
+            stats['skipped'] = len(price_df) - len(price_frame)
+            
+            self.db.commit()
+            logger.info(f"주식 시세 데이터 로드 완료: {ticker}, {stats}")
             
-            logger.warning("시세 데이터 모델이 없어 로드 스킵")
-            return {'created': 0, 'updated': 0, 'skipped': len(price_df)}
+            if not price_frame.empty:
+                self._refresh_indicators(ticker, stock_id, price_frame['date'].min())
+            return stats
             
         except Exception as e:
+            self.db.rollback()
             logger.error(f"주식 시세 데이터 로드 실패: {ticker}, {e}")
             raise
-
+    
+    def load_stock_prices_batch(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, object]:
+        """
+        여러 종목의 시세 데이터를 한 번의 upsert와 커밋으로 로드
+        
+        배치 적재가 실패하면 종목별 load_stock_prices로 다시 적재해
+        실패 원인이 된 종목만 실패로 남깁니다.
+        
+        Args:
+            frames: 종목 코드 -> 시세 DataFrame
+        
+        Returns:
+            종목 코드 -> {'created', 'updated', 'skipped'} (실패한 종목은 예외 객체)
+        """
+        results: Dict[str, object] = {}
+        normalized = {}
+        for ticker, price_df in frames.items():
+            stock_id = self.stock_ids.get(ticker)
+            if stock_id is None:
+                logger.warning(f"종목을 찾을 수 없음: {ticker}")
+                results[ticker] = {'created': 0, 'updated': 0, 'skipped': len(price_df)}
+                continue
+            normalized[ticker] = (stock_id, self._normalize_price_frame(stock_id, price_df))
+        
+        if not normalized:
+            return results
+        
+        try:
+            combined = pd.concat([frame for _, frame in normalized.values()], ignore_index=True)
+            stats = bulk_upsert(
+                self.db,
+                StockPriceDaily.__table__,
+                frame_to_records(combined),
+                conflict_columns=['stock_id', 'date'],
+                count_by='stock_id'
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"시세 배치 적재 실패, 종목별로 다시 적재: {len(normalized)}개 종목, {e}")
+            for ticker in normalized:
+                try:
+                    results[ticker] = self.load_stock_prices(ticker, frames[ticker])
+                except Exception as ticker_error:
+                    results[ticker] = ticker_error
+            return results
+        
+        logger.info(f"주식 시세 데이터 배치 로드 완료: {len(normalized)}개 종목, {len(combined)}개 행")
+        for ticker, (stock_id, frame) in normalized.items():
+            counts = stats['by_key'].get(stock_id, {'created': 0, 'updated': 0})
+            results[ticker] = {**counts, 'skipped': len(frames[ticker]) - len(frame)}
+            if not frame.empty:
+                self._refresh_indicators(ticker, stock_id, frame['date'].min())
+        return results
+    
+    def _refresh_indicators(self, ticker: str, stock_id: int, since):
+        """적재된 첫 날짜부터 기술적 지표 증분 갱신 (실패해도 시세 적재는 유지)"""
+        from app.services.indicator_service import IndicatorService
+        
+        try:
+            IndicatorService(self.db).refresh(stock_id, since=since)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"기술적 지표 갱신 실패: {ticker}, {e}")
+    
+    @staticmethod
+    def _normalize_price_frame(stock_id: int, price_df: pd.DataFrame) -> pd.DataFrame:
+        """시세 DataFrame을 stock_price_daily 컬럼 구조로 정규화 (벡터 연산)"""
+        df = price_df
+        if 'Date' not in df.columns:
+            df = df.reset_index()
+        date_col = 'Date' if 'Date' in df.columns else 'date'
+        
+        columns = {'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'}
+        frame = pd.DataFrame({
+            'date': pd.to_datetime(df[date_col], errors='coerce').dt.date
+        })
+        for src, dst in columns.items():
+            frame[dst] = pd.to_numeric(df[src], errors='coerce') if src in df.columns else None
+        frame.insert(0, 'stock_id', int(stock_id))
+        
+        # 날짜가 없는 행 제거, 동일 날짜는 마지막 값 유지
+        frame = frame.dropna(subset=['date']).drop_duplicates(subset=['date'], keep='last')
+        return frame
@@ -7,11 +7,17 @@ import logging
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
+import pandas as pd
 
-from app.core.database import get_db
+from app.core.database import get_etl_db
 from app.etl.fetch_api import StockDataFetcher, FinancialDataFetcher
 from app.etl.preprocess import DataPreprocessor
 from app.etl.load import DataLoader
+from app.etl.watermark import plan_fetch_ranges
+from app.etl.checkpoint import JOB_KR_STOCK_PRICE, RunCheckpoint
+from app.etl.concurrency import FetchResult
+from app.etl.stream import SkipItem, StagedPipeline
+from app.models.stock import Stock
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +26,7 @@ class ETLPipeline:
     """ETL 파이프라인 클래스"""
     
     def __init__(self, db: Optional[Session] = None):
-        self.db = db or next(get_db())
+        self.db = db or next(get_etl_db())
         self.fetcher = StockDataFetcher()
         self.financial_fetcher = FinancialDataFetcher()
         self.preprocessor = DataPreprocessor()
@@ -77,78 +83,103 @@ class ETLPipeline:
     
     def run_stock_price_etl(
         self,
-        tickers: List[str],
+        tickers: Optional[List[str]],
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        full_refresh: bool = False,
+        run_key: Optional[str] = None,
+        resume: bool = False,
+        load_batch_size: Optional[int] = None
     ) -> Dict:
         """
         주식 시세 데이터 ETL 실행
         
+        기본은 증분 모드로, 종목별 마지막 저장일부터만 추출합니다.
+        추출(스레드 풀) → 전처리 → 배치 적재를 크기가 제한된 큐로 잇는 스트리밍 방식이라
+        종목 수가 늘어도 메모리에 올라가는 시세 데이터는 일정합니다.
+        종목별 진행 상태는 실행 체크포인트에 기록되어, 같은 run_key로 재실행하거나
+        resume으로 재개하면 완료된 종목은 건너뜁니다.
+        
         Args:
-            tickers: 종목 코드 리스트
-            start_date: 시작일 (YYYY-MM-DD)
+            tickers: 종목 코드 리스트 (resume 시 None이면 재개한 실행의 종목 전체)
+            start_date: 시작일 (YYYY-MM-DD, 증분 모드에서는 저장된 시세가 없는 종목에만 적용)
             end_date: 종료일 (YYYY-MM-DD)
+            max_workers: 추출 동시 실행 수 (None이면 settings.etl_fetch_workers)
+            full_refresh: True면 마지막 저장일을 무시하고 start_date부터 다시 적재 (수정주가 반영 등)
+            run_key: 실행 키 (Airflow run_id 등, 같은 키로 재실행하면 이어서 진행)
+            resume: run_key가 없을 때 마지막 미완료 실행을 이어받을지 여부
+            load_batch_size: 한 번에 적재할 종목 수 (None이면 settings.etl_load_batch_size)
         
         Returns:
-            실행 결과 통계
+            실행 결과 통계 (stages: 단계별 처리량/큐 깊이)
         """
+        checkpoint = RunCheckpoint(self.db, JOB_KR_STOCK_PRICE, run_key)
         try:
-            logger.info(f"주식 시세 데이터 ETL 시작: {len(tickers)}개 종목")
+            tickers = checkpoint.start(tickers, resume=resume)
+            logger.info(
+                f"주식 시세 데이터 ETL 시작: {len(tickers)}개 종목 "
+                f"(실행 {checkpoint.run_key}, 완료 {len(checkpoint.completed)}개 건너뜀)"
+            )
             
-            results = {}
+            # 배치 전체의 종목 ID를 한 번에 조회
+            self.loader.stock_ids.preload(tickers)
+            
+            # 종목별 추출 구간 계산
+            watermarks = {} if full_refresh else self.loader.get_price_watermarks(tickers)
+            start_dates, end_date, up_to_date = plan_fetch_ranges(
+                tickers, watermarks, start_date, end_date, full_refresh
+            )
+            
+            results = {ticker: {'status': 'up_to_date'} for ticker in up_to_date}
+            checkpoint.mark_many(up_to_date, 'up_to_date')
             total_extracted = 0
             total_cleaned = 0
             total_loaded = {'created': 0, 'updated': 0, 'skipped': 0}
             
-            for ticker in tickers:
-                try:
-                    logger.info(f"종목 처리 중: {ticker}")
-                    
-                    # Extract
-                    raw_df = self.fetcher.fetch_stock_price(ticker, start_date, end_date)
-                    if raw_df.empty:
-                        logger.warning(f"종목 {ticker} 데이터 없음")
-                        results[ticker] = {'status': 'no_data'}
-                        continue
-                    
-                    total_extracted += len(raw_df)
-                    
-                    # Transform
-                    clean_df = self.preprocessor.clean_stock_price(raw_df)
-                    if clean_df.empty:
-                        logger.warning(f"종목 {ticker} 전처리 실패")
-                        results[ticker] = {'status': 'preprocessing_failed'}
-                        continue
-                    
-                    # 기술적 지표 계산
-                    clean_df = self.preprocessor.calculate_technical_indicators(clean_df)
-                    total_cleaned += len(clean_df)
-                    
-                    # Load
-                    # TODO: 시세 데이터 모델 추가 후 활성화
-                    # load_stats = self.loader.load_stock_prices(ticker, clean_df)
-                    # total_loaded['created'] += load_stats.get('created', 0)
-                    # total_loaded['updated'] += load_stats.get('updated', 0)
-                    # total_loaded['skipped'] += load_stats.get('skipped', 0)
-                    
-                    results[ticker] = {
-                        'status': 'success',
-                        'extracted': len(raw_df),
-                        'cleaned': len(clean_df)
-                    }
-                    
-                except Exception as e:
-                    logger.error(f"종목 {ticker} 처리 실패: {e}")
-                    results[ticker] = {'status': 'failed', 'error': str(e)}
+            # Extract (병렬) → Transform → Load (배치) 스트리밍 실행
+            # 기술적 지표는 적재 후 저장소에서 증분 계산
+            stream = StagedPipeline(self._transform_prices, self._load_price_batch, load_batch_size)
+            for outcome in stream.run(self.fetcher.iter_stock_prices(
+                list(start_dates), start_date, end_date, max_workers, start_dates
+            )):
+                ticker = outcome.key
+                if isinstance(outcome.error, SkipItem):
+                    logger.warning(f"종목 {ticker} 건너뜀: {outcome.error.status}")
+                    results[ticker] = {'status': outcome.error.status}
+                    checkpoint.mark(ticker, outcome.error.status)
+                    continue
+                if not outcome.ok:
+                    logger.error(f"종목 {ticker} 처리 실패: {outcome.error}")
+                    results[ticker] = {'status': 'failed', 'error': str(outcome.error)}
+                    checkpoint.mark(ticker, 'failed', error=str(outcome.error))
                     continue
+                
+                entry = outcome.data
+                load_stats = entry['loaded']
+                total_extracted += entry['extracted']
+                total_cleaned += entry['cleaned']
+                for key in total_loaded:
+                    total_loaded[key] += load_stats.get(key, 0)
+                
+                results[ticker] = {'status': 'success', **entry}
+                checkpoint.mark(
+                    ticker, 'success',
+                    rows_loaded=load_stats.get('created', 0) + load_stats.get('updated', 0)
+                )
             
             result = {
                 'status': 'completed',
-                'total_tickers': len(tickers),
+                'run_key': checkpoint.run_key,
+                'run_status': checkpoint.finish(),
+                'total_tickers': checkpoint.total_tickers,
                 'successful': sum(1 for r in results.values() if r.get('status') == 'success'),
+                'resumed': len(checkpoint.completed),
+                'up_to_date': len(up_to_date),
                 'total_extracted': total_extracted,
                 'total_cleaned': total_cleaned,
                 'total_loaded': total_loaded,
+                'stages': stream.report(),
                 'details': results
             }
             
@@ -157,7 +188,42 @@ class ETLPipeline:
             
         except Exception as e:
             logger.error(f"주식 시세 데이터 ETL 실패: {e}")
-            return {'status': 'failed', 'error': str(e)}
+            self.db.rollback()
+            checkpoint.finish()
+            return {'status': 'failed', 'error': str(e), 'run_key': checkpoint.run_key}
+    
+    def _transform_prices(self, ticker: str, raw_df) -> Dict:
+        """
+        시세 변환 단계: long-format 변환 후 정제 (변환 스레드에서 실행되므로 DB를 사용하지 않음)
+        
+        정제는 종목별 그룹 연산이라 종목 하나씩 처리해도 배치 정제와 결과가 같으며,
+        적재 단계는 DB 쓰기만 하도록 여기서 끝냅니다.
+        """
+        if raw_df.empty:
+            raise SkipItem('no_data')
+        long_df = self.preprocessor.to_long_price_frame(ticker, raw_df)
+        clean_df = self.preprocessor.clean_stock_price_batch(long_df)
+        if clean_df.empty:
+            raise SkipItem('preprocessing_failed')
+        return {'extracted': len(raw_df), 'frame': clean_df.drop(columns=['ticker'])}
+    
+    def _load_price_batch(self, items: List[FetchResult]) -> Dict:
+        """시세 배치 적재 단계: 정제된 종목 시세를 일괄 적재"""
+        frames = {item.key: item.data['frame'] for item in items}
+        loaded = self.loader.load_stock_prices_batch(frames)
+        
+        outcomes = {}
+        for item in items:
+            load_stats = loaded.get(item.key)
+            if isinstance(load_stats, Exception):
+                outcomes[item.key] = load_stats
+                continue
+            outcomes[item.key] = {
+                'extracted': item.data['extracted'],
+                'cleaned': len(frames[item.key]),
+                'loaded': load_stats
+            }
+        return outcomes
     
     def run_financial_data_etl(
         self,
@@ -177,6 +243,9 @@ class ETLPipeline:
         try:
             logger.info(f"재무제표 데이터 ETL 시작: {len(tickers)}개 종목")
             
+            # 배치 전체의 종목 ID를 한 번에 조회
+            self.loader.stock_ids.preload(tickers)
+            
             results = {}
             
             for ticker in tickers:
@@ -220,7 +289,8 @@ class ETLPipeline:
         self,
         markets: List[str] = ["KRX"],
         update_prices: bool = True,
-        update_financials: bool = False
+        update_financials: bool = False,
+        full_refresh: bool = False
     ) -> Dict:
         """
         전체 ETL 파이프라인 실행
@@ -229,6 +299,7 @@ class ETLPipeline:
             markets: 시장 리스트
             update_prices: 시세 데이터 업데이트 여부
             update_financials: 재무제표 데이터 업데이트 여부
+            full_refresh: 시세를 최근 1년 전체 재적재할지 여부 (기본은 증분)
         
         Returns:
             전체 실행 결과
@@ -249,7 +320,7 @@ class ETLPipeline:
             
             # 2. 주식 시세 데이터 ETL (선택적)
             if update_prices:
-                # 최근 1년 데이터 업데이트
+                # 마지막 저장일 이후만 업데이트 (저장된 시세가 없거나 전체 재적재면 최근 1년)
                 end_date = datetime.now().strftime("%Y-%m-%d")
                 start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
                 
@@ -259,7 +330,7 @@ class ETLPipeline:
                 
                 if tickers:
                     results['stock_prices'] = self.run_stock_price_etl(
-                        tickers, start_date, end_date
+                        tickers, start_date, end_date, full_refresh=full_refresh
                     )
             
             # 3. 재무제표 데이터 ETL (선택적)
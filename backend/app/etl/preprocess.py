@@ -9,8 +9,46 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from app.core.indicators import compute_indicators
+
 logger = logging.getLogger(__name__)
 
+# 지표 엔진 출력명 -> ETL DataFrame 컬럼명
+ETL_INDICATOR_COLUMNS = {
+    'ma5': 'MA5',
+    'ma20': 'MA20',
+    'ma60': 'MA60',
+    'rsi': 'RSI',
+    'bollinger_middle': 'BB_Middle',
+    'bollinger_upper': 'BB_Upper',
+    'bollinger_lower': 'BB_Lower',
+    'macd': 'MACD',
+    'macd_signal': 'MACD_Signal',
+    'macd_hist': 'MACD_Hist',
+}
+
+
+# 0 이하/이상치 필터 대상 가격 컬럼
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# 이상치 기준 (종목 평균 가격의 배수)
+OUTLIER_MEAN_MULTIPLE = 10
+
+# float32 변환 허용 오차 (DB Numeric(12, 4) 반올림 단위의 절반)
+FLOAT32_TOLERANCE = 5e-5
+
+
+def _downcast_float(values: pd.Series) -> pd.Series:
+    """float32로 바꿔도 허용 오차 안에서 값이 보존될 때만 변환"""
+    if values.dtype == np.float32:
+        return values
+    original = values.to_numpy(dtype=np.float64)
+    narrowed = original.astype(np.float32)
+    finite = np.isfinite(original)
+    if np.all(np.abs(narrowed[finite].astype(np.float64) - original[finite]) <= FLOAT32_TOLERANCE):
+        return pd.Series(narrowed, index=values.index, name=values.name)
+    return values
+
 
 class DataPreprocessor:
     """데이터 전처리 클래스"""
@@ -31,30 +69,22 @@ class DataPreprocessor:
         try:
             logger.info("주식 종목 리스트 정제 시작")
             
-            # 복사본 생성
-            df_clean = df.copy()
-            
-            # 중복 제거
-            df_clean = df_clean.drop_duplicates(subset=['ticker'], keep='first')
-            
             # 필수 컬럼 검증
             required_cols = ['ticker', 'company_name']
-            missing_cols = [col for col in required_cols if col not in df_clean.columns]
+            missing_cols = [col for col in required_cols if col not in df.columns]
             if missing_cols:
                 raise ValueError(f"필수 컬럼 누락: {missing_cols}")
             
-            # 빈 값 처리
-            df_clean['company_name'] = df_clean['company_name'].fillna('')
-            df_clean['industry'] = df_clean.get('industry', pd.Series()).fillna('')
-            df_clean['isin_code'] = df_clean.get('isin_code', pd.Series()).fillna('')
+            # ticker 형식 정규화 (앞뒤 공백 제거, 대문자 변환) 후 중복 제거
+            tickers = df['ticker'].astype(str).str.strip().str.upper()
+            keep = tickers.str.match(r'^[A-Z0-9]{1,10}$', na=False).to_numpy() & ~tickers.duplicated(keep='first').to_numpy()
             
-            # ticker 형식 정규화 (앞뒤 공백 제거, 대문자 변환)
-            df_clean['ticker'] = df_clean['ticker'].astype(str).str.strip().str.upper()
-            
-            # 유효하지 않은 ticker 제거 (6자리 숫자 또는 알파벳+숫자)
-            df_clean = df_clean[
-                df_clean['ticker'].str.match(r'^[A-Z0-9]{1,10}$', na=False)
-            ]
+            # 유효한 행만 한 번에 선택 (열 단위 복사 없이 assign으로 빈 값 처리)
+            df_clean = df.loc[keep].assign(ticker=tickers[keep])
+            df_clean = df_clean.assign(**{
+                col: df_clean[col].fillna('') if col in df_clean.columns else ''
+                for col in ('company_name', 'industry', 'isin_code')
+            })
             
             logger.info(f"주식 종목 리스트 정제 완료: {len(df_clean)}개")
             return df_clean
@@ -65,7 +95,9 @@ class DataPreprocessor:
     
     def clean_stock_price(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        주식 시세 데이터 정제
+        주식 시세 데이터 정제 (단일 종목)
+        
+        clean_stock_price_batch와 같은 벡터 연산 경로를 사용합니다.
         
         Args:
             df: 원본 DataFrame
@@ -79,53 +111,113 @@ class DataPreprocessor:
             
             logger.info("주식 시세 데이터 정제 시작")
             
-            df_clean = df.copy()
-            
-            # Date 컬럼 확인 및 변환
-            if 'Date' in df_clean.columns:
-                df_clean['Date'] = pd.to_datetime(df_clean['Date'], errors='coerce')
-            elif df_clean.index.name == 'Date' or isinstance(df_clean.index, pd.DatetimeIndex):
-                df_clean = df_clean.reset_index()
-                if 'Date' not in df_clean.columns:
-                    df_clean['Date'] = df_clean.index
+            df_clean = self._as_long_price_frame(df)
+            if 'ticker' not in df_clean.columns:
+                df_clean['ticker'] = ''
+            df_clean = self._clean_price_rows(df_clean, downcast=False)
+            df_clean = df_clean.drop(columns=['ticker']).reset_index(drop=True)
             
-            # Date가 없으면 에러
-            if 'Date' not in df_clean.columns:
-                raise ValueError("Date 컬럼이 없습니다")
-            
-            # 날짜순 정렬
-            df_clean = df_clean.sort_values('Date').reset_index(drop=True)
-            
-            # 가격 데이터 정제
-            price_cols = ['Open', 'High', 'Low', 'Close']
-            for col in price_cols:
-                if col in df_clean.columns:
-                    # 음수나 0인 가격 제거
-                    df_clean = df_clean[df_clean[col] > 0]
-                    # 이상치 제거 (평균의 10배 이상)
-                    if len(df_clean) > 0:
-                        mean_price = df_clean[col].mean()
-                        df_clean = df_clean[df_clean[col] <= mean_price * 10]
+            logger.info(f"주식 시세 데이터 정제 완료: {len(df_clean)}개 행")
+            return df_clean
             
-            # Volume 정제
-            if 'Volume' in df_clean.columns:
-                df_clean['Volume'] = df_clean['Volume'].fillna(0)
-                df_clean['Volume'] = df_clean['Volume'].clip(lower=0)
+        except Exception as e:
+            logger.error(f"주식 시세 데이터 정제 실패: {e}")
+            return pd.DataFrame()
+    
+    def clean_stock_price_batch(self, df: pd.DataFrame, downcast: bool = True) -> pd.DataFrame:
+        """
+        여러 종목의 시세 데이터를 한 번에 정제
+        
+        (ticker, Date, OHLCV) 형태의 long-format DataFrame을 종목별 그룹 연산 한 번으로
+        타입 변환, 0 이하 가격/이상치 제거, 중복 날짜 제거, 정렬까지 처리합니다.
+        ticker는 category로, 값 손실이 없는 숫자 컬럼은 float32로 저장해 메모리를 줄입니다.
+        
+        Args:
+            df: long-format 시세 DataFrame with columns: ['ticker', 'Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+            downcast: float32 변환 여부
+        
+        Returns:
+            (ticker, Date) 순으로 정렬된 정제 DataFrame
+        """
+        try:
+            if df.empty:
+                return df
+            if 'ticker' not in df.columns:
+                raise ValueError("ticker 컬럼이 없습니다")
             
-            # 중복 날짜 제거 (최신 데이터 유지)
-            df_clean = df_clean.drop_duplicates(subset=['Date'], keep='last')
+            logger.info(f"주식 시세 데이터 일괄 정제 시작: {len(df)}개 행")
             
-            # 결측치가 너무 많은 행 제거 (50% 이상)
-            threshold = len(df_clean.columns) * 0.5
-            df_clean = df_clean.dropna(thresh=threshold)
+            df_clean = self._clean_price_rows(self._as_long_price_frame(df), downcast=downcast)
             
-            logger.info(f"주식 시세 데이터 정제 완료: {len(df_clean)}개 행")
+            logger.info(
+                f"주식 시세 데이터 일괄 정제 완료: {df_clean['ticker'].nunique()}개 종목, {len(df_clean)}개 행, "
+                f"{df_clean.memory_usage(deep=True).sum() / 1024 / 1024:.1f}MB"
+            )
             return df_clean
             
         except Exception as e:
-            logger.error(f"주식 시세 데이터 정제 실패: {e}")
+            logger.error(f"주식 시세 데이터 일괄 정제 실패: {e}")
             return pd.DataFrame()
     
+    def to_long_price_frame(self, ticker: str, df: pd.DataFrame) -> pd.DataFrame:
+        """종목 시세 DataFrame을 clean_stock_price_batch 입력 형태 (ticker 컬럼 포함)로 변환"""
+        return self._as_long_price_frame(df).assign(ticker=ticker)
+    
+    @staticmethod
+    def _as_long_price_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """Date를 컬럼으로 꺼내고 datetime으로 변환 (원본은 수정하지 않음)"""
+        if 'Date' not in df.columns:
+            if df.index.name == 'Date' or isinstance(df.index, pd.DatetimeIndex):
+                df = df.reset_index()
+                if 'Date' not in df.columns:
+                    df = df.rename(columns={df.columns[0]: 'Date'})
+            else:
+                raise ValueError("Date 컬럼이 없습니다")
+        return df.assign(Date=pd.to_datetime(df['Date'], errors='coerce'))
+    
+    @staticmethod
+    def _clean_price_rows(df: pd.DataFrame, downcast: bool) -> pd.DataFrame:
+        """
+        종목별 그룹 연산으로 시세 행 정제
+        
+        0 이하 가격은 모든 가격 컬럼에서 한 번에 걸러내고, 이상치 기준(평균의 10배)은
+        0 이하 가격을 뺀 종목별 평균으로 계산합니다.
+        """
+        # 인덱스 중복과 무관하게 위치 기준으로 처리
+        tickers = pd.Categorical(df['ticker'].astype(str))
+        price_cols = [col for col in PRICE_COLUMNS if col in df.columns]
+        
+        if price_cols:
+            prices = df[price_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+            positive = (prices > 0).all(axis=1)
+            
+            # 종목별 평균 (0 이하 가격 행은 NaN으로 빼고 계산)
+            masked = pd.DataFrame(np.where(positive[:, None], prices, np.nan))
+            means = masked.groupby(tickers, observed=True).transform('mean').to_numpy()
+            keep = positive & (prices <= means * OUTLIER_MEAN_MULTIPLE).all(axis=1)
+            
+            df_clean = df.loc[keep].assign(ticker=tickers[keep])
+            df_clean[price_cols] = prices[keep]
+        else:
+            df_clean = df.assign(ticker=tickers)
+        
+        # Volume 정제
+        if 'Volume' in df_clean.columns:
+            volume = pd.to_numeric(df_clean['Volume'], errors='coerce').fillna(0).clip(lower=0)
+            df_clean['Volume'] = volume.astype(np.float64)
+        
+        # 날짜순 정렬 (안정 정렬) 후 중복 날짜 제거 (최신 데이터 유지)
+        df_clean = df_clean.sort_values(['ticker', 'Date'], kind='stable')
+        df_clean = df_clean.drop_duplicates(subset=['ticker', 'Date'], keep='last')
+        
+        # 결측치가 너무 많은 행 제거 (50% 이상)
+        df_clean = df_clean.dropna(thresh=len(df_clean.columns) * 0.5)
+        
+        if downcast:
+            for col in price_cols + (['Volume'] if 'Volume' in df_clean.columns else []):
+                df_clean[col] = _downcast_float(df_clean[col])
+        return df_clean.reset_index(drop=True)
+    
     def calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         기술적 지표 계산
@@ -143,31 +235,9 @@ class DataPreprocessor:
             logger.info("기술적 지표 계산 시작")
             
             df_ind = df.copy()
-            
-            # 이동평균
-            df_ind['MA5'] = df_ind['Close'].rolling(window=5).mean()
-            df_ind['MA20'] = df_ind['Close'].rolling(window=20).mean()
-            df_ind['MA60'] = df_ind['Close'].rolling(window=60).mean()
-            
-            # RSI (Relative Strength Index)
-            delta = df_ind['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df_ind['RSI'] = 100 - (100 / (1 + rs))
-            
-            # 볼린저 밴드
-            df_ind['BB_Middle'] = df_ind['Close'].rolling(window=20).mean()
-            bb_std = df_ind['Close'].rolling(window=20).std()
-            df_ind['BB_Upper'] = df_ind['BB_Middle'] + (bb_std * 2)
-            df_ind['BB_Lower'] = df_ind['BB_Middle'] - (bb_std * 2)
-            
-            # MACD
-            exp1 = df_ind['Close'].ewm(span=12, adjust=False).mean()
-            exp2 = df_ind['Close'].ewm(span=26, adjust=False).mean()
-            df_ind['MACD'] = exp1 - exp2
-            df_ind['MACD_Signal'] = df_ind['MACD'].ewm(span=9, adjust=False).mean()
-            df_ind['MACD_Hist'] = df_ind['MACD'] - df_ind['MACD_Signal']
+            values = compute_indicators(df_ind['Close'].to_numpy(dtype=np.float64))
+            for name, column in ETL_INDICATOR_COLUMNS.items():
+                df_ind[column] = values[name]
             
             logger.info("기술적 지표 계산 완료")
             return df_ind
@@ -0,0 +1,233 @@
+"""
+스트리밍 단계별 ETL 실행기
+
+추출 → 변환 → 적재 단계를 제한된 크기의 큐로 연결합니다.
+각 단계는 앞 단계가 채운 큐에서 꺼내 처리하므로, 뒤 단계가 느리면 큐가 차면서
+앞 단계가 자연스럽게 대기합니다 (backpressure). 메모리에 동시에 존재하는 종목 수는
+큐 크기와 적재 배치 크기로 제한되어, 전체 종목 수와 무관하게 일정하게 유지됩니다.
+
+적재 단계는 DB 세션을 쓰므로 호출한 스레드에서 실행합니다.
+"""
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.core.config import settings
+from app.etl.concurrency import FetchResult
+
+logger = logging.getLogger(__name__)
+
+# 큐 대기 중 중단 여부를 확인하는 주기 (초)
+_POLL_INTERVAL = 0.5
+
+
+class SkipItem(Exception):
+    """처리할 데이터가 없어 건너뛰는 종목 (status로 사유 전달, 예: no_data)"""
+
+    def __init__(self, status: str):
+        super().__init__(status)
+        self.status = status
+
+
+@dataclass
+class StageMetrics:
+    """단계별 처리 통계"""
+    name: str
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+    _depth_total: int = 0
+    _depth_samples: int = 0
+
+    def observe_queue(self, depth: int):
+        """단계 출력 큐 깊이 기록"""
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+
+    def as_dict(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            'processed': self.processed,
+            'failed': self.failed,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'items_per_second': round(self.processed / elapsed, 2) if elapsed > 0 else 0.0,
+            'max_queue_depth': self.max_queue_depth,
+            'avg_queue_depth': round(self._depth_total / self._depth_samples, 2) if self._depth_samples else 0.0,
+        }
+
+
+_END = object()
+
+
+class StagedPipeline:
+    """
+    추출 → 변환 → 배치 적재 스트리밍 실행기
+
+    Args:
+        transform: (키, 추출 데이터) -> 변환 데이터 (SkipItem이나 예외는 해당 종목 결과로 전달)
+        load_batch: 변환된 FetchResult 리스트 -> 키별 적재 결과 (값이 예외면 해당 종목 실패)
+        batch_size: 한 번에 적재할 종목 수 (None이면 settings.etl_load_batch_size)
+        queue_size: 단계 사이 큐 크기 (None이면 settings.etl_stage_queue_size)
+    """
+
+    def __init__(
+        self,
+        transform: Callable[[str, Any], Any],
+        load_batch: Callable[[List[FetchResult]], Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None
+    ):
+        self.transform = transform
+        self.load_batch = load_batch
+        self.batch_size = max(1, batch_size or settings.etl_load_batch_size)
+        self.queue_size = max(1, queue_size or settings.etl_stage_queue_size)
+        self.metrics = {name: StageMetrics(name) for name in ('extract', 'transform', 'load')}
+        self._started = None
+        self._finished = None
+
+    def run(self, source: Iterable[FetchResult]) -> Iterator[FetchResult]:
+        """
+        스트리밍 실행
+
+        Args:
+            source: 추출 결과 이터레이터 (예: iter_concurrent, 완료 순서대로)
+
+        Yields:
+            종목별 최종 결과 (data는 적재 결과, 실패/건너뜀은 error)
+        """
+        self._started = time.monotonic()
+        stop = threading.Event()
+        extracted: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        transformed: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        errors: List[BaseException] = []
+
+        workers = [
+            threading.Thread(
+                target=self._extract_stage, args=(source, extracted, stop, errors),
+                name="etl-extract", daemon=True
+            ),
+            threading.Thread(
+                target=self._transform_stage, args=(extracted, transformed, stop, errors),
+                name="etl-transform", daemon=True
+            ),
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            yield from self._load_stage(transformed, stop)
+            if errors:
+                raise errors[0]
+        finally:
+            # 소비자가 중간에 중단해도 앞 단계 스레드가 큐에 막혀 남지 않도록 종료 신호
+            stop.set()
+            for worker in workers:
+                worker.join()
+            self._finished = time.monotonic()
+            logger.info(f"스트리밍 ETL 단계 통계: {self.report()}")
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """단계별 처리량/큐 깊이 통계"""
+        if self._started is None:
+            return {}
+        elapsed = (self._finished or time.monotonic()) - self._started
+        return {name: stage.as_dict(elapsed) for name, stage in self.metrics.items()}
+
+    @staticmethod
+    def _put(target: queue.Queue, item, stop: threading.Event) -> bool:
+        """큐가 비워질 때까지 대기하며 넣기 (중단 시 False)"""
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(source: queue.Queue, stop: threading.Event):
+        """항목이 들어올 때까지 대기하며 꺼내기 (중단 시 _END)"""
+        while not stop.is_set():
+            try:
+                return source.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _extract_stage(self, source, output: queue.Queue, stop: threading.Event, errors: List):
+        stage = self.metrics['extract']
+        try:
+            for result in source:
+                stage.processed += 1
+                stage.busy_seconds += result.elapsed
+                if not result.ok:
+                    stage.failed += 1
+                if not self._put(output, result, stop):
+                    break
+                stage.observe_queue(output.qsize())
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            # 중단된 경우 추출기의 남은 작업 취소
+            close = getattr(source, 'close', None)
+            if close is not None:
+                close()
+            self._put(output, _END, stop)
+
+    def _transform_stage(self, source: queue.Queue, output: queue.Queue, stop: threading.Event, errors: List):
+        stage = self.metrics['transform']
+        try:
+            while True:
+                item = self._get(source, stop)
+                if item is _END:
+                    break
+                if item.ok:
+                    started = time.monotonic()
+                    try:
+                        item = FetchResult(key=item.key, data=self.transform(item.key, item.data))
+                    except Exception as e:
+                        item = FetchResult(key=item.key, error=e)
+                        if not isinstance(e, SkipItem):
+                            stage.failed += 1
+                    stage.busy_seconds += time.monotonic() - started
+                    stage.processed += 1
+                if not self._put(output, item, stop):
+                    break
+                stage.observe_queue(output.qsize())
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            self._put(output, _END, stop)
+
+    def _load_stage(self, source: queue.Queue, stop: threading.Event) -> Iterator[FetchResult]:
+        stage = self.metrics['load']
+        batch: List[FetchResult] = []
+        while True:
+            item = self._get(source, stop)
+            done = item is _END
+            if not done:
+                if item.ok:
+                    batch.append(item)
+                else:
+                    yield item
+
+            if batch and (done or len(batch) >= self.batch_size):
+                started = time.monotonic()
+                loaded = self.load_batch(batch)
+                stage.busy_seconds += time.monotonic() - started
+                for entry in batch:
+                    outcome = loaded.get(entry.key)
+                    stage.processed += 1
+                    if isinstance(outcome, Exception):
+                        stage.failed += 1
+                        yield FetchResult(key=entry.key, error=outcome)
+                    else:
+                        yield FetchResult(key=entry.key, data=outcome)
+                batch = []
+
+            if done:
+                return
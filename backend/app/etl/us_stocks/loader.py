@@ -6,15 +6,27 @@
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime, date
+import numpy as np
 import pandas as pd
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 
 from app.models.us_stock import USStock, USPriceDaily, USFundamental, USSecFiling
+from app.etl.bulk import (
+    bulk_upsert,
+    clean_text_column,
+    fetch_rows_by_keys,
+    filter_changed_rows,
+    frame_to_records,
+)
+from app.etl.identity import TickerIdentityMap
 
 logger = logging.getLogger(__name__)
 
+# 종목 마스터 갱신 컬럼 (ticker, is_active 제외)
+US_STOCK_MASTER_COLUMNS = ['company_name', 'cik', 'exchange', 'sector', 'industry', 'market_cap', 'currency']
+
 
 class USStockDataLoader:
     """미국 주식 데이터베이스 로드 클래스"""
@@ -22,90 +34,53 @@ class USStockDataLoader:
     def __init__(self, db: Session):
         self.db = db
         self.logger = logger
+        # 종목 코드 -> ID (적재기 단위로 공유, 미국 종목 코드는 대문자로 저장)
+        self.stock_ids = TickerIdentityMap(db, USStock, normalize=str.upper)
     
-    def load_us_stocks(self, df: pd.DataFrame) -> Dict[str, int]:
+    def load_us_stocks(self, df: pd.DataFrame, detect_changes: bool = True) -> Dict[str, int]:
         """
         미국 주식 종목 데이터 로드
         
+        컬럼 단위로 정리한 뒤 INSERT ... ON CONFLICT (ticker) DO UPDATE 로 일괄 적재합니다.
+        비어 있는 값은 기존 값을 유지합니다.
+        
         Args:
             df: DataFrame with columns: ['ticker', 'company_name', 'exchange', 
                                         'sector', 'industry', 'market_cap', 'currency', 'cik']
+            detect_changes: True면 기존 행과 내용이 같은 종목은 적재하지 않음 (행 해시 비교)
         
         Returns:
-            Dict with 'created', 'updated', 'skipped' counts
+            Dict with 'created', 'updated', 'skipped', 'unchanged' counts
         """
         try:
             logger.info(f"미국 주식 종목 데이터 로드 시작: {len(df)}개")
             
-            stats = {'created': 0, 'updated': 0, 'skipped': 0}
+            stock_frame = self._normalize_us_stock_frame(df)
+            stats = {'created': 0, 'updated': 0, 'skipped': len(df) - len(stock_frame), 'unchanged': 0}
             
-            for _, row in df.iterrows():
-                try:
-                    ticker = str(row['ticker']).strip().upper()
-                    company_name = str(row.get('company_name', '')).strip() if pd.notna(row.get('company_name')) else None
-                    exchange = str(row.get('exchange', '')).strip() if pd.notna(row.get('exchange')) else None
-                    sector = str(row.get('sector', '')).strip() if pd.notna(row.get('sector')) else None
-                    industry = str(row.get('industry', '')).strip() if pd.notna(row.get('industry')) else None
-                    market_cap = row.get('market_cap') if pd.notna(row.get('market_cap')) else None
-                    currency = str(row.get('currency', 'USD')).strip() if pd.notna(row.get('currency')) else 'USD'
-                    cik = str(row.get('cik', '')).strip() if pd.notna(row.get('cik')) else None
-                    
-                    if not ticker:
-                        stats['skipped'] += 1
-                        continue
-                    
-                    # CIK를 10자리로 패딩
-                    if cik:
-                        cik = cik.zfill(10)
-                    
-                    # 기존 종목 확인
-                    existing_stock = self.db.query(USStock).filter(USStock.ticker == ticker).first()
-                    
-                    if existing_stock:
-                        # 업데이트
-                        if company_name:
-                            existing_stock.company_name = company_name
-                        if cik:
-                            existing_stock.cik = cik
-                        if exchange:
-                            existing_stock.exchange = exchange
-                        if sector:
-                            existing_stock.sector = sector
-                        if industry:
-                            existing_stock.industry = industry
-                        if market_cap is not None:
-                            existing_stock.market_cap = market_cap
-                        if currency:
-                            existing_stock.currency = currency
-                        existing_stock.updated_at = datetime.utcnow()
-                        stats['updated'] += 1
-                    else:
-                        # 생성
-                        new_stock = USStock(
-                            ticker=ticker,
-                            company_name=company_name,
-                            cik=cik,
-                            exchange=exchange,
-                            sector=sector,
-                            industry=industry,
-                            market_cap=market_cap,
-                            currency=currency,
-                            is_active=True
-                        )
-                        self.db.add(new_stock)
-                        stats['created'] += 1
-                    
-                except IntegrityError as e:
-                    logger.warning(f"종목 로드 실패 (중복): {row.get('ticker', 'unknown')}, {e}")
-                    self.db.rollback()
-                    stats['skipped'] += 1
-                    continue
-                except Exception as e:
-                    logger.warning(f"종목 로드 실패: {row.get('ticker', 'unknown')}, {e}")
-                    stats['skipped'] += 1
-                    continue
+            if detect_changes and not stock_frame.empty:
+                existing = fetch_rows_by_keys(
+                    self.db, USStock.__table__, 'ticker', stock_frame['ticker'], US_STOCK_MASTER_COLUMNS
+                )
+                changed = filter_changed_rows(
+                    stock_frame, existing, 'ticker', US_STOCK_MASTER_COLUMNS, preserve_on_null=True
+                )
+                stats['unchanged'] = len(stock_frame) - len(changed)
+                stock_frame = changed
+            
+            # is_active는 신규 종목에만 설정
+            stats.update(bulk_upsert(
+                self.db,
+                USStock.__table__,
+                frame_to_records(stock_frame),
+                conflict_columns=['ticker'],
+                update_columns=US_STOCK_MASTER_COLUMNS,
+                preserve_on_null=True
+            ))
             
             self.db.commit()
+            # 새로 생긴 종목 ID는 다음 조회 시 일괄로 다시 읽음
+            self.stock_ids.invalidate(stock_frame['ticker'])
             logger.info(f"미국 주식 종목 데이터 로드 완료: {stats}")
             return stats
             
@@ -114,6 +89,47 @@ class USStockDataLoader:
             logger.error(f"미국 주식 종목 데이터 로드 실패: {e}")
             raise
     
+    @staticmethod
+    def _normalize_us_stock_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """종목 DataFrame을 us_stock 컬럼 구조로 정리 (벡터 연산)"""
+        frame = pd.DataFrame({'ticker': clean_text_column(df['ticker']).str.upper()})
+        for col in ['company_name', 'exchange', 'sector', 'industry', 'currency']:
+            frame[col] = clean_text_column(df[col]) if col in df.columns else None
+        frame['currency'] = frame['currency'].fillna('USD')
+        frame['market_cap'] = pd.to_numeric(df['market_cap'], errors='coerce') if 'market_cap' in df.columns else np.nan
+        
+        # CIK는 10자리로 패딩 (숫자로 읽힌 경우 소수점 제거)
+        if 'cik' in df.columns:
+            cik = clean_text_column(df['cik']).str.replace(r'\.0$', '', regex=True).str.zfill(10)
+            frame['cik'] = cik.astype(object).where(cik.notna(), None)
+        else:
+            frame['cik'] = None
+        frame['is_active'] = True
+        
+        # 종목 코드가 없는 행 제거, 동일 종목은 마지막 값 유지
+        frame = frame.dropna(subset=['ticker'])
+        frame = frame.drop_duplicates(subset=['ticker'], keep='last')
+        return frame.reset_index(drop=True)
+    
+    def get_price_watermarks(self, tickers: List[str]) -> Dict[str, date]:
+        """
+        종목별 마지막 저장일 조회 (단일 GROUP BY 쿼리)
+        
+        Returns:
+            Dict[ticker, 마지막 시세 일자] (저장된 시세가 없는 종목은 제외)
+        """
+        if not tickers:
+            return {}
+        rows = self.db.query(
+            USStock.ticker,
+            func.max(USPriceDaily.date)
+        ).join(
+            USPriceDaily, USPriceDaily.stock_id == USStock.id
+        ).filter(
+            USStock.ticker.in_([t.upper() for t in tickers])
+        ).group_by(USStock.ticker).all()
+        return {ticker: max_date for ticker, max_date in rows}
+    
     def load_us_stock_prices(
         self,
         ticker: str,
@@ -122,6 +138,10 @@ class USStockDataLoader:
         """
         미국 주식 일봉 데이터 로드
         
+        DataFrame을 컬럼 단위로 정규화한 뒤 청크별
+        INSERT ... ON CONFLICT (stock_id, date) DO UPDATE 로 일괄 적재합니다.
+        기존 행의 값은 새 값이 비어 있으면 유지합니다.
+        
         Args:
             ticker: 종목 코드
             price_df: DataFrame with columns: ['Date', 'Open', 'High', 'Low', 
@@ -134,84 +154,20 @@ class USStockDataLoader:
             logger.info(f"미국 주식 시세 데이터 로드 시작: {ticker}, {len(price_df)}개 행")
             
             # 종목 조회
-            stock = self.db.query(USStock).filter(USStock.ticker == ticker.upper()).first()
-            if not stock:
+            stock_id = self.stock_ids.get(ticker)
+            if stock_id is None:
                 logger.warning(f"종목을 찾을 수 없음: {ticker}")
                 return {'created': 0, 'updated': 0, 'skipped': len(price_df)}
             
-            stats = {'created': 0, 'updated': 0, 'skipped': 0}
-            
-            for _, row in price_df.iterrows():
-                try:
-                    # 날짜 파싱
-                    if 'Date' in row:
-                        price_date = pd.to_datetime(row['Date']).date()
-                    elif 'date' in row:
-                        price_date = pd.to_datetime(row['date']).date()
-                    else:
-                        stats['skipped'] += 1
-                        continue
-                    
-                    # OHLCV 데이터
-                    open_price = row.get('Open') if pd.notna(row.get('Open')) else None
-                    high_price = row.get('High') if pd.notna(row.get('High')) else None
-                    low_price = row.get('Low') if pd.notna(row.get('Low')) else None
-                    close_price = row.get('Close') if pd.notna(row.get('Close')) else None
-                    adj_close = row.get('Adj Close') if pd.notna(row.get('Adj Close')) else close_price
-                    volume = row.get('Volume') if pd.notna(row.get('Volume')) else None
-                    market_cap = row.get('market_cap') if pd.notna(row.get('market_cap')) else None
-                    
-                    # 기존 데이터 확인
-                    existing_price = self.db.query(USPriceDaily).filter(
-                        and_(
-                            USPriceDaily.stock_id == stock.id,
-                            USPriceDaily.date == price_date
-                        )
-                    ).first()
-                    
-                    if existing_price:
-                        # 업데이트
-                        if open_price is not None:
-                            existing_price.open = open_price
-                        if high_price is not None:
-                            existing_price.high = high_price
-                        if low_price is not None:
-                            existing_price.low = low_price
-                        if close_price is not None:
-                            existing_price.close = close_price
-                        if adj_close is not None:
-                            existing_price.adj_close = adj_close
-                        if volume is not None:
-                            existing_price.volume = volume
-                        if market_cap is not None:
-                            existing_price.market_cap = market_cap
-                        existing_price.updated_at = datetime.utcnow()
-                        stats['updated'] += 1
-                    else:
-                        # 생성
-                        new_price = USPriceDaily(
-                            stock_id=stock.id,
-                            date=price_date,
-                            open=open_price,
-                            high=high_price,
-                            low=low_price,
-                            close=close_price,
-                            adj_close=adj_close,
-                            volume=volume,
-                            market_cap=market_cap
-                        )
-                        self.db.add(new_price)
-                        stats['created'] += 1
-                    
-                except IntegrityError as e:
-                    logger.warning(f"시세 데이터 로드 실패 (중복): {ticker}, {price_date}, {e}")
-                    self.db.rollback()
-                    stats['skipped'] += 1
-                    continue
-                except Exception as e:
-                    logger.warning(f"시세 데이터 로드 실패: {ticker}, {price_date}, {e}")
-                    stats['skipped'] += 1
-                    continue
+            price_frame = self._normalize_us_price_frame(stock_id, price_df)
+            stats = bulk_upsert(
+                self.db,
+                USPriceDaily.__table__,
+                frame_to_records(price_frame),
+                conflict_columns=['stock_id', 'date'],
+                preserve_on_null=True
+            )
+            stats['skipped'] = len(price_df) - len(price_frame)
             
             self.db.commit()
             logger.info(f"미국 주식 시세 데이터 로드 완료: {ticker}, {stats}")
@@ -222,6 +178,85 @@ class USStockDataLoader:
             logger.error(f"미국 주식 시세 데이터 로드 실패: {ticker}, {e}")
             raise
     
+    def load_us_stock_prices_batch(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, object]:
+        """
+        여러 종목의 시세 데이터를 한 번의 upsert와 커밋으로 로드
+        
+        배치 적재가 실패하면 종목별 load_us_stock_prices로 다시 적재해
+        실패 원인이 된 종목만 실패로 남깁니다.
+        
+        Args:
+            frames: 종목 코드 -> 시세 DataFrame
+        
+        Returns:
+            종목 코드 -> {'created', 'updated', 'skipped'} (실패한 종목은 예외 객체)
+        """
+        results: Dict[str, object] = {}
+        normalized = {}
+        for ticker, price_df in frames.items():
+            stock_id = self.stock_ids.get(ticker)
+            if stock_id is None:
+                logger.warning(f"종목을 찾을 수 없음: {ticker}")
+                results[ticker] = {'created': 0, 'updated': 0, 'skipped': len(price_df)}
+                continue
+            normalized[ticker] = (stock_id, self._normalize_us_price_frame(stock_id, price_df))
+        
+        if not normalized:
+            return results
+        
+        try:
+            combined = pd.concat([frame for _, frame in normalized.values()], ignore_index=True)
+            stats = bulk_upsert(
+                self.db,
+                USPriceDaily.__table__,
+                frame_to_records(combined),
+                conflict_columns=['stock_id', 'date'],
+                preserve_on_null=True,
+                count_by='stock_id'
+            )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"미국 시세 배치 적재 실패, 종목별로 다시 적재: {len(normalized)}개 종목, {e}")
+            for ticker in normalized:
+                try:
+                    results[ticker] = self.load_us_stock_prices(ticker, frames[ticker])
+                except Exception as ticker_error:
+                    results[ticker] = ticker_error
+            return results
+        
+        logger.info(f"미국 주식 시세 데이터 배치 로드 완료: {len(normalized)}개 종목, {len(combined)}개 행")
+        for ticker, (stock_id, frame) in normalized.items():
+            counts = stats['by_key'].get(stock_id, {'created': 0, 'updated': 0})
+            results[ticker] = {**counts, 'skipped': len(frames[ticker]) - len(frame)}
+        return results
+    
+    @staticmethod
+    def _normalize_us_price_frame(stock_id: int, price_df: pd.DataFrame) -> pd.DataFrame:
+        """시세 DataFrame을 us_price_daily 컬럼 구조로 정규화 (벡터 연산)"""
+        df = price_df
+        if 'Date' not in df.columns and 'date' not in df.columns:
+            df = df.reset_index()
+        date_col = 'Date' if 'Date' in df.columns else 'date'
+        
+        columns = {
+            'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close',
+            'Adj Close': 'adj_close', 'Volume': 'volume', 'market_cap': 'market_cap'
+        }
+        frame = pd.DataFrame({
+            'date': pd.to_datetime(df[date_col], errors='coerce').dt.date
+        })
+        for src, dst in columns.items():
+            frame[dst] = pd.to_numeric(df[src], errors='coerce') if src in df.columns else np.nan
+        
+        # 수정 종가가 없으면 종가 사용
+        frame['adj_close'] = frame['adj_close'].fillna(frame['close'])
+        frame.insert(0, 'stock_id', int(stock_id))
+        
+        # 날짜가 없는 행 제거, 동일 날짜는 마지막 값 유지
+        frame = frame.dropna(subset=['date']).drop_duplicates(subset=['date'], keep='last')
+        return frame
+    
     def load_us_fundamentals(
         self,
         ticker: str,
@@ -243,8 +278,8 @@ class USStockDataLoader:
             logger.info(f"미국 주식 펀더멘털 데이터 로드 시작: {ticker}")
             
             # 종목 조회
-            stock = self.db.query(USStock).filter(USStock.ticker == ticker.upper()).first()
-            if not stock:
+            stock_id = self.stock_ids.get(ticker)
+            if stock_id is None:
                 logger.warning(f"종목을 찾을 수 없음: {ticker}")
                 return {'created': 0, 'updated': 0, 'skipped': 0}
             
@@ -255,7 +290,7 @@ class USStockDataLoader:
             # 기존 데이터 확인
             existing_fundamental = self.db.query(USFundamental).filter(
                 and_(
-                    USFundamental.stock_id == stock.id,
+                    USFundamental.stock_id == stock_id,
                     USFundamental.as_of_date == as_of_date
                 )
             ).first()
@@ -311,7 +346,7 @@ class USStockDataLoader:
             else:
                 # 생성
                 new_fundamental = USFundamental(
-                    stock_id=stock.id,
+                    stock_id=stock_id,
                     as_of_date=as_of_date,
                     pe_ratio=pe_ratio,
                     pb_ratio=pb_ratio,
@@ -360,8 +395,8 @@ class USStockDataLoader:
             logger.info(f"SEC 공시 데이터 로드 시작: {ticker}, {len(filings)}개")
             
             # 종목 조회
-            stock = self.db.query(USStock).filter(USStock.ticker == ticker.upper()).first()
-            if not stock:
+            stock_id = self.stock_ids.get(ticker)
+            if stock_id is None:
                 logger.warning(f"종목을 찾을 수 없음: {ticker}")
                 return {'created': 0, 'updated': 0, 'skipped': len(filings)}
             
@@ -416,7 +451,7 @@ class USStockDataLoader:
                     else:
                         # 생성
                         new_filing = USSecFiling(
-                            stock_id=stock.id,
+                            stock_id=stock_id,
                             form_type=form_type,
                             filing_date=filing_date,
                             report_date=report_date,
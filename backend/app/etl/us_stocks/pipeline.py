@@ -9,11 +9,15 @@ from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
+from app.core.database import get_etl_db
 from .sec_fetcher import SECDataFetcher
 from .price_fetcher import USStockPriceFetcher
 from .fundamental_fetcher import USStockFundamentalFetcher
 from .loader import USStockDataLoader
+from app.etl.watermark import plan_fetch_ranges
+from app.etl.checkpoint import JOB_US_STOCK_PRICE, RunCheckpoint
+from app.etl.concurrency import FetchResult
+from app.etl.stream import SkipItem, StagedPipeline
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +31,7 @@ class USStockETLPipeline:
     """
     
     def __init__(self, db: Optional[Session] = None):
-        self.db = db or next(get_db())
+        self.db = db or next(get_etl_db())
         self.sec_fetcher = SECDataFetcher()
         self.price_fetcher = USStockPriceFetcher()
         self.fundamental_fetcher = USStockFundamentalFetcher()
@@ -75,61 +79,100 @@ class USStockETLPipeline:
     
     def run_price_etl(
         self,
-        tickers: List[str],
+        tickers: Optional[List[str]],
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        full_refresh: bool = False,
+        run_key: Optional[str] = None,
+        resume: bool = False,
+        load_batch_size: Optional[int] = None
     ) -> Dict:
         """
         주식 시세 데이터 ETL 실행
         
+        기본은 증분 모드로, 종목별 마지막 저장일부터만 추출합니다.
+        추출은 batch_size개 종목 단위 yf.download를 스레드 풀에서 병렬로 진행하고,
+        크기가 제한된 큐를 거쳐 load_batch_size개 종목씩 적재합니다.
+        종목별 진행 상태는 실행 체크포인트에 기록되어, 같은 run_key로 재실행하거나
+        resume으로 재개하면 완료된 종목은 건너뜁니다.
+        
         Args:
-            tickers: 종목 코드 리스트
-            start_date: 시작일 (YYYY-MM-DD)
+            tickers: 종목 코드 리스트 (resume 시 None이면 재개한 실행의 종목 전체)
+            start_date: 시작일 (YYYY-MM-DD, 증분 모드에서는 저장된 시세가 없는 종목에만 적용)
             end_date: 종료일 (YYYY-MM-DD)
+            max_workers: 추출 동시 실행 수 (None이면 settings.etl_fetch_workers)
+            batch_size: 일괄 추출 종목 수 (None이면 settings.yfinance_batch_size)
+            full_refresh: True면 마지막 저장일을 무시하고 start_date부터 다시 적재 (수정주가 반영 등)
+            run_key: 실행 키 (Airflow run_id 등, 같은 키로 재실행하면 이어서 진행)
+            resume: run_key가 없을 때 마지막 미완료 실행을 이어받을지 여부
+            load_batch_size: 한 번에 적재할 종목 수 (None이면 settings.etl_load_batch_size)
         
         Returns:
-            실행 결과 통계
+            실행 결과 통계 (stages: 단계별 처리량/큐 깊이)
         """
+        checkpoint = RunCheckpoint(self.db, JOB_US_STOCK_PRICE, run_key)
         try:
-            logger.info(f"미국 주식 시세 데이터 ETL 시작: {len(tickers)}개 종목")
+            tickers = checkpoint.start(tickers, resume=resume)
+            logger.info(
+                f"미국 주식 시세 데이터 ETL 시작: {len(tickers)}개 종목 "
+                f"(실행 {checkpoint.run_key}, 완료 {len(checkpoint.completed)}개 건너뜀)"
+            )
             
-            results = {}
+            # 배치 전체의 종목 ID를 한 번에 조회
+            self.loader.stock_ids.preload(tickers)
+            
+            # 종목별 추출 구간 계산 (DB 티커는 대문자로 저장됨)
+            watermarks = {}
+            if not full_refresh:
+                stored = self.loader.get_price_watermarks(tickers)
+                watermarks = {t: stored[t.upper()] for t in tickers if t.upper() in stored}
+            start_dates, end_date, up_to_date = plan_fetch_ranges(
+                tickers, watermarks, start_date, end_date, full_refresh
+            )
+            
+            results = {ticker: {'status': 'up_to_date'} for ticker in up_to_date}
+            checkpoint.mark_many(up_to_date, 'up_to_date')
             total_extracted = 0
             
-            for ticker in tickers:
-                try:
-                    logger.info(f"종목 처리 중: {ticker}")
-                    
-                    # Extract
-                    raw_df = self.price_fetcher.fetch_stock_price(
-                        ticker, start_date, end_date
-                    )
-                    if raw_df.empty:
-                        logger.warning(f"종목 {ticker} 데이터 없음")
-                        results[ticker] = {'status': 'no_data'}
-                        continue
-                    
-                    total_extracted += len(raw_df)
-                    
-                    # Transform & Load
-                    load_stats = self.loader.load_us_stock_prices(ticker, raw_df)
-                    
-                    results[ticker] = {
-                        'status': 'success',
-                        'extracted': len(raw_df),
-                        'loaded': load_stats
-                    }
-                    
-                except Exception as e:
-                    logger.error(f"종목 {ticker} 처리 실패: {e}")
-                    results[ticker] = {'status': 'failed', 'error': str(e)}
+            # Extract (병렬) → Transform → Load (배치) 스트리밍 실행
+            stream = StagedPipeline(self._transform_prices, self._load_price_batch, load_batch_size)
+            for outcome in stream.run(self.price_fetcher.iter_stock_prices(
+                list(start_dates), start_date, end_date, max_workers, batch_size, start_dates
+            )):
+                ticker = outcome.key
+                if isinstance(outcome.error, SkipItem):
+                    logger.warning(f"종목 {ticker} 건너뜀: {outcome.error.status}")
+                    results[ticker] = {'status': outcome.error.status}
+                    checkpoint.mark(ticker, outcome.error.status)
+                    continue
+                if not outcome.ok:
+                    logger.error(f"종목 {ticker} 처리 실패: {outcome.error}")
+                    results[ticker] = {'status': 'failed', 'error': str(outcome.error)}
+                    checkpoint.mark(ticker, 'failed', error=str(outcome.error))
                     continue
+                
+                entry = outcome.data
+                load_stats = entry['loaded']
+                total_extracted += entry['extracted']
+                
+                results[ticker] = {'status': 'success', **entry}
+                checkpoint.mark(
+                    ticker, 'success',
+                    rows_loaded=load_stats.get('created', 0) + load_stats.get('updated', 0)
+                )
             
             result = {
                 'status': 'completed',
-                'total_tickers': len(tickers),
+                'run_key': checkpoint.run_key,
+                'run_status': checkpoint.finish(),
+                'total_tickers': checkpoint.total_tickers,
                 'successful': sum(1 for r in results.values() if r.get('status') == 'success'),
+                'resumed': len(checkpoint.completed),
+                'up_to_date': len(up_to_date),
                 'total_extracted': total_extracted,
+                'stages': stream.report(),
                 'details': results
             }
             
@@ -138,7 +181,28 @@ class USStockETLPipeline:
             
         except Exception as e:
             logger.error(f"미국 주식 시세 데이터 ETL 실패: {e}")
-            return {'status': 'failed', 'error': str(e)}
+            self.db.rollback()
+            checkpoint.finish()
+            return {'status': 'failed', 'error': str(e), 'run_key': checkpoint.run_key}
+    
+    @staticmethod
+    def _transform_prices(ticker: str, raw_df) -> Dict:
+        """시세 검증 단계 (컬럼 정규화는 종목 ID가 필요해 적재 단계에서 수행)"""
+        if raw_df.empty:
+            raise SkipItem('no_data')
+        return {'extracted': len(raw_df), 'frame': raw_df}
+    
+    def _load_price_batch(self, items: List[FetchResult]) -> Dict:
+        """시세 배치 적재 단계"""
+        loaded = self.loader.load_us_stock_prices_batch({item.key: item.data['frame'] for item in items})
+        outcomes = {}
+        for item in items:
+            load_stats = loaded.get(item.key)
+            if isinstance(load_stats, Exception):
+                outcomes[item.key] = load_stats
+                continue
+            outcomes[item.key] = {'extracted': item.data['extracted'], 'loaded': load_stats}
+        return outcomes
     
     def run_sec_filings_etl(
         self,
@@ -160,6 +224,9 @@ class USStockETLPipeline:
         try:
             logger.info(f"SEC 공시 데이터 ETL 시작: {len(tickers)}개 종목")
             
+            # 배치 전체의 종목 ID를 한 번에 조회
+            self.loader.stock_ids.preload(tickers)
+            
             # Extract
             logger.info("1. SEC 공시 데이터 추출 중...")
             filings_data = self.sec_fetcher.fetch_multiple_companies_filings(
@@ -215,6 +282,9 @@ class USStockETLPipeline:
         try:
             logger.info(f"펀더멘털 데이터 ETL 시작: {len(tickers)}개 종목")
             
+            # 배치 전체의 종목 ID를 한 번에 조회
+            self.loader.stock_ids.preload(tickers)
+            
             results = {}
             
             for ticker in tickers:
@@ -260,7 +330,8 @@ class USStockETLPipeline:
         tickers: List[str],
         update_prices: bool = True,
         update_filings: bool = True,
-        update_fundamentals: bool = False
+        update_fundamentals: bool = False,
+        full_refresh: bool = False
     ) -> Dict:
         """
         전체 ETL 파이프라인 실행
@@ -270,6 +341,7 @@ class USStockETLPipeline:
             update_prices: 시세 데이터 업데이트 여부
             update_filings: SEC 공시 데이터 업데이트 여부
             update_fundamentals: 펀더멘털 데이터 업데이트 여부
+            full_refresh: 시세를 최근 1년 전체 재적재할지 여부 (기본은 증분)
         
         Returns:
             전체 실행 결과
@@ -290,7 +362,7 @@ class USStockETLPipeline:
                 start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
                 
                 results['stock_prices'] = self.run_price_etl(
-                    tickers, start_date, end_date
+                    tickers, start_date, end_date, full_refresh=full_refresh
                 )
             
             # 2. SEC 공시 데이터 ETL
@@ -5,12 +5,14 @@ Yahoo Finance, Polygon.io 등을 통한
 미국 주식 시세 데이터 수집
 """
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 from datetime import datetime, timedelta
 import pandas as pd
 import yfinance as yf
+from yfinance.exceptions import YFPricesMissingError
 
 from app.core.config import settings
+from app.etl.concurrency import FetchResult, SOURCE_YFINANCE, get_rate_limiter, iter_concurrent
 
 logger = logging.getLogger(__name__)
 
@@ -112,16 +114,24 @@ class USStockPriceFetcher:
         
         Returns:
             DataFrame with columns: ['Date', 'Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close']
+            (기간 내 시세가 없으면 빈 DataFrame)
+        
+        Raises:
+            Exception: 네트워크/외부 API 오류 (호출자가 실패로 기록해 재시도하도록 그대로 전달)
         """
         try:
             logger.info(f"미국 주식 시세 데이터 추출 시작: {ticker}")
             
             stock = yf.Ticker(ticker)
             
-            if start_date and end_date:
-                df = stock.history(start=start_date, end=end_date)
-            else:
-                df = stock.history(period=period)
+            # 오류를 빈 결과로 바꾸지 않도록 raise_errors (시세 없음만 빈 결과로 처리)
+            try:
+                if start_date and end_date:
+                    df = stock.history(start=start_date, end=end_date, raise_errors=True)
+                else:
+                    df = stock.history(period=period, raise_errors=True)
+            except YFPricesMissingError:
+                df = pd.DataFrame()
             
             if df.empty:
                 logger.warning(f"티커 {ticker} 데이터 없음")
@@ -152,13 +162,159 @@ class USStockPriceFetcher:
             
         except Exception as e:
             logger.error(f"미국 주식 시세 데이터 추출 실패: {ticker}, {e}")
-            return pd.DataFrame()
+            raise
+    
+    def fetch_stock_prices_batch(
+        self,
+        tickers: List[str],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        period: str = "1y"
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        여러 종목 시세를 한 번의 yf.download 호출로 추출
+        
+        (Price, Ticker) MultiIndex 결과를 stack으로 한 번에 세로형으로 바꾼 뒤
+        종목별 DataFrame으로 분리합니다. 데이터가 없는 종목은 결과에서 빠집니다.
+        
+        Args:
+            tickers: 종목 코드 리스트
+            start_date: 시작일 (YYYY-MM-DD)
+            end_date: 종료일 (YYYY-MM-DD)
+            period: 기간 (start_date/end_date가 없을 때 사용)
+        
+        Returns:
+            Dict[ticker, DataFrame] (fetch_stock_price와 같은 컬럼 구조)
+        """
+        logger.info(f"미국 주식 시세 일괄 추출 시작: {len(tickers)}개 종목")
+        
+        range_kwargs = {'start': start_date, 'end': end_date} if start_date and end_date else {'period': period}
+        raw = yf.download(
+            tickers,
+            group_by='column',
+            auto_adjust=True,  # Ticker.history()와 같은 수정 주가
+            actions=False,
+            threads=False,  # 동시성은 iter_concurrent에서 제어
+            progress=False,
+            **range_kwargs
+        )
+        if raw is None or raw.empty:
+            return {}
+        
+        if not isinstance(raw.columns, pd.MultiIndex):
+            # 단일 종목 응답은 Ticker 레벨이 없을 수 있음
+            raw.columns = pd.MultiIndex.from_product([raw.columns, tickers[:1]])
+        
+        long_df = raw.stack(level=1, future_stack=True)
+        long_df.index.names = ['Date', 'ticker']
+        long_df = long_df.reset_index()
+        long_df = long_df[long_df['Close'].notna()]
+        long_df['Date'] = pd.to_datetime(long_df['Date'])
+        
+        price_cols = [col for col in ['Date', 'Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close'] if col in long_df.columns]
+        frames = {
+            str(ticker): group[price_cols + ['ticker']].reset_index(drop=True)
+            for ticker, group in long_df.groupby('ticker', sort=False)
+        }
+        
+        logger.info(f"미국 주식 시세 일괄 추출 완료: {len(frames)}/{len(tickers)}개 종목, {len(long_df)}개 행")
+        return frames
+    
+    def iter_stock_prices(
+        self,
+        tickers: List[str],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        start_dates: Optional[Dict[str, str]] = None
+    ) -> Iterator[FetchResult]:
+        """
+        여러 종목의 시세 데이터 병렬 추출 (완료 순서대로 반환)
+        
+        batch_size개씩 묶어 yf.download 한 번으로 추출하고, 실패한 묶음이나
+        결과에서 빠진 종목은 마지막에 종목별 Ticker.history()로 재시도합니다.
+        종목별 시작일이 다르면 같은 시작일끼리 묶습니다.
+        
+        Args:
+            tickers: 종목 코드 리스트
+            start_date: 시작일
+            end_date: 종료일
+            max_workers: 동시 실행 수 (None이면 settings.etl_fetch_workers)
+            batch_size: 한 번에 요청할 종목 수 (None이면 settings.yfinance_batch_size, 1 이하면 종목별 추출)
+            start_dates: 종목별 시작일 (증분 추출 시 사용, 없는 종목은 start_date)
+        
+        Yields:
+            FetchResult (key: 종목 코드, data: 시세 DataFrame)
+        """
+        limiter = get_rate_limiter(SOURCE_YFINANCE)
+        batch_size = settings.yfinance_batch_size if batch_size is None else batch_size
+        
+        start_dates = start_dates or {}
+        
+        if batch_size <= 1:
+            yield from self._iter_single_prices(tickers, start_date, end_date, max_workers, start_dates)
+            return
+        
+        # 같은 시작일끼리 묶어 batch_size 단위로 분할
+        by_start: Dict[Optional[str], List[str]] = {}
+        for ticker in tickers:
+            by_start.setdefault(start_dates.get(ticker, start_date), []).append(ticker)
+        chunks = {}
+        chunk_starts = {}
+        for chunk_start, group in by_start.items():
+            for offset in range(0, len(group), batch_size):
+                key = str(len(chunks))
+                chunks[key] = group[offset:offset + batch_size]
+                chunk_starts[key] = chunk_start
+        
+        def fetch_chunk(key: str) -> Dict[str, pd.DataFrame]:
+            limiter.acquire()
+            return self.fetch_stock_prices_batch(chunks[key], chunk_starts[key], end_date)
+        
+        retry_tickers = []
+        for chunk_result in iter_concurrent(chunks.keys(), fetch_chunk, max_workers=max_workers):
+            chunk = chunks[chunk_result.key]
+            if not chunk_result.ok:
+                logger.warning(f"시세 일괄 추출 실패, 종목별 재시도 예정: {len(chunk)}개 종목, {chunk_result.error}")
+                retry_tickers.extend(chunk)
+                continue
+            
+            frames = chunk_result.data
+            for ticker in chunk:
+                if ticker in frames:
+                    yield FetchResult(key=ticker, data=frames[ticker], elapsed=chunk_result.elapsed)
+                else:
+                    retry_tickers.append(ticker)
+        
+        if retry_tickers:
+            logger.info(f"종목별 재시도: {len(retry_tickers)}개 종목")
+            yield from self._iter_single_prices(retry_tickers, start_date, end_date, max_workers, start_dates)
+    
+    def _iter_single_prices(
+        self,
+        tickers: List[str],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        start_dates: Optional[Dict[str, str]] = None
+    ) -> Iterator[FetchResult]:
+        """종목별 Ticker.history() 병렬 추출"""
+        limiter = get_rate_limiter(SOURCE_YFINANCE)
+        start_dates = start_dates or {}
+        
+        def fetch(ticker: str) -> pd.DataFrame:
+            limiter.acquire()
+            return self.fetch_stock_price(ticker, start_dates.get(ticker, start_date), end_date)
+        
+        return iter_concurrent(tickers, fetch, max_workers=max_workers)
     
     def fetch_multiple_stocks(
         self,
         tickers: List[str],
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        max_workers: Optional[int] = None
     ) -> Dict[str, pd.DataFrame]:
         """
         여러 종목의 시세 데이터 일괄 추출
@@ -167,19 +323,18 @@ class USStockPriceFetcher:
             tickers: 종목 코드 리스트
             start_date: 시작일
             end_date: 종료일
+            max_workers: 동시 실행 수 (None이면 settings.etl_fetch_workers)
         
         Returns:
             Dict[ticker, DataFrame]
         """
         results = {}
-        for ticker in tickers:
-            try:
-                df = self.fetch_stock_price(ticker, start_date, end_date)
-                if not df.empty:
-                    results[ticker] = df
-            except Exception as e:
-                logger.warning(f"종목 {ticker} 추출 실패: {e}")
+        for result in self.iter_stock_prices(tickers, start_date, end_date, max_workers):
+            if not result.ok:
+                logger.warning(f"종목 {result.key} 추출 실패: {result.error}")
                 continue
+            if not result.data.empty:
+                results[result.key] = result.data
         
         return results
     
@@ -0,0 +1,64 @@
+"""
+증분 추출 구간 계산 (High-watermark)
+
+종목별 마지막 저장일(watermark)을 기준으로 새로 받아야 할 구간만 계산합니다.
+마지막 저장일은 장중 미확정 봉일 수 있으므로 해당 일자부터 다시 받아 덮어씁니다.
+"""
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# watermark가 없는 종목의 기본 조회 기간
+DEFAULT_LOOKBACK_DAYS = 365
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def plan_fetch_ranges(
+    tickers: List[str],
+    watermarks: Mapping[str, date],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    full_refresh: bool = False
+) -> Tuple[Dict[str, str], str, List[str]]:
+    """
+    종목별 추출 시작일 계산
+
+    Args:
+        tickers: 종목 코드 리스트
+        watermarks: 종목 코드 -> 마지막 저장일
+        start_date: 시작일 (전체 재적재 시 구간 시작, 증분 시 watermark가 없는 종목의 시작일)
+        end_date: 종료일 (None이면 오늘)
+        full_refresh: True면 watermark를 무시하고 start_date부터 다시 추출 (수정주가 반영 등)
+
+    Returns:
+        (종목 코드 -> 시작일, 종료일, 최신 상태라 건너뛸 종목 리스트)
+    """
+    today = date.today()
+    end = _parse_date(end_date) or today
+    start = _parse_date(start_date) or (end - timedelta(days=DEFAULT_LOOKBACK_DAYS))
+
+    starts: Dict[str, str] = {}
+    up_to_date: List[str] = []
+    for ticker in tickers:
+        watermark = None if full_refresh else watermarks.get(ticker)
+        if watermark is None:
+            starts[ticker] = start.strftime("%Y-%m-%d")
+            continue
+        if watermark >= end and end < today:
+            up_to_date.append(ticker)
+            continue
+        starts[ticker] = watermark.strftime("%Y-%m-%d")
+
+    mode = "전체 재적재" if full_refresh else "증분"
+    logger.info(
+        f"추출 구간 계산 ({mode}): 대상 {len(starts)}개, 최신 상태 {len(up_to_date)}개, "
+        f"watermark 보유 {sum(1 for t in tickers if t in watermarks)}개"
+    )
+    return starts, end.strftime("%Y-%m-%d"), up_to_date
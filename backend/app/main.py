@@ -1,6 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 # from .api.v1.api import api_router
+from .core.database import dispose_async_engine
+from .core.upstream import check_threadpool_capacity, upstream_executor
+from .services.fs_score_cache import fs_score_cache
+from .services.stock_listing_service import stock_listing_cache
 from .api.v1.api import api_router
 
 app = FastAPI(
@@ -21,6 +25,27 @@ app.add_middleware(
 # API v1 라우터 포함
 app.include_router(api_router, prefix="/api/v1")
 
+@app.on_event("startup")
+def warm_up_caches():
+    """종목 목록 캐시 사전 적재, 재무제표 데이터 버전 확인 시작"""
+    stock_listing_cache.warm_up()
+    fs_score_cache.warm_up()
+
+@app.on_event("startup")
+async def verify_upstream_capacity():
+    """외부 API 실행기가 기본 스레드 풀을 모두 점유할 수 없는지 확인"""
+    check_threadpool_capacity()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    """비동기 DB 연결 정리"""
+    await dispose_async_engine()
+
+@app.on_event("shutdown")
+def stop_upstream_executor():
+    """대기 중인 외부 API 호출 취소"""
+    upstream_executor.shutdown()
+
 @app.get("/")
 def read_root():
     return {"message": "Hello DD-Investment 🚀"}
@@ -5,8 +5,9 @@ from .base import BaseModel
 from .user import User, GenderEnum, RoleEnum, SubscriptionTypeEnum
 from .lotto import LottoNumber
 from .email_verification import EmailVerification
-from .stock import Stock, FinancialAccount, FinancialStatementRaw
+from .stock import Stock, FinancialAccount, FinancialStatementRaw, StockPriceDaily, StockIndicatorDaily
 from .us_stock import USStock, USPriceDaily, USFundamental, USSecFiling
+from .etl import ETLRun, ETLTickerStatus
 
 __all__ = [
     "BaseModel",
@@ -19,8 +20,12 @@ __all__ = [
     "Stock",
     "FinancialAccount",
     "FinancialStatementRaw",
+    "StockPriceDaily",
+    "StockIndicatorDaily",
     "USStock",
     "USPriceDaily",
     "USFundamental",
     "USSecFiling",
+    "ETLRun",
+    "ETLTickerStatus",
 ]
\ No newline at end of file
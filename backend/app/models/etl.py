@@ -0,0 +1,54 @@
+"""
+ETL 실행 기록 모델
+"""
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, UniqueConstraint, func
+from sqlalchemy.orm import relationship
+from .base import BaseModel
+from ..core.database import Base
+
+
+class ETLRun(BaseModel):
+    """
+    ETL 실행 모델
+
+    (job, run_key) 단위로 한 번의 실행을 기록합니다.
+    Airflow에서는 dag_run의 run_id를 run_key로 사용하므로 재시도는 같은 실행을 이어받습니다.
+    """
+    __tablename__ = "etl_run"
+    __table_args__ = (
+        UniqueConstraint('job', 'run_key', name='uq_etl_run_job_run_key'),
+        {'schema': 'finance'}
+    )
+
+    job = Column(String(50), nullable=False, index=True)  # kr_stock_price, us_stock_price 등
+    run_key = Column(String(200), nullable=False)
+    status = Column(String(20), nullable=False, default='running')  # running, completed, failed
+    total_tickers = Column(Integer, default=0)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+    # 관계 설정
+    tickers = relationship("ETLTickerStatus", back_populates="run", cascade="all, delete-orphan")
+
+
+class ETLTickerStatus(Base):
+    """
+    ETL 실행별 종목 진행 상태 모델
+
+    (run_id, ticker) 복합 기본키를 사용하며, 종목 처리가 끝날 때마다 상태를 갱신합니다.
+    """
+    __tablename__ = "etl_ticker_status"
+    __table_args__ = {'schema': 'finance'}
+
+    run_id = Column(Integer, ForeignKey('finance.etl_run.id', ondelete='CASCADE'), primary_key=True)
+    ticker = Column(String(20), primary_key=True)
+    status = Column(String(30), nullable=False, default='pending')  # pending, success, up_to_date, no_data, failed 등
+    attempts = Column(Integer, nullable=False, default=0)
+    rows_loaded = Column(Integer)
+    error = Column(Text)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # 관계 설정
+    run = relationship("ETLRun", back_populates="tickers")
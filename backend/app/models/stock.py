@@ -1,10 +1,11 @@
 """
 주식 관련 모델
 """
-from sqlalchemy import Column, String, Integer, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Numeric, DateTime, ForeignKey, Date, Float, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .base import BaseModel
+from ..core.database import Base
 
 
 class Stock(BaseModel):
@@ -20,6 +21,8 @@ class Stock(BaseModel):
     
     # 관계 설정
     financial_data = relationship("FinancialStatementRaw", back_populates="stock")
+    prices = relationship("StockPriceDaily", back_populates="stock", cascade="all, delete-orphan")
+    indicators = relationship("StockIndicatorDaily", back_populates="stock", cascade="all, delete-orphan")
 
 
 class FinancialAccount(BaseModel):
@@ -51,3 +54,70 @@ class FinancialStatementRaw(BaseModel):
     # 관계 설정
     stock = relationship("Stock", back_populates="financial_data")
     account = relationship("FinancialAccount", back_populates="financial_data")
+
+
+class StockPriceDaily(Base):
+    """
+    국내 주식 일봉 데이터 모델
+
+    (stock_id, date) 복합 기본키를 사용합니다.
+    대량 upsert(INSERT ... ON CONFLICT)의 충돌 대상이 되므로 별도 id 컬럼을 두지 않습니다.
+    """
+    __tablename__ = "stock_price_daily"
+    __table_args__ = {'schema': 'finance'}
+    
+    stock_id = Column(Integer, ForeignKey('finance.stock.id'), primary_key=True)
+    date = Column(Date, primary_key=True, index=True)
+    
+    # OHLCV
+    open = Column(Numeric(12, 4))
+    high = Column(Numeric(12, 4))
+    low = Column(Numeric(12, 4))
+    close = Column(Numeric(12, 4))
+    volume = Column(Numeric(20, 0))  # 거래량
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # 관계 설정
+    stock = relationship("Stock", back_populates="prices")
+
+
+class StockIndicatorDaily(Base):
+    """
+    국내 주식 일별 기술적 지표 모델
+
+    시세 적재 후 증분 계산된 지표를 (stock_id, date) 단위로 저장합니다.
+    ema_fast/ema_slow/macd_signal은 다음 증분 계산 시 이어받는 EMA 상태입니다.
+    """
+    __tablename__ = "stock_indicator_daily"
+    __table_args__ = {'schema': 'finance'}
+    
+    stock_id = Column(Integer, ForeignKey('finance.stock.id'), primary_key=True)
+    date = Column(Date, primary_key=True, index=True)
+    
+    # 이동평균
+    ma5 = Column(Float)
+    ma20 = Column(Float)
+    ma60 = Column(Float)
+    
+    # RSI
+    rsi = Column(Float)
+    
+    # MACD
+    macd = Column(Float)
+    macd_signal = Column(Float)
+    macd_hist = Column(Float)
+    ema_fast = Column(Float)  # EMA(12)
+    ema_slow = Column(Float)  # EMA(26)
+    
+    # 볼린저 밴드
+    bollinger_upper = Column(Float)
+    bollinger_middle = Column(Float)
+    bollinger_lower = Column(Float)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # 관계 설정
+    stock = relationship("Stock", back_populates="indicators")
@@ -7,8 +7,11 @@ from datetime import datetime, timedelta
 from typing import Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from app.models import User, RoleEnum, SubscriptionTypeEnum, EmailVerification
 from app.schemas.user import UserCreate, UserResponse, UserLoginRequest, UserLoginResponse
 from app.core.security import verify_password, get_password_hash, create_access_token
@@ -27,7 +30,123 @@ class AuthService:
         existing_user = self.db.query(User).filter(
             (User.username == user_data.username) | (User.email == user_data.email)
         ).first()
+        self._check_duplicate_user(existing_user, user_data)
         
+        # 비밀번호 해싱
+        hashed_password = get_password_hash(user_data.password)
+        
+        # 닉네임 중복 확인
+        existing_nickname = self.db.query(User).filter(User.nickname == user_data.nickname).first()
+        self._check_duplicate_nickname(existing_nickname)
+        
+        # 사용자 생성
+        new_user = self._build_user(user_data, hashed_password)
+        
+        self.db.add(new_user)
+        self.db.commit()
+        self.db.refresh(new_user)
+        
+        return new_user
+    
+    def login(self, login_data: UserLoginRequest) -> dict:
+        """로그인"""
+        # 사용자 조회 (username 또는 email)
+        user = self.db.query(User).filter(
+            (User.username == login_data.username) | (User.email == login_data.username)
+        ).first()
+        self._check_user_found(user)
+        
+        # 비밀번호 검증
+        if not verify_password(login_data.password, user.password_hash):
+            error = self._record_failed_login(user)
+            self.db.commit()
+            raise error
+        
+        # 계정 상태/잠금 확인
+        self._check_login_allowed(user)
+        
+        # 로그인 성공 처리
+        self._record_successful_login(user)
+        self.db.commit()
+        
+        return self._login_result(user)
+    
+    def get_current_user(self, token: str) -> Optional[User]:
+        """현재 사용자 조회 (토큰 기반)"""
+        user_id = self._user_id_from_token(token)
+        if user_id is None:
+            return None
+        
+        user = self.db.query(User).filter(User.id == user_id).first()
+        return user
+    
+    def send_verification_email(self, email: str) -> dict:
+        """이메일 인증 코드 발송"""
+        # 이메일 형식 검증
+        self._validate_email(email)
+        
+        # 6자리 랜덤 코드 생성
+        verification_code = secrets.randbelow(900000) + 100000  # 100000-999999
+        
+        # 기존 인증 코드가 있으면 삭제
+        existing_verification = self.db.query(EmailVerification).filter(
+            EmailVerification.email == email
+        ).first()
+        
+        if existing_verification:
+            self.db.delete(existing_verification)
+        
+        # 새로운 인증 코드를 데이터베이스에 저장
+        self.db.add(self._build_verification(email, verification_code))
+        self.db.commit()
+        
+        # 이메일 발송
+        return self._deliver_verification_code(email, verification_code)
+    
+    def verify_email_code(self, email: str, code: str) -> dict:
+        """이메일 인증 코드 검증"""
+        # 데이터베이스에서 인증 코드 조회
+        verification = self.db.query(EmailVerification).filter(
+            EmailVerification.email == email,
+            EmailVerification.is_used == "false"
+        ).first()
+        
+        if not verification:
+            raise self._verification_required_error()
+        
+        # 만료 시간 확인
+        if datetime.utcnow() > verification.expires_at:
+            # 만료된 코드 삭제
+            self.db.delete(verification)
+            self.db.commit()
+            raise self._verification_expired_error()
+        
+        # 코드 검증
+        self._check_verification_code(verification, code)
+        
+        # 인증 성공 시 코드 삭제
+        self.db.delete(verification)
+        self.db.commit()
+        
+        return self._verified_result(email)
+    
+    def cleanup_expired_verifications(self):
+        """만료된 인증 코드들 정리"""
+        try:
+            expired_count = self.db.query(EmailVerification).filter(
+                EmailVerification.expires_at < datetime.utcnow()
+            ).delete()
+            
+            self.db.commit()
+            print(f"✅ 만료된 인증 코드 {expired_count}개 정리 완료")
+            return expired_count
+        except Exception as e:
+            print(f"❌ 인증 코드 정리 중 오류: {e}")
+            return 0
+    
+    @staticmethod
+    def _check_duplicate_user(existing_user: Optional[User], user_data: UserCreate):
+        """사용자명/이메일 중복이면 400"""
         if existing_user:
             if existing_user.username == user_data.username:
                 raise HTTPException(
@@ -39,20 +158,20 @@ class AuthService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="이미 존재하는 이메일입니다"
                 )
-        
-        # 비밀번호 해싱
-        hashed_password = get_password_hash(user_data.password)
-        
-        # 닉네임 중복 확인
-        existing_nickname = self.db.query(User).filter(User.nickname == user_data.nickname).first()
+    
+    @staticmethod
+    def _check_duplicate_nickname(existing_nickname: Optional[User]):
+        """닉네임 중복이면 400"""
         if existing_nickname:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="이미 존재하는 닉네임입니다"
             )
-        
-        # 사용자 생성
-        new_user = User(
+    
+    @staticmethod
+    def _build_user(user_data: UserCreate, hashed_password: str) -> User:
+        """신규 사용자 객체 생성"""
+        return User(
             username=user_data.username,
             email=user_data.email,
             password_hash=hashed_password,
@@ -74,68 +193,64 @@ class AuthService:
             login_count=0,
             failed_login_attempts=0,
         )
-        
-        self.db.add(new_user)
-        self.db.commit()
-        self.db.refresh(new_user)
-        
-        return new_user
     
-    def login(self, login_data: UserLoginRequest) -> dict:
-        """로그인"""
-        # 사용자 조회 (username 또는 email)
-        user = self.db.query(User).filter(
-            (User.username == login_data.username) | (User.email == login_data.username)
-        ).first()
-        
+    @staticmethod
+    def _check_user_found(user: Optional[User]):
+        """로그인 대상 사용자가 없으면 401"""
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="ID가 올바르지 않습니다"
             )
+    
+    @staticmethod
+    def _record_failed_login(user: User) -> HTTPException:
+        """
+        로그인 실패 횟수 증가 (5회 실패 시 30분 잠금)
         
-        # 비밀번호 검증
-        if not verify_password(login_data.password, user.password_hash):
-            # 로그인 실패 횟수 증가
-            user.failed_login_attempts += 1
-            
-            # 5회 실패 시 계정 잠금 (30분)
-            if user.failed_login_attempts >= 5:
-                user.locked_until = datetime.utcnow() + timedelta(minutes=30)
-                self.db.commit()
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="로그인 실패 횟수 초과. 30분 후 다시 시도해주세요."
-                )
-            
-            self.db.commit()
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="비밀번호가 올바르지 않습니다"
+        Returns:
+            커밋 후 발생시킬 예외
+        """
+        user.failed_login_attempts += 1
+        
+        if user.failed_login_attempts >= 5:
+            user.locked_until = datetime.utcnow() + timedelta(minutes=30)
+            return HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="로그인 실패 횟수 초과. 30분 후 다시 시도해주세요."
             )
         
-        # 계정 상태 확인
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="비밀번호가 올바르지 않습니다"
+        )
+    
+    @staticmethod
+    def _check_login_allowed(user: User):
+        """비활성/잠금 계정이면 403"""
         if not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="비활성화된 계정입니다"
             )
         
-        # 계정 잠금 확인
         if user.locked_until and user.locked_until > datetime.utcnow():
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="계정이 잠겨있습니다. 잠시 후 다시 시도해주세요."
             )
-        
-        # 로그인 성공 처리
+    
+    @staticmethod
+    def _record_successful_login(user: User):
+        """로그인 성공 기록"""
         user.last_login_at = datetime.utcnow()
         user.login_count += 1
         user.failed_login_attempts = 0
         user.locked_until = None
-        self.db.commit()
-        
-        # JWT 토큰 생성
+    
+    @staticmethod
+    def _login_result(user: User) -> dict:
+        """JWT 토큰 생성 및 로그인 응답"""
         access_token = create_access_token(
             data={
                 "sub": str(user.id),
@@ -150,8 +265,9 @@ class AuthService:
             "user": user
         }
     
-    def get_current_user(self, token: str) -> Optional[User]:
-        """현재 사용자 조회 (토큰 기반)"""
+    @staticmethod
+    def _user_id_from_token(token: str) -> Optional[int]:
+        """토큰에서 사용자 ID 추출 (유효하지 않으면 None)"""
         from app.core.security import decode_access_token
         
         payload = decode_access_token(token)
@@ -161,13 +277,11 @@ class AuthService:
         user_id = payload.get("sub")
         if not user_id:
             return None
-        
-        user = self.db.query(User).filter(User.id == int(user_id)).first()
-        return user
+        return int(user_id)
     
-    def send_verification_email(self, email: str) -> dict:
-        """이메일 인증 코드 발송"""
-        # 이메일 형식 검증
+    @staticmethod
+    def _validate_email(email: str):
+        """이메일 형식 검증"""
         import re
         email_pattern = r'^[^\s@]+@[^\s@]+\.[^\s@]+$'
         if not re.match(email_pattern, email):
@@ -175,30 +289,19 @@ class AuthService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="올바른 이메일 형식이 아닙니다"
             )
-        
-        # 6자리 랜덤 코드 생성
-        verification_code = secrets.randbelow(900000) + 100000  # 100000-999999
-        
-        # 기존 인증 코드가 있으면 삭제
-        existing_verification = self.db.query(EmailVerification).filter(
-            EmailVerification.email == email
-        ).first()
-        
-        if existing_verification:
-            self.db.delete(existing_verification)
-        
-        # 새로운 인증 코드를 데이터베이스에 저장
-        verification = EmailVerification(
+    
+    @staticmethod
+    def _build_verification(email: str, verification_code: int) -> EmailVerification:
+        """인증 코드 객체 생성 (10분 유효)"""
+        return EmailVerification(
             email=email,
             code=str(verification_code),
             expires_at=datetime.utcnow() + timedelta(minutes=10),  # 10분 유효
             is_used="false"
         )
-        
-        self.db.add(verification)
-        self.db.commit()
-        
-        # 이메일 발송
+    
+    def _deliver_verification_code(self, email: str, verification_code: int) -> dict:
+        """인증 코드 발송 (SMTP 설정이 없으면 콘솔 출력)"""
         try:
             # Gmail SMTP 설정이 있고 실제 이메일 주소인 경우에만 실제 이메일 발송
             if (settings.email_sender and 
@@ -226,61 +329,37 @@ class AuthService:
                 detail=f"이메일 발송에 실패했습니다: {str(e)}"
             )
     
-    def verify_email_code(self, email: str, code: str) -> dict:
-        """이메일 인증 코드 검증"""
-        # 데이터베이스에서 인증 코드 조회
-        verification = self.db.query(EmailVerification).filter(
-            EmailVerification.email == email,
-            EmailVerification.is_used == "false"
-        ).first()
-        
-        if not verification:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="인증 코드를 먼저 요청해주세요"
-            )
-        
-        # 만료 시간 확인
-        if datetime.utcnow() > verification.expires_at:
-            # 만료된 코드 삭제
-            self.db.delete(verification)
-            self.db.commit()
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="인증 코드가 만료되었습니다. 다시 요청해주세요"
-            )
-        
-        # 코드 검증
+    @staticmethod
+    def _verification_required_error() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="인증 코드를 먼저 요청해주세요"
+        )
+    
+    @staticmethod
+    def _verification_expired_error() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="인증 코드가 만료되었습니다. 다시 요청해주세요"
+        )
+    
+    @staticmethod
+    def _check_verification_code(verification: EmailVerification, code: str):
+        """인증 코드가 다르면 400"""
         if verification.code != code:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="인증 코드가 올바르지 않습니다"
             )
-        
-        # 인증 성공 시 코드 삭제
-        self.db.delete(verification)
-        self.db.commit()
-        
+    
+    @staticmethod
+    def _verified_result(email: str) -> dict:
         return {
             "success": True,
             "message": "이메일 인증이 완료되었습니다",
             "email": email
         }
     
-    def cleanup_expired_verifications(self):
-        """만료된 인증 코드들 정리"""
-        try:
-            expired_count = self.db.query(EmailVerification).filter(
-                EmailVerification.expires_at < datetime.utcnow()
-            ).delete()
-            
-            self.db.commit()
-            print(f"✅ 만료된 인증 코드 {expired_count}개 정리 완료")
-            return expired_count
-        except Exception as e:
-            print(f"❌ 인증 코드 정리 중 오류: {e}")
-            return 0
-    
     def _send_email(self, email: str, code: int):
         """실제 이메일 발송 (SMTP)"""
         # Gmail 또는 다른 SMTP 서버 사용 가능
@@ -357,3 +436,148 @@ class AuthService:
             server.starttls()
             server.login(sender_email, sender_password)
             server.send_message(message)
+
+
+class AsyncAuthService(AuthService):
+    """
+    인증 서비스 (비동기 세션)
+    
+    검증/응답 생성은 AuthService와 공유하고, DB 조회는 await로,
+    비밀번호 해싱/검증과 SMTP 발송처럼 CPU나 네트워크를 오래 쓰는 작업은 스레드 풀에서 실행합니다.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def _first_user(self, *criteria) -> Optional[User]:
+        result = await self.db.execute(select(User).where(*criteria).limit(1))
+        return result.scalars().first()
+    
+    async def register(self, user_data: UserCreate) -> User:
+        """회원가입"""
+        # 중복 확인
+        existing_user = await self._first_user(
+            (User.username == user_data.username) | (User.email == user_data.email)
+        )
+        self._check_duplicate_user(existing_user, user_data)
+        
+        # 비밀번호 해싱
+        hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
+        
+        # 닉네임 중복 확인
+        existing_nickname = await self._first_user(User.nickname == user_data.nickname)
+        self._check_duplicate_nickname(existing_nickname)
+        
+        # 사용자 생성
+        new_user = self._build_user(user_data, hashed_password)
+        
+        self.db.add(new_user)
+        await self.db.commit()
+        await self.db.refresh(new_user)
+        
+        return new_user
+    
+    async def login(self, login_data: UserLoginRequest) -> dict:
+        """로그인"""
+        # 사용자 조회 (username 또는 email)
+        user = await self._first_user(
+            (User.username == login_data.username) | (User.email == login_data.username)
+        )
+        self._check_user_found(user)
+        
+        # 비밀번호 검증
+        if not await run_in_threadpool(verify_password, login_data.password, user.password_hash):
+            error = self._record_failed_login(user)
+            await self.db.commit()
+            raise error
+        
+        # 계정 상태/잠금 확인
+        self._check_login_allowed(user)
+        
+        # 로그인 성공 처리
+        self._record_successful_login(user)
+        await self.db.commit()
+        
+        return self._login_result(user)
+    
+    async def get_current_user(self, token: str) -> Optional[User]:
+        """현재 사용자 조회 (토큰 기반)"""
+        user_id = self._user_id_from_token(token)
+        if user_id is None:
+            return None
+        
+        return await self._first_user(User.id == user_id)
+    
+    async def is_available(self, column, value) -> bool:
+        """사용자명/이메일/닉네임 사용 가능 여부"""
+        return await self._first_user(column == value) is None
+    
+    async def send_verification_email(self, email: str) -> dict:
+        """이메일 인증 코드 발송"""
+        # 이메일 형식 검증
+        self._validate_email(email)
+        
+        # 6자리 랜덤 코드 생성
+        verification_code = secrets.randbelow(900000) + 100000  # 100000-999999
+        
+        # 기존 인증 코드가 있으면 삭제
+        result = await self.db.execute(
+            select(EmailVerification).where(EmailVerification.email == email).limit(1)
+        )
+        existing_verification = result.scalars().first()
+        
+        if existing_verification:
+            await self.db.delete(existing_verification)
+        
+        # 새로운 인증 코드를 데이터베이스에 저장
+        self.db.add(self._build_verification(email, verification_code))
+        await self.db.commit()
+        
+        # 이메일 발송 (SMTP는 블로킹이므로 스레드 풀에서 실행)
+        return await run_in_threadpool(self._deliver_verification_code, email, verification_code)
+    
+    async def verify_email_code(self, email: str, code: str) -> dict:
+        """이메일 인증 코드 검증"""
+        # 데이터베이스에서 인증 코드 조회
+        result = await self.db.execute(
+            select(EmailVerification).where(
+                EmailVerification.email == email,
+                EmailVerification.is_used == "false"
+            ).limit(1)
+        )
+        verification = result.scalars().first()
+        
+        if not verification:
+            raise self._verification_required_error()
+        
+        # 만료 시간 확인
+        if datetime.utcnow() > verification.expires_at:
+            # 만료된 코드 삭제
+            await self.db.delete(verification)
+            await self.db.commit()
+            raise self._verification_expired_error()
+        
+        # 코드 검증
+        self._check_verification_code(verification, code)
+        
+        # 인증 성공 시 코드 삭제
+        await self.db.delete(verification)
+        await self.db.commit()
+        
+        return self._verified_result(email)
+    
+    async def cleanup_expired_verifications(self):
+        """만료된 인증 코드들 정리"""
+        try:
+            result = await self.db.execute(
+                delete(EmailVerification).where(EmailVerification.expires_at < datetime.utcnow())
+            )
+            expired_count = result.rowcount
+            
+            await self.db.commit()
+            print(f"✅ 만료된 인증 코드 {expired_count}개 정리 완료")
+            return expired_count
+        except Exception as e:
+            await self.db.rollback()
+            print(f"❌ 인증 코드 정리 중 오류: {e}")
+            return 0
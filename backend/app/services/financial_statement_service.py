@@ -2,69 +2,143 @@
 재무제표 서비스
 [6] SQLTest.py의 로직을 서비스 레이어로 분리
 """
-import os
+import re
 import logging
 import psycopg2
 import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.mixture import GaussianMixture
-from sklearn.cluster import AgglomerativeClustering
-from dotenv import load_dotenv
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import get_raw_connection
+from app.services.fs_score_cache import fs_score_cache
+from app.services.fs_scoring import clustering_score, score_values
 
 logger = logging.getLogger(__name__)
 
-# .env.local 파일 로드 (없으면 .env 파일 사용)
-current_dir = os.path.dirname(os.path.abspath(__file__))
-backend_dir = os.path.dirname(os.path.dirname(current_dir))  # backend/ 디렉토리
-env_local_path = os.path.join(backend_dir, '.env.local')
-env_path = os.path.join(backend_dir, '.env')
+# 과거기준별 변화율 컬럼명과 비교 시차 (0: 전기대비, 1: 전년동기대비)
+FS_CHANGE_COLUMNS = ("전기대비", "전년동기대비")
+FS_CHANGE_LAGS = (1, 4)
+
+
+# 요청 분기 + 비교 분기만 조회하고, 비교값은 종목별 LAG로 계산
+FS_PERIOD_CHANGE_QUERY = """
+WITH periods AS (
+    SELECT t.*
+    FROM test_table t
+    WHERE t.fs_code = %(fs_code)s
+      AND ((t.year = %(year)s AND t.quarter = %(quarter)s)
+        OR (t.year = %(prev_year)s AND t.quarter = %(prev_quarter)s))
+), lagged AS (
+    SELECT periods.*,
+           LAG("값") OVER (PARTITION BY stock_code ORDER BY year, quarter) AS prev_value
+    FROM periods
+)
+SELECT * FROM lagged
+WHERE year = %(year)s AND quarter = %(quarter)s
+ORDER BY stock_code
+"""
+
+
+def previous_period(year: int, quarter: str, 과거기준: int):
+    """
+    비교 기간 계산
+    
+    Args:
+        year: 연도
+        quarter: 분기 (Q1~Q4)
+        과거기준: 0이면 직전 분기, 1이면 전년 동기
+    
+    Returns:
+        (비교 연도, 비교 분기)
+    """
+    match = re.fullmatch(r"Q([1-4])", str(quarter).strip().upper())
+    if match is None:
+        raise ValueError(f"올바르지 않은 분기입니다: {quarter} (Q1~Q4)")
+    number = int(match.group(1))
+    
+    if 과거기준 == 1:
+        return int(year) - 1, f"Q{number}"
+    if number == 1:
+        return int(year) - 1, "Q4"
+    return int(year), f"Q{number - 1}"
+
 
-if os.path.exists(env_local_path):
-    load_dotenv(env_local_path, override=True)
-elif os.path.exists(env_path):
-    load_dotenv(env_path, override=True)
-else:
-    load_dotenv(override=True)
+def group_shift(codes: np.ndarray, values: np.ndarray, lag: int) -> np.ndarray:
+    """
+    그룹(종목)별 shift를 NumPy로 계산
+    
+    행 순서를 유지한 채 같은 그룹 안에서 lag행 앞의 값을 가져오며, 없으면 NaN입니다.
+    
+    Args:
+        codes: 행별 그룹 코드 (pd.factorize 결과 등)
+        values: 행별 값
+        lag: 시차 (행 수)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    prev = np.full(len(values), np.nan)
+    if lag <= 0 or len(values) <= lag:
+        return prev
+    
+    # 그룹 안에서는 원래 행 순서를 유지하도록 안정 정렬
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    sorted_values = values[order]
+    
+    shifted = np.full(len(values), np.nan)
+    same_group = sorted_codes[lag:] == sorted_codes[:-lag]
+    shifted[lag:] = np.where(same_group, sorted_values[:-lag], np.nan)
+    prev[order] = shifted
+    return prev
 
-# 환경 변수에서 DB 설정 가져오기
-DATABASE_HOST = os.getenv("DATABASE_HOST", "121.134.7.122")
-DATABASE_PORT = os.getenv("DATABASE_PORT", "5432")
-DATABASE_NAME = os.getenv("DATABASE_NAME", "finance_db")
-DATABASE_USER = os.getenv("DATABASE_USER", "postgres")
-DATABASE_PASSWORD = os.getenv("DATABASE_PASSWORD", "")
+
+def fs_pct_change(now: np.ndarray, prev: np.ndarray) -> np.ndarray:
+    """
+    재무제표 변화율 (배열 연산)
+    
+    - 비교값이 없거나 둘 중 하나가 0이면 NaN
+    - 흑자 전환(prev < 0, now > 0)은 -now/prev가 1보다 크면 1을 빼고, 아니면 절반으로 나눔
+    - 그 외에는 now/prev - 1
+    """
+    now = np.asarray(now, dtype=np.float64)
+    prev = np.asarray(prev, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = now / prev
+        flipped = -ratio
+        result = np.where(
+            (prev < 0) & (now > 0),
+            np.where(flipped > 1, flipped - 1, flipped / 2),
+            ratio - 1
+        )
+        result[np.isnan(prev) | (prev * now == 0)] = np.nan
+    return result
 
 
 class FinancialStatementService:
-    """재무제표 서비스"""
+    """
+    재무제표 서비스
+    
+    DB 연결은 공용 SQLAlchemy 엔진의 연결 풀에서 빌려 쓰고, close()에서 풀에 반환합니다.
+    """
     
     def __init__(self):
         self.conn = None
     
     def _get_db_connection(self):
-        """DB 연결 반환 (싱글톤 패턴)"""
+        """DB 연결 반환 (인스턴스당 하나를 풀에서 대여)"""
         try:
-            if self.conn is None or self.conn.closed:
-                logger.info(f"DB 연결 시도: host={DATABASE_HOST}, port={DATABASE_PORT}, dbname={DATABASE_NAME}, user={DATABASE_USER}")
-                self.conn = psycopg2.connect(
-                    host=DATABASE_HOST,
-                    port=DATABASE_PORT,
-                    dbname=DATABASE_NAME,
-                    user=DATABASE_USER,
-                    password=DATABASE_PASSWORD
-                )
-                logger.info("DB 연결 성공")
+            if self.conn is None:
+                self.conn = get_raw_connection()
             return self.conn
         except Exception as e:
             logger.error(f"DB 연결 실패: {str(e)}")
             raise
     
     def close(self):
-        """DB 연결 종료"""
-        if self.conn and not self.conn.closed:
-            self.conn.close()
-            self.conn = None
+        """DB 연결을 풀에 반환"""
+        if self.conn is not None:
+            conn, self.conn = self.conn, None
+            conn.close()
     
     def get_fs_pct_change(self, target_fs_code: str, 과거기준: int, db_conn: Optional[psycopg2.extensions.connection] = None):
         """
@@ -81,11 +155,12 @@ class FinancialStatementService:
         if db_conn is None:
             db_conn = self._get_db_connection()
         
-        query = "SELECT * FROM test_table where fs_code = '{}'".format(target_fs_code)
-        logger.info(f"SQL 쿼리 실행: {query}")
+        # 종목 안의 행 순서를 기간 순서로 쓰므로 정렬해서 조회
+        query = "SELECT * FROM test_table WHERE fs_code = %(fs_code)s ORDER BY stock_code, year, quarter"
+        logger.info(f"SQL 쿼리 실행: {query}, fs_code={target_fs_code}")
         
         try:
-            target_df = pd.read_sql_query(query, db_conn)
+            target_df = pd.read_sql_query(query, db_conn, params={"fs_code": target_fs_code})
             logger.info(f"조회된 데이터 행 수: {len(target_df)}")
             
             if len(target_df) == 0:
@@ -94,48 +169,82 @@ class FinancialStatementService:
         except Exception as e:
             logger.error(f"SQL 쿼리 실행 실패: {str(e)}")
             raise
-        pct_change_list = []
-        new_col_name = ["전기대비", "전년동기대비"][과거기준]
         
-        for stock_code in target_df.stock_code.unique():
-            partial_df = target_df[target_df["stock_code"] == stock_code]
-            
-            if 과거기준 == 0:  # 전기대비
-                for prev, now in zip(partial_df["값"].shift(1), partial_df["값"]):
-                    if (prev == np.nan) or (prev * now == 0):
-                        append_value = np.nan
-                    # 흑자 전환시 변화율 계산이 어려움
-                    # 100%이상 변화 시 -100%를 적용 그 이하일 경우 절반으로 나누는 우리만의 기준 세움
-                    elif prev < 0 and now > 0:
-                        append_value = (now / prev * -1)
-                        if append_value > 1:
-                            append_value -= 1
-                        else:
-                            append_value = append_value / 2
-                    else:
-                        append_value = (now / prev) - 1
-                    pct_change_list.append(append_value)
-                    
-            elif 과거기준 == 1:  # 전년동기 대비
-                # 년도와 분기를 다 통일했기 때문에 shift4를 써서 한번에 계산 가능
-                for prev, now in zip(partial_df["값"].shift(4), partial_df["값"]):
-                    if (prev == np.nan) or (prev * now == 0):
-                        append_value = np.nan
-                    # 흑자 전환시 변화율 계산이 어려움
-                    # 100%이상 변화 시 -100%를 적용 그 이하일 경우 절반으로 나누는 우리만의 기준 세움
-                    elif prev < 0 and now > 0:
-                        append_value = (now / prev * -1)
-                        if append_value > 1:
-                            append_value -= 1
-                        else:
-                            append_value = append_value / 2
-                    else:
-                        append_value = (now / prev) - 1
-                    pct_change_list.append(append_value)
-            else:
-                raise ValueError("올바른 옵션을 선택해주세요 (0: 전기대비, 1: 전년동기대비)")
-        
-        target_df[new_col_name] = pct_change_list
+        return self.add_pct_change(target_df, 과거기준)
+    
+    @staticmethod
+    def add_pct_change(target_df: pd.DataFrame, 과거기준: int) -> pd.DataFrame:
+        """
+        종목별 변화율 컬럼 추가 (groupby-shift 벡터 연산)
+        
+        종목 안에서는 행 순서를 그대로 기간 순서로 사용하므로 target_df는 연도/분기 순으로
+        정렬되어 있어야 합니다 (get_fs_pct_change는 stock_code, year, quarter 순으로 조회,
+        연도/분기를 모두 채워 두었으므로 전년동기는 4행 전).
+        """
+        if 과거기준 not in (0, 1):
+            raise ValueError("올바른 옵션을 선택해주세요 (0: 전기대비, 1: 전년동기대비)")
+        
+        codes, _ = pd.factorize(target_df["stock_code"])
+        values = pd.to_numeric(target_df["값"], errors="coerce").to_numpy(dtype=np.float64)
+        prev = group_shift(codes, values, FS_CHANGE_LAGS[과거기준])
+        
+        target_df[FS_CHANGE_COLUMNS[과거기준]] = fs_pct_change(values, prev)
+        return target_df
+    
+    def get_fs_period_change(
+        self,
+        target_fs_code: str,
+        과거기준: int,
+        quarter: str,
+        year: int,
+        db_conn: Optional[psycopg2.extensions.connection] = None
+    ) -> pd.DataFrame:
+        """
+        특정 분기의 재무제표 변화율 계산 (SQL에서 필요한 기간만 조회)
+        
+        요청 분기와 비교 분기(직전 분기 또는 전년 동기) 두 기간만 바인딩 파라미터로 조회하고,
+        비교값은 LAG 윈도 함수로 붙여 요청 분기 행만 받아옵니다.
+        
+        Args:
+            target_fs_code: 재무제표 코드 (예: "당기순이익")
+            과거기준: 0일 경우 전기 대비, 1일 경우 전년 동기 대비
+            quarter: 분기 (예: "Q1", "Q2", "Q3", "Q4")
+            year: 연도 (예: 2025)
+            db_conn: DB 연결 (None이면 자동으로 연결)
+        
+        Returns:
+            DataFrame: 요청 분기의 재무제표 데이터와 변화율
+        """
+        if 과거기준 not in (0, 1):
+            raise ValueError("올바른 옵션을 선택해주세요 (0: 전기대비, 1: 전년동기대비)")
+        if db_conn is None:
+            db_conn = self._get_db_connection()
+        
+        quarter = str(quarter).strip().upper()
+        prev_year, prev_quarter = previous_period(year, quarter, 과거기준)
+        params = {
+            "fs_code": target_fs_code,
+            "year": int(year),
+            "quarter": quarter,
+            "prev_year": prev_year,
+            "prev_quarter": prev_quarter,
+        }
+        logger.info(f"SQL 쿼리 실행: fs_code={target_fs_code}, {year} {quarter} vs {prev_year} {prev_quarter}")
+        
+        try:
+            target_df = pd.read_sql_query(FS_PERIOD_CHANGE_QUERY, db_conn, params=params)
+            logger.info(f"조회된 데이터 행 수: {len(target_df)}")
+        except Exception as e:
+            logger.error(f"SQL 쿼리 실행 실패: {str(e)}")
+            raise
+        
+        if target_df.empty:
+            logger.warning(f"데이터가 없습니다: fs_code={target_fs_code}, quarter={quarter}, year={year}")
+            return pd.DataFrame()
+        
+        values = pd.to_numeric(target_df["값"], errors="coerce").to_numpy(dtype=np.float64)
+        prev = pd.to_numeric(target_df.pop("prev_value"), errors="coerce").to_numpy(dtype=np.float64)
+        target_df[FS_CHANGE_COLUMNS[과거기준]] = fs_pct_change(values, prev)
         return target_df
     
     def clustering_score(self, X, labels, alpha=0.7):
@@ -150,58 +259,125 @@ class FinancialStatementService:
         Returns:
             tuple: (통합 점수, 응집도, 균형도)
         """
-        X = np.array(X)
-        labels = np.array(labels)
-        unique_labels = np.unique(labels)
-        
-        # noise (-1) 제거 (DBSCAN 대응)
-        unique_labels = unique_labels[unique_labels >= 0]
-        if len(unique_labels) <= 1:
-            return np.nan, np.nan, np.nan  # 클러스터가 1개 이하이면 평가 불가
-        
-        overall_var = np.var(X)
-        
-        # 1. 응집도 (WCSS / Var)
-        wcss = 0
-        for k in unique_labels:
-            cluster_points = X[labels == k]
-            wcss += np.mean((cluster_points - cluster_points.mean())**2)
-        cohesion = wcss / overall_var
-        
-        # 2. 균형도 (클러스터 크기 편차)
-        sizes = np.array([np.sum(labels == k) for k in unique_labels])
-        mean_size = sizes.mean()
-        balance = np.mean(((sizes - mean_size)/mean_size)**2)/len(unique_labels)
-        
-        # 3. 통합 점수
-        score = alpha * cohesion + (1 - alpha) * balance
-        return score, cohesion, balance
-    
-    def get_fs_score(self, target_fs_code: str, 과거기준: int, quarter: str, year: int, db_conn: Optional[psycopg2.extensions.connection] = None):
+        return clustering_score(X, labels, alpha)
+    
+    def get_fs_score(
+        self,
+        target_fs_code: str,
+        과거기준: int,
+        quarter: str,
+        year: int,
+        db_conn: Optional[psycopg2.extensions.connection] = None,
+        use_cache: bool = True,
+        backend: Optional[str] = None
+    ):
         """
         재무제표 점수 계산 (클러스터링 기반)
         
+        결과는 (fs_code, 비교 기준, 분기, 연도, 점수화 방식, 데이터 버전) 단위로 캐시되며,
+        원본 테이블이 바뀌면 데이터 버전이 달라져 다시 계산합니다.
+        
         Args:
             target_fs_code: 재무제표 코드 (예: "당기순이익")
             과거기준: 0일 경우 전기 대비, 1일 경우 전년 동기 대비
             quarter: 분기 (예: "Q1", "Q2", "Q3", "Q4")
             year: 연도 (예: 2025)
             db_conn: DB 연결 (None이면 자동으로 연결)
+            use_cache: 캐시 사용 여부
+            backend: 점수화 방식 (exact-1d, quantile, sklearn-ensemble, None이면 settings.fs_score_backend)
         
         Returns:
             DataFrame: 점수가 추가된 재무제표 데이터
         """
+        backend = backend or settings.fs_score_backend
         if db_conn is None:
             db_conn = self._get_db_connection()
         
+        if not use_cache:
+            return self._compute_fs_score(target_fs_code, 과거기준, quarter, year, db_conn, backend)
+        
+        score_key = (target_fs_code, int(과거기준), str(quarter).strip().upper(), int(year), backend)
+        version = fs_score_cache.data_version(db_conn)
+        if version is None:
+            return self._compute_fs_score(target_fs_code, 과거기준, quarter, year, db_conn, backend)
+        cached = fs_score_cache.get(score_key, version)
+        if cached is not None:
+            logger.info(f"재무제표 점수 캐시 적중: {score_key}")
+            return cached
+        
+        result = self._compute_fs_score(target_fs_code, 과거기준, quarter, year, db_conn, backend)
+        fs_score_cache.set(score_key, version, result)
+        return result
+    
+    def warm_score_cache(
+        self,
+        fs_codes: Optional[List[str]] = None,
+        years: int = 1,
+        comparison_types: Tuple[int, ...] = (0, 1),
+        backend: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        자주 조회되는 조합의 점수를 미리 계산해 캐시에 저장 (공시 적재 후 실행)
+        
+        Args:
+            fs_codes: 재무제표 코드 리스트 (None이면 대상 기간의 모든 코드)
+            years: 최근 몇 개 연도를 계산할지
+            comparison_types: 비교 기준 (0: 전기대비, 1: 전년동기대비)
+            backend: 점수화 방식 (None이면 settings.fs_score_backend)
+        
+        Returns:
+            Dict with 'computed', 'empty', 'failed' counts
+        """
+        backend = backend or settings.fs_score_backend
+        db_conn = self._get_db_connection()
+        version = fs_score_cache.data_version(db_conn, refresh=True)
+        
+        query = """
+            SELECT DISTINCT fs_code, year, quarter FROM test_table
+            WHERE year > (SELECT MAX(year) FROM test_table) - %(years)s
+        """
+        params = {"years": int(years)}
+        if fs_codes:
+            query += " AND fs_code = ANY(%(fs_codes)s)"
+            params["fs_codes"] = list(fs_codes)
+        combos = pd.read_sql_query(query, db_conn, params=params)
+        logger.info(f"재무제표 점수 사전 계산 시작: {len(combos)}개 조합 x {len(comparison_types)}개 비교 기준, 버전 {version}")
+        
+        stats = {'computed': 0, 'empty': 0, 'failed': 0}
+        for fs_code, year, quarter in combos.itertuples(index=False):
+            for comparison_type in comparison_types:
+                score_key = (fs_code, int(comparison_type), str(quarter).strip().upper(), int(year), backend)
+                try:
+                    result = self._compute_fs_score(fs_code, comparison_type, quarter, int(year), db_conn, backend)
+                    fs_score_cache.set(score_key, version, result)
+                    stats['empty' if result.empty else 'computed'] += 1
+                except Exception as e:
+                    db_conn.rollback()
+                    logger.warning(f"재무제표 점수 사전 계산 실패: {score_key}, {e}")
+                    stats['failed'] += 1
+        
+        logger.info(f"재무제표 점수 사전 계산 완료: {stats}")
+        return stats
+    
+    def _compute_fs_score(
+        self,
+        target_fs_code: str,
+        과거기준: int,
+        quarter: str,
+        year: int,
+        db_conn,
+        backend: str
+    ):
+        """재무제표 점수 계산 (캐시 미사용)"""
         try:
-            fs_df = self.get_fs_pct_change(target_fs_code, 과거기준, db_conn)
+            # 요청 분기와 비교 분기만 SQL에서 조회
+            fs_df = self.get_fs_period_change(target_fs_code, 과거기준, quarter, year, db_conn)
             
             if fs_df.empty:
                 logger.warning(f"재무제표 변화율 데이터가 없습니다: fs_code={target_fs_code}")
                 return pd.DataFrame()
             
-            partial_nic = fs_df[(fs_df["quarter"] == quarter) & (fs_df["year"] == year)].copy().dropna()
+            partial_nic = fs_df.dropna()
             logger.info(f"필터링 후 데이터 행 수: quarter={quarter}, year={year}, rows={len(partial_nic)}")
             
             if len(partial_nic) == 0:
@@ -211,45 +387,9 @@ class FinancialStatementService:
             logger.error(f"재무제표 변화율 계산 실패: {str(e)}")
             raise
         
-        if 과거기준 == 0:
-            nic_test_val = partial_nic.loc[:, ["전기대비"]]
-        else:
-            nic_test_val = partial_nic.loc[:, ["전년동기대비"]]
-        
-        X = np.array(nic_test_val).reshape(-1, 1)
-        kmeans = KMeans(n_clusters=10)
-        kmeans_results = kmeans.fit_predict(X)
-        gmm = GaussianMixture(n_components=10).fit_predict(X)
-        agg = AgglomerativeClustering(n_clusters=10, linkage='ward').fit_predict(X)
-        
-        nic_test_val["kmeans"] = kmeans_results
-        nic_test_val["gaussian"] = gmm
-        nic_test_val["agllomerative"] = agg
-        
-        kmeans_score = self.clustering_score(nic_test_val.iloc[:, 0], nic_test_val.iloc[:, 1], alpha=0.5)
-        gmm_score = self.clustering_score(nic_test_val.iloc[:, 0], nic_test_val.iloc[:, 2], alpha=0.5)
-        agglo_score = self.clustering_score(nic_test_val.iloc[:, 0], nic_test_val.iloc[:, 3], alpha=0.5)
-        
-        final_clustering_score_dict = {
-            "kmeans": kmeans_score[0],
-            "gaussian": gmm_score[0],
-            "agllomerative": agglo_score[0]
-        }
-        best_clustering_method = min(final_clustering_score_dict, key=final_clustering_score_dict.get)
-        
-        # 가장 적합한 clustering method 찾아 df완성
-        to_be_removed_method = list(final_clustering_score_dict.keys())
-        to_be_removed_method.remove(best_clustering_method)
-        nic_test_val.drop(to_be_removed_method, axis=1, inplace=True)
-        
-        # 클러스터의 평균값에 따라 점수를 mapping해야함
+        # 변화율 구간별 점수 (구간 평균이 낮은 순서대로 1점부터)
         change_col = "전기대비" if 과거기준 == 0 else "전년동기대비"
-        mapping_df = nic_test_val.groupby(by=best_clustering_method).mean().sort_values(by=change_col, ascending=True).reset_index()
-        mapping_df.index += 1
-        mapping_dict = mapping_df.iloc[:, 0].to_dict()
-        swapped_dict = {value: key for key, value in mapping_dict.items()}
-        nic_test_val["score"] = nic_test_val[best_clustering_method].replace(swapped_dict)
-        
-        final_score = pd.merge(partial_nic, nic_test_val["score"], left_index=True, right_index=True)
+        final_score = partial_nic.copy()
+        final_score["score"] = score_values(final_score[change_col].to_numpy(), backend)
         return final_score
 
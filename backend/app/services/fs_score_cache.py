@@ -0,0 +1,218 @@
+"""
+재무제표 클러스터 점수 캐시
+
+get_fs_score 결과를 (fs_code, 비교 기준, 분기, 연도, 점수화 방식, 데이터 버전) 단위로 저장합니다.
+데이터 버전은 원본 테이블 내용(행 수와 행별 해시 합)으로 만들어, 새 공시가 적재되거나 값이
+정정되면 키가 바뀌면서 이전 결과는 자연스럽게 무효화됩니다. 통계 카운터(pg_stat_user_tables)와 달리
+재시작이나 pg_stat_reset()으로 초기화되지 않아, 이미 쓰인 버전이 다른 내용에 다시 붙지 않습니다.
+버전 확인(테이블 전체 조회)은 백그라운드 스레드에서 하므로 요청을 느리게 하거나 실패시키지 않습니다.
+프로세스 내 LRU를 기본으로 쓰고, settings.redis_url이 있으면 Redis를 공유 저장소로 함께 사용합니다.
+"""
+import io
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import pandas as pd
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from app.core.config import settings
+from app.core.database import get_raw_connection
+
+logger = logging.getLogger(__name__)
+
+# 점수 계산 원본 테이블
+FS_SOURCE_TABLE = "test_table"
+
+# 원본 테이블 데이터 버전 (점수 조회와 같은 search_path로 같은 테이블을 읽음)
+FS_VERSION_QUERY = f"SELECT count(*), coalesce(sum(hashtext(t::text)::bigint), 0) FROM {FS_SOURCE_TABLE} t"
+
+# 캐시 키 접두사
+KEY_PREFIX = "fs_score"
+
+# (fs_code, 비교 기준, 분기, 연도, 점수화 방식)
+ScoreKey = Tuple[str, int, str, int, str]
+
+
+class FSScoreCache:
+    """
+    재무제표 점수 LRU 캐시 (선택적으로 Redis 공유)
+
+    Args:
+        max_entries: 프로세스 내 최대 보관 수 (None이면 settings.fs_score_cache_size)
+        ttl_seconds: Redis 보관 기간 (None이면 settings.fs_score_cache_ttl_seconds)
+        redis_url: Redis 주소 (None이면 settings.redis_url, 없으면 프로세스 내 캐시만 사용)
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        redis_url: Optional[str] = None
+    ):
+        self.max_entries = max_entries if max_entries is not None else settings.fs_score_cache_size
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.fs_score_cache_ttl_seconds
+        self._entries: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._version_checked = float("-inf")
+        self._version_refreshing = False
+        self.hits = 0
+        self.misses = 0
+
+        self._redis = None
+        redis_url = redis_url or settings.redis_url
+        if redis_url:
+            if redis is None:
+                logger.warning("redis 패키지가 없어 재무제표 점수는 프로세스 내 캐시만 사용합니다")
+            else:
+                self._redis = redis.Redis.from_url(redis_url)
+
+    def data_version(self, db_conn=None, refresh: bool = False) -> Optional[str]:
+        """
+        원본 테이블 데이터 버전 (행 수-행별 해시 합)
+
+        테이블 전체를 읽으므로 요청 경로에서는 조회하지 않고, 마지막 확인 후
+        settings.fs_score_version_check_seconds가 지나면 백그라운드 스레드에서 다시 계산합니다.
+        확인에 실패하면 마지막으로 확인한 버전을 계속 사용합니다.
+
+        Args:
+            db_conn: refresh에 사용할 DB 연결
+            refresh: True면 db_conn으로 지금 다시 조회 (실패 시 예외, 사전 계산 스크립트용)
+
+        Returns:
+            데이터 버전 (아직 확인하지 못했으면 None, 이때 호출자는 캐시 없이 계산)
+        """
+        if refresh:
+            return self._store_version(self._query_version(db_conn))
+        if time.monotonic() - self._version_checked >= settings.fs_score_version_check_seconds:
+            self._schedule_version_refresh()
+        return self._version
+
+    def warm_up(self):
+        """서버 기동 시 데이터 버전 확인 시작"""
+        self._schedule_version_refresh()
+
+    @staticmethod
+    def _query_version(db_conn) -> str:
+        with db_conn.cursor() as cur:
+            cur.execute(FS_VERSION_QUERY)
+            row = cur.fetchone()
+        return "-".join(str(v) for v in row)
+
+    def _store_version(self, version: str) -> str:
+        if version != self._version and self._version is not None:
+            logger.info(f"재무제표 데이터 변경 감지, 점수 캐시 무효화: {self._version} -> {version}")
+            self.clear_local()
+        self._version = version
+        self._version_checked = time.monotonic()
+        return version
+
+    def _schedule_version_refresh(self):
+        with self._lock:
+            if self._version_refreshing:
+                return
+            self._version_refreshing = True
+            self._version_checked = time.monotonic()
+
+        threading.Thread(target=self._refresh_version, name="fs-score-version", daemon=True).start()
+
+    def _refresh_version(self):
+        """백그라운드 데이터 버전 확인 (별도 풀 연결 사용)"""
+        try:
+            conn = get_raw_connection()
+            try:
+                self._store_version(self._query_version(conn))
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"재무제표 데이터 버전 확인 실패, 기존 버전 유지: {self._version}, {e}")
+        finally:
+            with self._lock:
+                self._version_refreshing = False
+
+    @staticmethod
+    def make_key(score_key: ScoreKey, version: str) -> str:
+        fs_code, comparison_type, quarter, year, backend = score_key
+        return f"{KEY_PREFIX}:{fs_code}:{comparison_type}:{quarter}:{year}:{backend}:{version}"
+
+    def get(self, score_key: ScoreKey, version: str) -> Optional[pd.DataFrame]:
+        """캐시 조회 (호출자가 수정해도 캐시가 바뀌지 않도록 복사본 반환)"""
+        key = self.make_key(score_key, version)
+        with self._lock:
+            df = self._entries.get(key)
+            if df is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return df.copy()
+
+        df = self._get_remote(key)
+        with self._lock:
+            if df is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store_local(key, df)
+        return df.copy()
+
+    def set(self, score_key: ScoreKey, version: str, df: pd.DataFrame):
+        """캐시 저장"""
+        key = self.make_key(score_key, version)
+        df = df.copy()
+        with self._lock:
+            self._store_local(key, df)
+        self._set_remote(key, df)
+
+    def clear_local(self):
+        """프로세스 내 캐시 비우기 (Redis 항목은 버전이 달라져 더 이상 조회되지 않음)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'version': self._version,
+            'redis': self._redis is not None,
+        }
+
+    def _store_local(self, key: str, df: pd.DataFrame):
+        self._entries[key] = df
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_remote(self, key: str) -> Optional[pd.DataFrame]:
+        if self._redis is None:
+            return None
+        try:
+            payload = self._redis.get(key)
+            if payload is None:
+                return None
+            # 종목코드(예: 005930)가 숫자로 바뀌지 않도록 타입 추론 없이 복원
+            return pd.read_json(
+                io.StringIO(payload.decode("utf-8")), orient="split", dtype=False, convert_dates=False
+            )
+        except Exception as e:
+            logger.warning(f"Redis 점수 캐시 조회 실패: {key}, {e}")
+            return None
+
+    def _set_remote(self, key: str, df: pd.DataFrame):
+        if self._redis is None:
+            return
+        try:
+            payload = df.to_json(orient="split", force_ascii=False)
+            self._redis.set(key, payload.encode("utf-8"), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Redis 점수 캐시 저장 실패: {key}, {e}")
+
+
+# 전역 재무제표 점수 캐시
+fs_score_cache = FSScoreCache()
@@ -0,0 +1,227 @@
+"""
+재무제표 변화율 점수화 백엔드
+
+1차원 변화율 값을 N_SCORE_CLASSES개 구간으로 나누고, 구간 평균이 낮은 순서대로 1점부터 점수를 매깁니다.
+
+- exact-1d: Fisher/Jenks 자연 구간 (구간 내 제곱오차 합을 최소화하는 최적 분할, 동적 계획법)
+- quantile: 정렬 후 분위수 구간
+- sklearn-ensemble: KMeans/GaussianMixture/Agglomerative 중 clustering_score가 가장 좋은 결과 (기존 방식)
+
+모든 백엔드는 같은 입력에 대해 항상 같은 결과를 냅니다 (sklearn 모델은 random_state 고정).
+"""
+import logging
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 점수 구간 수 (1~10점)
+N_SCORE_CLASSES = 10
+
+# sklearn 모델 난수 시드
+RANDOM_STATE = 0
+
+BACKEND_EXACT_1D = "exact-1d"
+BACKEND_QUANTILE = "quantile"
+BACKEND_SKLEARN = "sklearn-ensemble"
+
+
+def clustering_score(X, labels, alpha=0.7) -> Tuple[float, float, float]:
+    """
+    클러스터링 점수 계산 (낮을수록 좋음)
+
+    Args:
+        X: 데이터 포인트
+        labels: 클러스터 레이블
+        alpha: 응집도 가중치 (기본값 0.7)
+
+    Returns:
+        tuple: (통합 점수, 응집도, 균형도)
+    """
+    X = np.array(X)
+    labels = np.array(labels)
+    unique_labels = np.unique(labels)
+
+    # noise (-1) 제거 (DBSCAN 대응)
+    unique_labels = unique_labels[unique_labels >= 0]
+    if len(unique_labels) <= 1:
+        return np.nan, np.nan, np.nan  # 클러스터가 1개 이하이면 평가 불가
+
+    overall_var = np.var(X)
+
+    # 1. 응집도 (WCSS / Var)
+    wcss = 0
+    for k in unique_labels:
+        cluster_points = X[labels == k]
+        wcss += np.mean((cluster_points - cluster_points.mean())**2)
+    cohesion = wcss / overall_var
+
+    # 2. 균형도 (클러스터 크기 편차)
+    sizes = np.array([np.sum(labels == k) for k in unique_labels])
+    mean_size = sizes.mean()
+    balance = np.mean(((sizes - mean_size)/mean_size)**2)/len(unique_labels)
+
+    # 3. 통합 점수
+    score = alpha * cohesion + (1 - alpha) * balance
+    return score, cohesion, balance
+
+
+def _segment_costs(s1: np.ndarray, s2: np.ndarray, starts: np.ndarray, ends) -> np.ndarray:
+    """정렬 배열의 구간 [start, end) 제곱오차 합 (누적합 이용)"""
+    count = ends - starts
+    total = s1[ends] - s1[starts]
+    return (s2[ends] - s2[starts]) - total * total / count
+
+
+def natural_breaks_labels(sorted_values: np.ndarray, k: int) -> np.ndarray:
+    """
+    정렬된 1차원 값의 최적 k분할 (Fisher/Jenks 자연 구간)
+
+    구간 내 제곱오차 합을 최소화하는 분할을 동적 계획법으로 구합니다.
+    최적 분할점은 구간 끝에 대해 단조 증가하므로 분할 정복으로
+    각 단계를 O(n log n)에 계산합니다 (전체 O(k·n log n)).
+    분할 정복의 같은 깊이 노드는 numpy 배열 연산 한 번으로 처리합니다.
+
+    Args:
+        sorted_values: 오름차순 정렬된 값
+        k: 구간 수 (서로 다른 값의 수보다 크면 줄임)
+
+    Returns:
+        정렬 순서 기준 구간 번호 (0부터, 오름차순)
+    """
+    x = np.asarray(sorted_values, dtype=np.float64)
+    n = len(x)
+    k = min(k, len(np.unique(x)))
+    if k <= 1:
+        return np.zeros(n, dtype=np.int64)
+
+    # 평균을 빼서 누적합의 수치 오차를 줄임
+    centered = x - x.mean()
+    s1 = np.concatenate(([0.0], np.cumsum(centered)))
+    s2 = np.concatenate(([0.0], np.cumsum(centered * centered)))
+
+    # prev[i]: 앞 i개 값을 (m-1)개 구간으로 나눈 최소 비용
+    ends = np.arange(1, n + 1)
+    prev = np.full(n + 1, np.inf)
+    prev[1:] = s2[ends] - s1[ends] * s1[ends] / ends
+    splits = np.zeros((k, n + 1), dtype=np.int64)
+
+    for m in range(2, k + 1):
+        cur = np.full(n + 1, np.inf)
+        split = splits[m - 1]
+        # 분할 정복의 같은 깊이 노드(구간 끝 범위, 분할점 후보 범위)를 한 번에 계산
+        lo = np.array([m])
+        hi = np.array([n])
+        opt_lo = np.array([m - 1])
+        opt_hi = np.array([n - 1])
+        while len(lo):
+            mid = (lo + hi) // 2
+            counts = np.minimum(opt_hi, mid - 1) - opt_lo + 1
+            offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            node = np.repeat(np.arange(len(mid)), counts)
+            starts = opt_lo[node] + np.arange(len(node)) - offsets[node]
+            costs = prev[starts] + _segment_costs(s1, s2, starts, mid[node])
+            # 노드별 최소 비용 분할점 (같으면 앞쪽)
+            best = np.lexsort((costs, node))[offsets]
+            cur[mid] = costs[best]
+            split[mid] = starts[best]
+
+            lo, hi = np.concatenate((lo, mid + 1)), np.concatenate((mid - 1, hi))
+            opt_lo, opt_hi = np.concatenate((opt_lo, split[mid])), np.concatenate((split[mid], opt_hi))
+            keep = lo <= hi
+            lo, hi, opt_lo, opt_hi = lo[keep], hi[keep], opt_lo[keep], opt_hi[keep]
+        prev = cur
+
+    # 분할점 역추적
+    labels = np.empty(n, dtype=np.int64)
+    end = n
+    for m in range(k, 0, -1):
+        start = splits[m - 1][end] if m > 1 else 0
+        labels[start:end] = m - 1
+        end = start
+    return labels
+
+
+def quantile_labels(sorted_values: np.ndarray, k: int) -> np.ndarray:
+    """
+    정렬된 1차원 값의 분위수 구간 번호 (같은 값은 같은 구간)
+
+    Returns:
+        정렬 순서 기준 구간 번호 (0부터, 오름차순, 빈 구간 없이 연속)
+    """
+    x = np.asarray(sorted_values, dtype=np.float64)
+    n = len(x)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    edges = x[(np.arange(1, k) * n) // k]
+    labels = np.searchsorted(edges, x, side="right")
+    _, labels = np.unique(labels, return_inverse=True)
+    return labels.astype(np.int64)
+
+
+def _score_sorted(values: np.ndarray, k: int, label_sorted: Callable[[np.ndarray, int], np.ndarray]) -> np.ndarray:
+    """정렬 후 구간 번호를 구하고 원래 순서의 점수(1부터)로 되돌림"""
+    order = np.argsort(values, kind="stable")
+    scores = np.empty(len(values), dtype=np.int64)
+    scores[order] = label_sorted(values[order], k) + 1
+    return scores
+
+
+def _score_exact_1d(values: np.ndarray, k: int) -> np.ndarray:
+    return _score_sorted(values, k, natural_breaks_labels)
+
+
+def _score_quantile(values: np.ndarray, k: int) -> np.ndarray:
+    return _score_sorted(values, k, quantile_labels)
+
+
+def _score_sklearn_ensemble(values: np.ndarray, k: int) -> np.ndarray:
+    """KMeans/GaussianMixture/Agglomerative 중 clustering_score가 가장 낮은 결과 사용"""
+    from sklearn.cluster import AgglomerativeClustering, KMeans
+    from sklearn.mixture import GaussianMixture
+
+    X = values.reshape(-1, 1)
+    k = min(k, len(values))
+    candidates = {
+        "kmeans": KMeans(n_clusters=k, random_state=RANDOM_STATE).fit_predict(X),
+        "gaussian": GaussianMixture(n_components=k, random_state=RANDOM_STATE).fit_predict(X),
+        "agllomerative": AgglomerativeClustering(n_clusters=k, linkage='ward').fit_predict(X),
+    }
+    scores = {name: clustering_score(values, labels, alpha=0.5)[0] for name, labels in candidates.items()}
+    best = min(scores, key=scores.get)
+    labels = candidates[best]
+
+    # 클러스터 평균이 낮은 순서대로 1점부터
+    clusters = np.unique(labels)
+    means = np.array([values[labels == c].mean() for c in clusters])
+    rank = np.empty(len(clusters), dtype=np.int64)
+    rank[np.argsort(means, kind="stable")] = np.arange(1, len(clusters) + 1)
+    return rank[np.searchsorted(clusters, labels)]
+
+
+SCORING_BACKENDS: Dict[str, Callable[[np.ndarray, int], np.ndarray]] = {
+    BACKEND_EXACT_1D: _score_exact_1d,
+    BACKEND_QUANTILE: _score_quantile,
+    BACKEND_SKLEARN: _score_sklearn_ensemble,
+}
+
+
+def score_values(values, backend: str = BACKEND_EXACT_1D, n_classes: int = N_SCORE_CLASSES) -> np.ndarray:
+    """
+    변화율 값을 점수(1~n_classes)로 변환
+
+    Args:
+        values: 1차원 값 (결측 없음)
+        backend: 점수화 백엔드 (SCORING_BACKENDS)
+        n_classes: 구간 수
+
+    Returns:
+        입력 순서와 같은 점수 배열
+    """
+    if backend not in SCORING_BACKENDS:
+        raise ValueError(f"지원하지 않는 점수화 방식입니다: {backend} (가능: {', '.join(SCORING_BACKENDS)})")
+    values = np.asarray(values, dtype=np.float64).ravel()
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return SCORING_BACKENDS[backend](values, n_classes)
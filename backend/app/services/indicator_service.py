@@ -0,0 +1,153 @@
+"""
+기술적 지표 저장소 서비스
+
+finance.stock_price_daily의 종가로 지표를 계산해 finance.stock_indicator_daily에 저장하고,
+API에서는 저장된 구간을 그대로 읽어 반환합니다.
+과거 일자의 지표는 바뀌지 않으므로 새 시세가 들어온 구간만 이어서 계산합니다.
+"""
+import logging
+from datetime import date
+from typing import Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy import Float, cast, func
+from sqlalchemy.orm import Session
+
+from app.core.indicators import EMA_STATE_KEYS, ROLLING_LOOKBACK, compute_indicators
+from app.models.stock import StockIndicatorDaily, StockPriceDaily
+
+logger = logging.getLogger(__name__)
+
+# API로 제공하는 지표 컬럼
+INDICATOR_COLUMNS = [
+    'ma5', 'ma20', 'ma60',
+    'rsi',
+    'macd', 'macd_signal', 'macd_hist',
+    'bollinger_upper', 'bollinger_middle', 'bollinger_lower',
+]
+
+# 저장 컬럼 (지표 + 증분 계산용 EMA 상태)
+STORE_COLUMNS = INDICATOR_COLUMNS + ['ema_fast', 'ema_slow']
+
+
+class IndicatorService:
+    """일별 기술적 지표 저장/조회 서비스"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def refresh(self, stock_id: int, since: Optional[date] = None) -> Dict[str, int]:
+        """
+        지표 증분 갱신 (커밋은 호출자가 담당)
+
+        since 이전의 마지막 지표 행을 기준점으로 삼아, 기준점의 EMA 상태와
+        직전 ROLLING_LOOKBACK개 종가를 이어받아 그 이후 구간만 계산합니다.
+        기준점이 없으면 전체 구간을 다시 계산합니다.
+
+        Args:
+            stock_id: 종목 ID
+            since: 시세가 새로 적재/수정된 첫 날짜 (None이면 마지막 지표 이후만 계산)
+
+        Returns:
+            Dict with 'created', 'updated' counts
+        """
+        from app.etl.bulk import bulk_upsert, frame_to_records
+
+        anchor_query = self.db.query(StockIndicatorDaily).filter(StockIndicatorDaily.stock_id == stock_id)
+        if since is not None:
+            anchor_query = anchor_query.filter(StockIndicatorDaily.date < since)
+        anchor = anchor_query.order_by(StockIndicatorDaily.date.desc()).first()
+
+        if anchor is None:
+            closes = self._read_closes(stock_id)
+            offset, state = 0, None
+        else:
+            new_closes = self._read_closes(stock_id, after=anchor.date)
+            if new_closes.empty:
+                return {'created': 0, 'updated': 0}
+            context = self._read_closes(stock_id, until=anchor.date, limit=ROLLING_LOOKBACK)
+            closes = pd.concat([context, new_closes], ignore_index=True)
+            offset = len(context)
+            state = {key: getattr(anchor, key) for key in EMA_STATE_KEYS}
+
+        if closes.empty:
+            return {'created': 0, 'updated': 0}
+
+        values = compute_indicators(closes['close'].to_numpy(dtype=float), offset=offset, state=state)
+        frame = pd.DataFrame({'date': closes['date'].to_numpy()[offset:]})
+        frame.insert(0, 'stock_id', int(stock_id))
+        for col in STORE_COLUMNS:
+            frame[col] = values[col]
+
+        stats = bulk_upsert(
+            self.db,
+            StockIndicatorDaily.__table__,
+            frame_to_records(frame),
+            conflict_columns=['stock_id', 'date']
+        )
+        logger.info(f"기술적 지표 갱신: stock_id={stock_id}, {frame['date'].iloc[0]}~{frame['date'].iloc[-1]}, {stats}")
+        return stats
+
+    def ensure_current(self, stock_id: int):
+        """시세 저장소보다 지표가 뒤처져 있으면 이어서 계산"""
+        price_max = self.db.query(func.max(StockPriceDaily.date)).filter(
+            StockPriceDaily.stock_id == stock_id
+        ).scalar()
+        indicator_max = self.db.query(func.max(StockIndicatorDaily.date)).filter(
+            StockIndicatorDaily.stock_id == stock_id
+        ).scalar()
+        if price_max is None or (indicator_max is not None and indicator_max >= price_max):
+            return
+
+        try:
+            self.refresh(stock_id)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"기술적 지표 갱신 실패: stock_id={stock_id}, {e}")
+            raise
+
+    def get_range(self, stock_id: int, start_date: date, end_date: date) -> pd.DataFrame:
+        """
+        저장된 지표 구간 조회
+
+        Returns:
+            DataFrame with columns: ['date'] + INDICATOR_COLUMNS
+        """
+        self.ensure_current(stock_id)
+
+        rows = self.db.query(
+            StockIndicatorDaily.date,
+            *[getattr(StockIndicatorDaily, col) for col in INDICATOR_COLUMNS]
+        ).filter(
+            StockIndicatorDaily.stock_id == stock_id,
+            StockIndicatorDaily.date >= start_date,
+            StockIndicatorDaily.date <= end_date
+        ).order_by(StockIndicatorDaily.date).all()
+
+        df = pd.DataFrame(rows, columns=['date'] + INDICATOR_COLUMNS)
+        df[INDICATOR_COLUMNS] = df[INDICATOR_COLUMNS].astype(float)
+        return df
+
+    def _read_closes(
+        self,
+        stock_id: int,
+        after: Optional[date] = None,
+        until: Optional[date] = None,
+        limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """종가 조회 (limit이 있으면 until 기준 최근 limit개)"""
+        query = self.db.query(
+            StockPriceDaily.date,
+            cast(StockPriceDaily.close, Float)
+        ).filter(StockPriceDaily.stock_id == stock_id)
+        if after is not None:
+            query = query.filter(StockPriceDaily.date > after)
+        if until is not None:
+            query = query.filter(StockPriceDaily.date <= until)
+
+        if limit is not None:
+            rows: List = query.order_by(StockPriceDaily.date.desc()).limit(limit).all()[::-1]
+        else:
+            rows = query.order_by(StockPriceDaily.date).all()
+        return pd.DataFrame(rows, columns=['date', 'close'])
@@ -1,7 +1,9 @@
 import random
 from typing import List, Dict, Optional
 from datetime import datetime, date
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.lotto import LottoNumber
 
 class LottoService:
@@ -125,4 +127,82 @@ class LottoService:
         return self.db.query(LottoNumber).filter(
             LottoNumber.user_id == user_id
         ).order_by(LottoNumber.generated_at.desc()).limit(limit).all()
-    
\ No newline at end of file
+
+
+class AsyncLottoService(LottoService):
+    """로또 번호 서비스 (비동기 세션, 번호 생성/분석은 LottoService와 공유)"""
+    
+    def __init__(self, db: AsyncSession = None):
+        super().__init__()
+        self.db = db
+    
+    async def save_lotto_numbers(self, numbers: List[int], user_id: Optional[int] = None) -> LottoNumber:
+        """로또 번호를 DB에 저장"""
+        if not self.db:
+            raise ValueError("Database session이 필요합니다")
+        
+        # 오늘 이미 생성된 번호가 있는지 확인
+        existing = await self.get_today_lotto(user_id)
+        if existing:
+            return existing
+        
+        # 새 로또 번호 저장
+        lotto_record = LottoNumber(
+            user_id=user_id,
+            numbers=",".join(map(str, numbers)),
+            date_key=date.today().strftime("%Y-%m-%d"),
+            generated_at=datetime.utcnow()
+        )
+        
+        self.db.add(lotto_record)
+        await self.db.commit()
+        await self.db.refresh(lotto_record)
+        
+        return lotto_record
+    
+    async def get_today_lotto(self, user_id: Optional[int] = None) -> Optional[LottoNumber]:
+        """오늘 생성된 로또 번호 조회"""
+        if not self.db:
+            return None
+        
+        today = date.today().strftime("%Y-%m-%d")
+        result = await self.db.execute(
+            select(LottoNumber).where(
+                LottoNumber.date_key == today,
+                LottoNumber.user_id == user_id
+            ).limit(1)
+        )
+        return result.scalars().first()
+    
+    async def mark_as_viewed(self, lotto_id: int, user_id: Optional[int] = None) -> bool:
+        """로또 번호를 확인했음으로 표시"""
+        if not self.db:
+            return False
+        
+        result = await self.db.execute(
+            select(LottoNumber).where(
+                LottoNumber.id == lotto_id,
+                LottoNumber.user_id == user_id
+            ).limit(1)
+        )
+        lotto = result.scalars().first()
+        
+        if lotto:
+            lotto.is_viewed = True
+            lotto.viewed_at = datetime.utcnow()
+            await self.db.commit()
+            return True
+        
+        return False
+    
+    async def get_user_lotto_history(self, user_id: int, limit: int = 10) -> List[LottoNumber]:
+        """사용자의 로또 번호 히스토리 조회"""
+        if not self.db:
+            return []
+        
+        result = await self.db.execute(
+            select(LottoNumber).where(
+                LottoNumber.user_id == user_id
+            ).order_by(LottoNumber.generated_at.desc()).limit(limit)
+        )
+        return list(result.scalars().all())
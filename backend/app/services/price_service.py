@@ -0,0 +1,277 @@
+"""
+국내 주식 시세 서비스
+
+finance.stock_price_daily를 우선 조회하고, 저장소에 없는 구간만
+FinanceDataReader / yfinance에서 가져와 저장한 뒤 응답합니다.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, cast, func
+from sqlalchemy.orm import Session
+
+try:
+    import FinanceDataReader as fdr
+except Exception:
+    fdr = None
+import yfinance as yf
+
+from app.core.config import settings
+from app.core.upstream import PROVIDER_FDR, PROVIDER_YFINANCE, UpstreamUnavailable, call_upstream
+from app.models.stock import Stock, StockPriceDaily
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _to_date(value) -> Optional[date]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.to_datetime(value).date()
+
+
+def resolve_date_range(start=None, end=None) -> Tuple[date, date]:
+    """조회 구간 기본값 적용 (종료일: 오늘, 시작일: 종료일 기준 1년 전)"""
+    end_date = _to_date(end) or date.today()
+    start_date = _to_date(start) or (end_date - timedelta(days=365))
+    return start_date, end_date
+
+
+def _standardize_remote_frame(df: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """FDR/yfinance 결과를 PRICE_COLUMNS 구조로 정규화"""
+    if df is None or len(df) == 0:
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+
+    # yfinance는 단일 종목도 (Price, Ticker) MultiIndex 컬럼을 반환할 수 있음
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+
+    df = df.reset_index()
+    if 'Date' not in df.columns:
+        for alt in ('Datetime', 'date', 'index'):
+            if alt in df.columns:
+                df = df.rename(columns={alt: 'Date'})
+                break
+
+    dates = pd.to_datetime(df['Date'])
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    out = pd.DataFrame({'Date': dates.dt.normalize()})
+    for col in PRICE_COLUMNS[1:]:
+        out[col] = pd.to_numeric(df[col], errors='coerce') if col in df.columns else np.nan
+    return out
+
+
+def fetch_remote_daily_prices(ticker: str, start: date, end: date) -> pd.DataFrame:
+    """
+    원격 일봉 조회
+
+    FinanceDataReader를 먼저 시도하고, 실패하거나 비어 있으면
+    yfinance로 ticker, .KS, .KQ 순서로 재시도합니다.
+    호출은 외부 API 전용 실행기(app.core.upstream)에서 시간 제한을 두고 실행합니다.
+
+    Raises:
+        UpstreamUnavailable: 데이터를 얻지 못했고 외부 API가 차단/포화/시간 초과 상태인 경우
+    """
+    df = None
+    unavailable = None
+    if fdr is not None:
+        try:
+            df = call_upstream(PROVIDER_FDR, fdr.DataReader, ticker, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+        except UpstreamUnavailable as e:
+            logger.warning(f"FDR 시세 조회 불가: {ticker}, {e.reason}")
+            unavailable = e
+        except Exception as e:
+            logger.warning(f"FDR 시세 조회 실패: {ticker}, {e}")
+            df = None
+
+    if df is None or len(df) == 0:
+        df = None
+        # yfinance의 end는 미포함이므로 하루 더함
+        yf_end = (end + timedelta(days=1)).strftime('%Y-%m-%d')
+        for yt in [ticker, f"{ticker}.KS", f"{ticker}.KQ"]:
+            try:
+                df_try = call_upstream(
+                    PROVIDER_YFINANCE, yf.download, yt, start=start.strftime('%Y-%m-%d'), end=yf_end, progress=False
+                )
+                if df_try is not None and len(df_try) > 0:
+                    df = df_try
+                    break
+            except UpstreamUnavailable as e:
+                # 차단/포화 상태에서는 다른 접미사도 같은 결과이므로 중단
+                logger.warning(f"yfinance 시세 조회 불가: {yt}, {e.reason}")
+                unavailable = e
+                break
+            except Exception:
+                continue
+
+    if df is None and unavailable is not None:
+        raise unavailable
+    return _standardize_remote_frame(df)
+
+
+class StockPriceService:
+    """
+    국내 주식 일봉 조회 서비스
+
+    저장소에 있는 구간은 DB에서 바로 읽고, 앞/뒤로 비어 있는 구간만 원격 조회 후 저장합니다.
+    """
+
+    # 보충 구간 종류
+    GAP_ALL = "all"  # 저장된 구간 없음
+    GAP_HEAD = "head"  # 저장된 첫 날짜 이전
+    GAP_TAIL = "tail"  # 저장된 마지막 날짜 이후
+
+    # 프로세스 단위 원격 조회 기록 (같은 구간을 반복 조회하지 않기 위함)
+    # 보충에 성공한 경우에만 기록하고, settings.price_check_memo_size를 넘으면 오래 안 쓴 종목부터 삭제
+    _tail_checked_at: "OrderedDict[str, float]" = OrderedDict()
+    _head_checked_from: "OrderedDict[str, date]" = OrderedDict()
+    _memo_lock = threading.Lock()
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_daily_prices(
+        self,
+        ticker: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        일봉 데이터 조회
+
+        Args:
+            ticker: 종목 코드
+            start: 시작일 (YYYY-MM-DD, None이면 종료일 기준 1년 전)
+            end: 종료일 (YYYY-MM-DD, None이면 오늘)
+
+        Returns:
+            DataFrame with columns: ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
+        """
+        start_date, end_date = resolve_date_range(start, end)
+
+        stock_id = self.ensure_range(ticker, start_date, end_date)
+        if stock_id is None:
+            # 종목 마스터에 없으면 저장할 수 없으므로 원격 결과를 그대로 반환
+            remote = fetch_remote_daily_prices(ticker, start_date, end_date)
+            return remote.sort_values('Date').reset_index(drop=True)
+
+        return self._read(stock_id, start_date, end_date)
+
+    def ensure_range(self, ticker: str, start_date: date, end_date: date) -> Optional[int]:
+        """
+        저장소에 없는 구간을 원격 조회로 보충
+
+        Returns:
+            종목 ID (종목 마스터에 없으면 None)
+        """
+        stock_id = self.db.query(Stock.id).filter(Stock.ticker == ticker).scalar()
+        if stock_id is None:
+            return None
+
+        for kind, gap_start, gap_end in self._missing_ranges(ticker, stock_id, start_date, end_date):
+            try:
+                self._backfill(ticker, gap_start, gap_end)
+            except UpstreamUnavailable as e:
+                # 조회 기록을 남기지 않으므로 다음 요청에서 다시 보충하고, 저장된 구간이 있으면 그것으로 응답
+                has_rows = self.db.query(StockPriceDaily.date).filter(
+                    StockPriceDaily.stock_id == stock_id
+                ).limit(1).first() is not None
+                if not has_rows:
+                    raise
+                logger.warning(f"시세 원격 보충 생략 (저장된 구간으로 응답): {ticker}, {gap_start}~{gap_end}, {e.reason}")
+            else:
+                self._record_check(ticker, kind, gap_start)
+        return stock_id
+
+    def _record_check(self, ticker: str, kind: str, gap_start: date):
+        """보충에 성공한 구간의 원격 조회 기록"""
+        if kind == self.GAP_HEAD:
+            memo, value = self._head_checked_from, gap_start
+        elif kind == self.GAP_TAIL:
+            memo, value = self._tail_checked_at, time.monotonic()
+        else:
+            # 저장된 구간이 없던 경우는 이제 저장소에 행이 있으므로 기록할 필요 없음
+            return
+        with self._memo_lock:
+            memo[ticker] = value
+            memo.move_to_end(ticker)
+            while len(memo) > settings.price_check_memo_size:
+                memo.popitem(last=False)
+
+    def _missing_ranges(
+        self,
+        ticker: str,
+        stock_id: int,
+        start_date: date,
+        end_date: date
+    ) -> List[Tuple[str, date, date]]:
+        """저장소에 없는 앞/뒤 구간 계산 (구간 종류, 시작일, 종료일)"""
+        min_date, max_date = self.db.query(
+            func.min(StockPriceDaily.date),
+            func.max(StockPriceDaily.date)
+        ).filter(StockPriceDaily.stock_id == stock_id).one()
+
+        if max_date is None:
+            return [(self.GAP_ALL, start_date, end_date)]
+
+        ranges = []
+        with self._memo_lock:
+            # 앞 구간: 상장 이전 구간을 매번 재조회하지 않도록 한 번 확인한 시작일 기억
+            checked_from = self._head_checked_from.get(ticker)
+            if start_date < min_date and (checked_from is None or start_date < checked_from):
+                ranges.append((self.GAP_HEAD, start_date, min_date - timedelta(days=1)))
+
+            # 뒤 구간: 마지막 저장일 이후 영업일이 있거나, 마지막 저장일이 오늘(장중 미확정)인 경우
+            if end_date >= max_date:
+                today = date.today()
+                has_new_bars = np.busday_count(max_date + timedelta(days=1), end_date + timedelta(days=1)) > 0
+                unsettled = max_date >= today
+                last_checked = self._tail_checked_at.get(ticker, float("-inf"))
+                throttled = time.monotonic() - last_checked < settings.price_tail_refresh_seconds
+                if (has_new_bars or unsettled) and not throttled:
+                    # 마지막 저장일부터 다시 받아 장중 봉을 확정값으로 덮어씀
+                    ranges.append((self.GAP_TAIL, max_date, end_date))
+
+        return ranges
+
+    def _backfill(self, ticker: str, start_date: date, end_date: date):
+        """원격 조회 결과를 저장소에 반영"""
+        from app.etl.load import DataLoader
+
+        remote = fetch_remote_daily_prices(ticker, start_date, end_date)
+        if remote.empty:
+            return
+        logger.info(f"시세 원격 보충: {ticker}, {start_date}~{end_date}, {len(remote)}개 행")
+        DataLoader(self.db).load_stock_prices(ticker, remote)
+
+    def _read(self, stock_id: int, start_date: date, end_date: date) -> pd.DataFrame:
+        """저장소 구간 조회"""
+        rows = self.db.query(
+            StockPriceDaily.date,
+            cast(StockPriceDaily.open, Float),
+            cast(StockPriceDaily.high, Float),
+            cast(StockPriceDaily.low, Float),
+            cast(StockPriceDaily.close, Float),
+            cast(StockPriceDaily.volume, Float),
+        ).filter(
+            StockPriceDaily.stock_id == stock_id,
+            StockPriceDaily.date >= start_date,
+            StockPriceDaily.date <= end_date
+        ).order_by(StockPriceDaily.date).all()
+
+        df = pd.DataFrame(rows, columns=PRICE_COLUMNS)
+        df['Date'] = pd.to_datetime(df['Date'])
+        return df
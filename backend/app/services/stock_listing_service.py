@@ -0,0 +1,211 @@
+"""
+상장 종목 목록 캐시 서비스
+
+fdr.StockListing() 결과를 프로세스 내에 한 번만 적재하고
+종목코드/시장/섹터 인덱스를 만들어 엔드포인트들이 공유합니다.
+TTL이 지나면 백그라운드에서 갱신하며, 갱신 중에는 기존 데이터를 그대로 제공합니다.
+적재는 항상 백그라운드 스레드에서 하므로 요청 스레드가 fdr.StockListing()을 기다리지 않습니다.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import FinanceDataReader as fdr
+except Exception:
+    fdr = None
+
+from app.core.config import settings
+from app.core.upstream import PROVIDER_FDR, UpstreamUnavailable
+
+logger = logging.getLogger(__name__)
+
+# 표준 컬럼 대응 (코드/이름/시장)
+LISTING_COLUMN_CANDIDATES = [
+    ("Code", "Name", "Market"),
+    ("Symbol", "Name", "Market"),
+    ("code", "name", "market"),
+]
+
+
+class StockListingSnapshot:
+    """특정 시점의 종목 목록과 조회용 인덱스"""
+
+    def __init__(self, df: pd.DataFrame, loaded_at: float):
+        self.df = df.reset_index(drop=True)
+        self.loaded_at = loaded_at
+
+        self.code_col = self.name_col = self.market_col = None
+        for c, n, m in LISTING_COLUMN_CANDIDATES:
+            if c in self.df.columns and n in self.df.columns:
+                self.code_col, self.name_col = c, n
+                self.market_col = m if m in self.df.columns else None
+                break
+        self.sector_col = "Sector" if "Sector" in self.df.columns else None
+
+        # 종목코드 -> 행 위치 (O(1) 조회)
+        if self.code_col is not None:
+            codes = self.df[self.code_col].astype(str)
+            self.by_code: Dict[str, int] = dict(zip(codes, range(len(codes))))
+        else:
+            self.by_code = {}
+
+        # 시장/섹터별 행 위치 (원본 순서 유지)
+        self.by_market = self._group_positions(self.market_col)
+        self.by_sector = self._group_positions(self.sector_col)
+        if self.market_col and self.sector_col:
+            self.by_market_sector = {
+                key: np.asarray(pos)
+                for key, pos in self.df.groupby([self.market_col, self.sector_col], sort=False).indices.items()
+            }
+        else:
+            self.by_market_sector = {}
+
+    def _group_positions(self, col: Optional[str]) -> Dict[str, np.ndarray]:
+        if col is None:
+            return {}
+        return {key: np.asarray(pos) for key, pos in self.df.groupby(col, sort=False).indices.items()}
+
+    @property
+    def age(self) -> float:
+        """적재 후 경과 시간 (초)"""
+        return time.monotonic() - self.loaded_at
+
+    def get(self, code: str) -> Optional[pd.Series]:
+        """종목코드로 단일 종목 조회"""
+        pos = self.by_code.get(str(code))
+        if pos is None:
+            return None
+        return self.df.iloc[pos]
+
+    def select(
+        self,
+        market: Optional[str] = None,
+        sector: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        시장/섹터로 미리 분할된 종목 목록 조회
+
+        해당 컬럼이 목록에 없으면 그 필터는 무시합니다 (기존 엔드포인트 동작과 동일).
+        """
+        use_market = bool(market) and self.market_col is not None
+        use_sector = bool(sector) and self.sector_col is not None
+
+        if use_market and use_sector:
+            positions = self.by_market_sector.get((market, sector))
+        elif use_market:
+            positions = self.by_market.get(market)
+        elif use_sector:
+            positions = self.by_sector.get(sector)
+        else:
+            return self.df if limit is None else self.df.head(limit)
+
+        if positions is None:
+            return self.df.iloc[0:0]
+        if limit is not None:
+            positions = positions[:limit]
+        return self.df.iloc[positions]
+
+
+class StockListingCache:
+    """
+    종목 목록 TTL 캐시
+
+    적재와 TTL 경과 후 갱신은 백그라운드 스레드에서 하고, 그동안 기존 스냅샷을 계속 제공합니다.
+    아직 스냅샷이 없으면(사전 적재 중이거나 실패) 적재를 시작하고 바로 503을 반환합니다.
+    """
+
+    def __init__(
+        self,
+        market: str = "KRX",
+        ttl_seconds: Optional[int] = None,
+        retry_seconds: Optional[int] = None
+    ):
+        self.market = market
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.stock_listing_ttl_seconds
+        self.retry_seconds = retry_seconds if retry_seconds is not None else settings.stock_listing_retry_seconds
+        self._snapshot: Optional[StockListingSnapshot] = None
+        self._state_lock = threading.Lock()
+        self._refreshing = False
+        self._last_attempt = float("-inf")
+
+    def _load(self) -> StockListingSnapshot:
+        if fdr is None:
+            raise RuntimeError("FinanceDataReader not available")
+        logger.info(f"종목 목록 적재 시작: {self.market}")
+        df = fdr.StockListing(self.market)
+        snapshot = StockListingSnapshot(df, time.monotonic())
+        logger.info(f"종목 목록 적재 완료: {self.market}, {len(snapshot.df)}개")
+        return snapshot
+
+    def get_snapshot(self) -> StockListingSnapshot:
+        """
+        현재 스냅샷 반환 (만료 시 백그라운드 갱신 예약)
+
+        Raises:
+            UpstreamUnavailable: 아직 적재된 스냅샷이 없는 경우 (적재 중이거나 재시도 대기 중)
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            self._schedule_refresh()
+            raise UpstreamUnavailable(PROVIDER_FDR, "loading", self._retry_after())
+
+        if snapshot.age >= self.ttl_seconds:
+            self._schedule_refresh()
+        return snapshot
+
+    def _retry_after(self) -> int:
+        """최초 적재 전 재요청 권장 시간 (초)"""
+        with self._state_lock:
+            if self._refreshing:
+                return 1
+            return int(max(1, self.retry_seconds - (time.monotonic() - self._last_attempt)))
+
+    def _schedule_refresh(self):
+        with self._state_lock:
+            now = time.monotonic()
+            if self._refreshing or now - self._last_attempt < self.retry_seconds:
+                return
+            self._refreshing = True
+            self._last_attempt = now
+
+        thread = threading.Thread(
+            target=self._refresh,
+            name=f"stock-listing-refresh-{self.market}",
+            daemon=True
+        )
+        thread.start()
+
+    def _refresh(self):
+        try:
+            self._snapshot = self._load()
+        except Exception as e:
+            # 갱신 실패 시 기존 스냅샷 유지 (retry_seconds 이후 재시도)
+            if self._snapshot is None:
+                logger.warning(f"종목 목록 적재 실패: {self.market}, {e}")
+            else:
+                logger.warning(f"종목 목록 갱신 실패, 기존 데이터 유지: {self.market}, {e}")
+        finally:
+            with self._state_lock:
+                self._refreshing = False
+
+    def warm_up(self):
+        """서버 기동 시 첫 요청부터 응답할 수 있도록 백그라운드에서 미리 적재"""
+        self._schedule_refresh()
+
+    def invalidate(self):
+        """다음 요청에서 갱신되도록 스냅샷을 만료 처리"""
+        with self._state_lock:
+            self._last_attempt = float("-inf")
+        snapshot = self._snapshot
+        if snapshot is not None:
+            snapshot.loaded_at = -float("inf")
+
+
+# 전역 KRX 종목 목록 캐시
+stock_listing_cache = StockListingCache("KRX")
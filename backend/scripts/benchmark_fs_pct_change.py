@@ -0,0 +1,128 @@
+"""
+재무제표 변화율 계산 벤치마크
+기존 종목별 루프 구현과 벡터 연산 구현의 실행 시간을 비교하고, 결과가 같은지 확인하는 도구
+
+사용법:
+    python scripts/benchmark_fs_pct_change.py
+    python scripts/benchmark_fs_pct_change.py --stocks 2500 --years 10 --repeat 3
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pandas as pd
+
+from app.services.financial_statement_service import FS_CHANGE_COLUMNS, FinancialStatementService
+
+
+def legacy_pct_change(target_df: pd.DataFrame, 과거기준: int) -> pd.DataFrame:
+    """
+    기존 구현 (종목별 boolean mask + 값 쌍 루프)
+
+    기존 코드는 Series를 그대로 순회해 파이썬 float로 나눗셈을 했기 때문에
+    prev가 0이고 now가 결측이면 ZeroDivisionError가 발생했습니다.
+    결과 비교를 위해 여기서는 NumPy 스칼라로 순회해 그 경우를 NaN으로 계산합니다
+    (해당 건수는 count_legacy_errors로 따로 셉니다).
+    """
+    pct_change_list = []
+    lag = [1, 4][과거기준]
+    for stock_code in target_df.stock_code.unique():
+        partial_df = target_df[target_df["stock_code"] == stock_code]
+        for prev, now in zip(partial_df["값"].shift(lag).to_numpy(), partial_df["값"].to_numpy()):
+            if (prev == np.nan) or (prev * now == 0):
+                append_value = np.nan
+            elif prev < 0 and now > 0:
+                append_value = (now / prev * -1)
+                if append_value > 1:
+                    append_value -= 1
+                else:
+                    append_value = append_value / 2
+            else:
+                append_value = (now / prev) - 1
+            pct_change_list.append(append_value)
+    target_df[FS_CHANGE_COLUMNS[과거기준]] = pct_change_list
+    return target_df
+
+
+def count_legacy_errors(target_df: pd.DataFrame, 과거기준: int) -> int:
+    """
+    기존 구현이 ZeroDivisionError로 실패했을 값 쌍 수
+
+    prev * now == 0 검사를 통과하면서 prev가 0인 경우(now가 결측)로, 기존 API는 500을 반환했고
+    현재 구현은 NaN을 반환합니다.
+    """
+    lag = [1, 4][과거기준]
+    values = target_df["값"].astype(float)
+    prev = values.groupby(target_df["stock_code"], sort=False).shift(lag)
+    return int(((prev == 0) & values.isna()).sum())
+
+
+def build_fixture(stocks: int, years: int, seed: int = 42) -> pd.DataFrame:
+    """
+    test_table 형태의 테스트 데이터 생성
+
+    종목별로 연속된 행(연도/분기 순)이며, 적자/흑자 전환, 0, 결측값을 포함합니다.
+    """
+    rng = np.random.default_rng(seed)
+    quarters = ["Q1", "Q2", "Q3", "Q4"]
+    periods = years * len(quarters)
+
+    values = rng.normal(100.0, 250.0, size=stocks * periods).round(2)
+    values[rng.random(values.size) < 0.02] = 0.0
+    values[rng.random(values.size) < 0.02] = np.nan
+
+    return pd.DataFrame({
+        "stock_code": np.repeat([f"{i:06d}" for i in range(stocks)], periods),
+        "year": np.tile(np.repeat(np.arange(2025 - years + 1, 2026), len(quarters)), stocks),
+        "quarter": np.tile(quarters, stocks * years),
+        "fs_code": "당기순이익",
+        "값": values,
+    })
+
+
+def timed(func, repeat: int):
+    """최소 실행 시간과 마지막 결과 반환"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='재무제표 변화율 계산 벤치마크')
+    parser.add_argument('--stocks', type=int, default=2500, help='종목 수')
+    parser.add_argument('--years', type=int, default=10, help='연도 수 (연도당 4개 분기)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최소 시간 기준)')
+    args = parser.parse_args()
+
+    fixture = build_fixture(args.stocks, args.years)
+    print(f"테스트 데이터: {args.stocks}개 종목, {len(fixture)}개 행")
+
+    for 과거기준, column in enumerate(FS_CHANGE_COLUMNS):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            legacy_time, legacy = timed(lambda: legacy_pct_change(fixture.copy(), 과거기준), args.repeat)
+        vector_time, vector = timed(
+            lambda: FinancialStatementService.add_pct_change(fixture.copy(), 과거기준), args.repeat
+        )
+
+        # NaN 위치까지 포함해 완전히 같은 값인지 확인
+        np.testing.assert_array_equal(legacy[column].to_numpy(), vector[column].to_numpy())
+
+        print(
+            f"{column}: 기존 {legacy_time * 1000:.1f}ms, 벡터 {vector_time * 1000:.1f}ms, "
+            f"{legacy_time / vector_time:.1f}배 빠름 (결과 일치, "
+            f"기존 구현이 ZeroDivisionError로 실패했을 값 {count_legacy_errors(fixture, 과거기준)}건은 NaN)"
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
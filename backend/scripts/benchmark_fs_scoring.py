@@ -0,0 +1,130 @@
+"""
+재무제표 점수화 백엔드 벤치마크
+점수화 방식별 실행 시간, 구간 내 제곱오차 합, 기존 방식(sklearn-ensemble)과의 점수 일치도를 비교하는 도구
+
+sklearn이 설치되지 않은 환경에서는 sklearn-ensemble 비교를 건너뜁니다.
+
+사용법:
+    python scripts/benchmark_fs_scoring.py
+    python scripts/benchmark_fs_scoring.py --rows 2500 --samples 5 --repeat 3
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from app.services.fs_scoring import (
+    BACKEND_SKLEARN,
+    N_SCORE_CLASSES,
+    SCORING_BACKENDS,
+    score_values,
+)
+
+
+def build_fixture(rows: int, seed: int) -> np.ndarray:
+    """
+    변화율 형태의 테스트 데이터 생성
+
+    대부분 0 근처에 몰려 있고 일부 종목이 크게 튀는 분포 (t 분포 + 적자 전환 구간)를 흉내냅니다.
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.standard_t(df=2, size=rows) * 0.3
+    turnaround = rng.random(rows) < 0.05
+    values[turnaround] = rng.uniform(-0.5, 5.0, size=turnaround.sum())
+    return values.round(6)
+
+
+def within_class_sse(values: np.ndarray, scores: np.ndarray) -> float:
+    """점수 구간 내 제곱오차 합 (낮을수록 구간이 촘촘함)"""
+    total = 0.0
+    for score in np.unique(scores):
+        members = values[scores == score]
+        total += float(((members - members.mean()) ** 2).sum())
+    return total
+
+
+def rank_correlation(a: np.ndarray, b: np.ndarray) -> float:
+    """점수 간 Spearman 순위 상관계수"""
+    rank_a = np.argsort(np.argsort(a, kind="stable"), kind="stable")
+    rank_b = np.argsort(np.argsort(b, kind="stable"), kind="stable")
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
+
+
+def timed(func, repeat: int):
+    """최소 실행 시간과 마지막 결과 반환"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='재무제표 점수화 백엔드 벤치마크')
+    parser.add_argument('--rows', type=int, default=2500, help='종목 수 (한 번의 점수 계산 대상)')
+    parser.add_argument('--samples', type=int, default=5, help='테스트 데이터 개수 (시드별)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최소 시간 기준)')
+    args = parser.parse_args()
+
+    backends = list(SCORING_BACKENDS)
+    try:
+        import sklearn  # noqa: F401
+    except ImportError:
+        print("sklearn이 없어 sklearn-ensemble 비교를 건너뜁니다")
+        backends.remove(BACKEND_SKLEARN)
+
+    print(f"테스트 데이터: {args.samples}개 x {args.rows}개 종목, {N_SCORE_CLASSES}개 구간")
+
+    totals = {backend: {'time': 0.0, 'sse': 0.0} for backend in backends}
+    agreement = {backend: [] for backend in backends if backend != BACKEND_SKLEARN}
+
+    for seed in range(args.samples):
+        values = build_fixture(args.rows, seed)
+        results = {}
+        for backend in backends:
+            elapsed, scores = timed(lambda: score_values(values, backend), args.repeat)
+
+            # 같은 입력이면 항상 같은 점수여야 함
+            np.testing.assert_array_equal(scores, score_values(values, backend))
+
+            totals[backend]['time'] += elapsed
+            totals[backend]['sse'] += within_class_sse(values, scores)
+            results[backend] = scores
+
+        if BACKEND_SKLEARN in results:
+            reference = results[BACKEND_SKLEARN]
+            for backend in agreement:
+                scores = results[backend]
+                agreement[backend].append((
+                    float(np.mean(scores == reference)),
+                    float(np.mean(np.abs(scores - reference))),
+                    rank_correlation(scores, reference),
+                ))
+
+    print("\n방식별 평균 (결과 재현 확인 완료)")
+    for backend in backends:
+        print(
+            f"  {backend}: {totals[backend]['time'] / args.samples * 1000:.1f}ms, "
+            f"구간 내 제곱오차 합 {totals[backend]['sse'] / args.samples:.2f}"
+        )
+
+    if BACKEND_SKLEARN in backends:
+        print(f"\n{BACKEND_SKLEARN} 대비 점수 일치도")
+        for backend, rows in agreement.items():
+            same, abs_diff, rank_corr = np.mean(rows, axis=0)
+            print(
+                f"  {backend}: 점수 일치 {same * 100:.1f}%, 평균 점수 차이 {abs_diff:.2f}, "
+                f"순위 상관 {rank_corr:.3f}"
+            )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
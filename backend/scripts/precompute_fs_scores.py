@@ -0,0 +1,80 @@
+"""
+재무제표 점수 사전 계산 스크립트
+DART 재무제표 적재 후 자주 조회되는 (fs_code, 비교 기준, 분기, 연도) 조합의 점수를 미리 계산해 캐시를 채우는 도구
+
+Redis(settings.redis_url)를 쓰는 환경에서는 API 서버들이 같은 캐시를 공유하므로,
+적재 직후 이 스크립트를 실행하면 첫 요청부터 캐시된 점수를 받습니다.
+redis_url이 없으면 계산 결과가 이 스크립트 프로세스 안에만 남으므로 실행하지 않고 종료 코드 1로 끝납니다.
+
+사용법:
+    python scripts/precompute_fs_scores.py
+    python scripts/precompute_fs_scores.py --fs-codes 당기순이익,영업이익 --years 2
+"""
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.financial_statement_service import FinancialStatementService
+from app.services.fs_score_cache import fs_score_cache
+from app.services.fs_scoring import SCORING_BACKENDS
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='재무제표 점수 사전 계산')
+    parser.add_argument(
+        '--fs-codes',
+        type=str,
+        help='재무제표 코드 (쉼표로 구분, 생략 시 대상 기간의 모든 코드)'
+    )
+    parser.add_argument(
+        '--years',
+        type=int,
+        default=1,
+        help='최근 몇 개 연도를 계산할지 (기본 1)'
+    )
+    parser.add_argument(
+        '--comparison-types',
+        type=str,
+        default='0,1',
+        help='비교 기준 (0: 전기대비, 1: 전년동기대비, 쉼표로 구분)'
+    )
+    parser.add_argument(
+        '--backend',
+        type=str,
+        choices=list(SCORING_BACKENDS),
+        help='점수화 방식 (생략 시 settings.fs_score_backend)'
+    )
+    args = parser.parse_args()
+
+    fs_codes = [c.strip() for c in args.fs_codes.split(',')] if args.fs_codes else None
+    comparison_types = tuple(int(c) for c in args.comparison_types.split(','))
+
+    if not fs_score_cache.stats()['redis']:
+        logger.warning("Redis(settings.redis_url)가 설정되지 않아 사전 계산 결과를 API 서버와 공유할 수 없습니다")
+        return 1
+
+    service = FinancialStatementService()
+    try:
+        stats = service.warm_score_cache(fs_codes, args.years, comparison_types, backend=args.backend)
+        print(f"\n✅ 결과: {stats}, 캐시: {fs_score_cache.stats()}")
+        return 0 if stats['failed'] == 0 else 1
+    except Exception as e:
+        logger.error(f"재무제표 점수 사전 계산 실패: {e}", exc_info=True)
+        return 1
+    finally:
+        service.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,6 +5,8 @@ ETL 파이프라인 실행 스크립트
 사용법:
     python scripts/run_etl.py --type stock_list --market KRX
     python scripts/run_etl.py --type stock_price --tickers 005930,000660
+    python scripts/run_etl.py --type stock_price --tickers 005930 --full-refresh --start-date 2020-01-01
+    python scripts/run_etl.py --type stock_price --resume
     python scripts/run_etl.py --type full
 """
 import sys
@@ -17,7 +19,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / "backend"))
 
-from app.core.database import get_db
+from app.core.database import get_etl_db
 from app.etl.pipeline import ETLPipeline
 
 # 로깅 설정
@@ -58,6 +60,21 @@ def main():
         type=str,
         help='종료일 (YYYY-MM-DD)'
     )
+    parser.add_argument(
+        '--full-refresh',
+        action='store_true',
+        help='마지막 저장일을 무시하고 시세 전체 재적재 (수정주가 반영 등, 기본은 증분)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='마지막 미완료 시세 ETL 실행을 재개 (완료된 종목은 건너뜀, --tickers 생략 시 해당 실행의 종목 전체)'
+    )
+    parser.add_argument(
+        '--run-key',
+        type=str,
+        help='실행 키 (같은 키로 다시 실행하면 완료된 종목을 건너뛰고 이어서 진행)'
+    )
     parser.add_argument(
         '--update-prices',
         action='store_true',
@@ -72,7 +89,7 @@ def main():
     args = parser.parse_args()
     
     try:
-        db = next(get_db())
+        db = next(get_etl_db())
         pipeline = ETLPipeline(db)
         
         if args.type == 'stock_list':
@@ -81,16 +98,19 @@ def main():
             print(f"\n✅ 결과: {result}")
             
         elif args.type == 'stock_price':
-            if not args.tickers:
-                logger.error("--tickers 옵션이 필요합니다")
+            if not args.tickers and not (args.resume or args.run_key):
+                logger.error("--tickers 옵션이 필요합니다 (재개 시에는 --resume 또는 --run-key)")
                 return 1
             
-            tickers = [t.strip() for t in args.tickers.split(',')]
-            logger.info(f"주식 시세 데이터 ETL 실행: {tickers}")
+            tickers = [t.strip() for t in args.tickers.split(',')] if args.tickers else None
+            logger.info(f"주식 시세 데이터 ETL 실행: {tickers or '이전 실행 종목'}")
             result = pipeline.run_stock_price_etl(
                 tickers,
                 args.start_date,
-                args.end_date
+                args.end_date,
+                full_refresh=args.full_refresh,
+                run_key=args.run_key,
+                resume=args.resume
             )
             print(f"\n✅ 결과: {result}")
             
@@ -110,7 +130,8 @@ def main():
             result = pipeline.run_full_etl(
                 markets=markets,
                 update_prices=args.update_prices,
-                update_financials=args.update_financials
+                update_financials=args.update_financials,
+                full_refresh=args.full_refresh
             )
             print(f"\n✅ 결과: {result}")
         